@@ -6,11 +6,12 @@ Complete implementation with GPX processing and PDF generation.
 import logging
 import json
 import yaml
-import gpxpy
 import csv
 import io
 import asyncio
+import time
 from pathlib import Path
+from urllib.parse import urlencode
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict
 from fastapi import FastAPI, HTTPException, Depends, Request, UploadFile, File, Form
@@ -31,16 +32,18 @@ from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 import uvicorn
 
-from app.database import Database
+from app.database import Database, decode_cursor
 from app.auth import Auth
 from app.scoring_engine import NavScoringEngine
 from app.email import EmailService
 from app.backup_scheduler import BackupScheduler
-from app.pdf_generator import (
-    generate_full_route_map,
-    generate_checkpoint_detail_map,
-    generate_enhanced_pdf_report
-)
+from app.track_cache import TrackCache
+from app.scoring_cache import ScoringCache
+from app.report_cache import ReportCache
+from app.basemap import BasemapCache
+from app.scoring_jobs import ScoringJobQueue, ScoringJobError
+from app.workers import StageExecutor
+from app import pipeline
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -73,10 +76,14 @@ def load_config(config_path: str = "data/config.yaml") -> dict:
             "storage": {
                 "gpx_uploads": "data/gpx_uploads",
                 "pdf_reports": "data/pdf_reports",
-                "nav_packets": "data/nav_packets"
+                "nav_packets": "data/nav_packets",
+                "track_cache_max_mb": 256,
+                "scoring_cache_max_mb": 512,
+                "report_cache_max_mb": 512
             },
             "scoring": {
                 "timing_penalty_per_second": 1.0,
+                "distance_mode": "ellipsoidal",
                 "off_course": {
                     "max_no_penalty_nm": 0.25,
                     "max_penalty_distance_nm": 5.0,
@@ -101,6 +108,13 @@ def load_config(config_path: str = "data/config.yaml") -> dict:
                 "sender_password": "",
                 "recipients_coach": "coach@example.com"
             },
+            "reports": {
+                "map_backend": "raster",
+                "save_map_pngs": False
+            },
+            "scoring_jobs": {
+                "workers": 2
+            },
             "backup": {
                 "enabled": True,
                 "frequency_hours": 24,
@@ -113,7 +127,7 @@ def load_config(config_path: str = "data/config.yaml") -> dict:
 # ===== APP INITIALIZATION =====
 
 config = load_config()
-db = Database(config["database"]["path"])
+db = Database(config["database"]["path"], config["database"])
 auth = Auth(db)
 scoring_engine = NavScoringEngine(config)
 email_service = EmailService(config["email"])
@@ -121,6 +135,15 @@ backup_scheduler = BackupScheduler(
     config.get("backup", {}),
     config["database"]["path"]
 )
+track_cache = TrackCache(config["storage"])
+scoring_cache = ScoringCache(config["storage"])
+report_cache = ReportCache(config["storage"])
+basemap_cache = BasemapCache(config["storage"])
+# Handler is looked up at call time; process_scoring_job is defined with the flight routes
+scoring_queue = ScoringJobQueue(
+    config.get("scoring_jobs", {}), db, handler=lambda job: process_scoring_job(job)
+)
+stage_executor = StageExecutor(config.get("process_pool", {}))
 backup_task = None  # Will be set during startup
 
 app = FastAPI(
@@ -225,6 +248,21 @@ async def startup_event():
             logger.info("Backup scheduler started")
     except Exception as e:
         logger.error(f"Error initializing backup scheduler: {e}")
+    
+    # Store penalty components of results scored before they were stored
+    try:
+        backfilled = db.backfill_result_penalties(lambda result: pipeline.result_penalties(config, result))
+        if backfilled:
+            logger.info(f"Stored penalty components of {backfilled} earlier flight results")
+    except Exception as e:
+        logger.error(f"Error backfilling result penalties: {e}")
+    
+    # Start scoring workers and resume jobs interrupted by a restart
+    try:
+        stage_executor.start()
+        scoring_queue.start()
+    except Exception as e:
+        logger.error(f"Error starting scoring job queue: {e}")
 
 # ===== DEPENDENCIES =====
 
@@ -295,6 +333,35 @@ def get_avatar_color(name: str) -> str:
     color_index = sum(ord(c) for c in name) % len(colors)
     return colors[color_index]
 
+# Rows per page on the results and assignments listings
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def clamp_page_size(page_size: Optional[int]) -> int:
+    """Page size from a query parameter, defaulting to and capped by the limits above."""
+    if not page_size or page_size < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(page_size, MAX_PAGE_SIZE)
+
+def check_page_cursor(cursor: Optional[str]):
+    """Reject a malformed page cursor with 400 before the listing is queried."""
+    if cursor:
+        try:
+            decode_cursor(cursor, 2)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+def page_links(request: Request, cursor: Optional[str], next_cursor: Optional[str]) -> Dict[str, Optional[str]]:
+    """Links to the first and next page of a listing, keeping its other query parameters."""
+    params = {k: v for k, v in request.query_params.items() if k != "cursor"}
+    def page_url(page_cursor: Optional[str] = None) -> str:
+        query = dict(params, cursor=page_cursor) if page_cursor else params
+        return f"{request.url.path}?{urlencode(query)}" if query else request.url.path
+    return {
+        "first_page_url": page_url() if cursor else None,
+        "next_page_url": page_url(next_cursor) if next_cursor else None,
+    }
+
 def parse_mmss(time_str: str) -> float:
     """Parse MM:SS or M:SS format to seconds."""
     parts = time_str.strip().split(":")
@@ -310,29 +377,6 @@ def format_seconds_mmss(seconds: float) -> str:
     secs = int(seconds % 60)
     return f"{mins}:{secs:02d}"
 
-def parse_gpx(gpx_content: bytes) -> List[Dict]:
-    """Parse GPX file and extract track points."""
-    try:
-        gpx = gpxpy.parse(gpx_content.decode('utf-8'))
-        track_points = []
-        
-        for track in gpx.tracks:
-            for segment in track.segments:
-                for point in segment.points:
-                    track_points.append({
-                        "lat": point.latitude,
-                        "lon": point.longitude,
-                        "time": point.time,
-                        "speed": point.speed or 0.0,
-                        "elevation": point.elevation or 0.0
-                    })
-        
-        logger.info(f"Parsed GPX: {len(track_points)} track points")
-        return track_points
-    except Exception as e:
-        logger.error(f"GPX parsing error: {e}")
-        raise ValueError(f"Failed to parse GPX file: {e}")
-
 def generate_track_plot(track_points: List[Dict], checkpoints: List[Dict], output_path: Path):
     """Generate track plot with checkpoints."""
     fig, ax = plt.subplots(figsize=(10, 8))
@@ -767,21 +811,9 @@ async def unified_dashboard(request: Request, user: dict = Depends(require_login
         # Coach/Admin dashboard
         members = db.list_users(filter_type="approved")
         pairings = db.list_pairings(active_only=True)
-        results = db.list_flight_results()
         
-        # Recent results (last 5)
-        recent = results[:5] if results else []
-        
-        # Enhance recent results
-        for result in recent:
-            nav = db.get_nav(result["nav_id"])
-            result["nav_name"] = nav["name"] if nav else "Unknown"
-            
-            pairing = db.get_pairing(result["pairing_id"])
-            if pairing:
-                pilot = db.get_user_by_id(pairing["pilot_id"])
-                observer = db.get_user_by_id(pairing["safety_observer_id"])
-                result["team_name"] = f"{pilot['name']} / {observer['name']}" if pilot and observer else "Unknown"
+        # Recent results (last 5) with NAV and team names
+        recent = db.list_flight_results_enriched(limit=5, with_checkpoints=False)
         
         return templates.TemplateResponse("dashboard.html", {
             "request": request,
@@ -791,7 +823,7 @@ async def unified_dashboard(request: Request, user: dict = Depends(require_login
             "stats": {
                 "total_users": len(members),
                 "active_pairings": len(pairings),
-                "recent_results": len(results)
+                "recent_results": db.count_flight_results()
             },
             "recent_results": recent,
             "pairing_info": None
@@ -839,23 +871,8 @@ async def unified_dashboard(request: Request, user: dict = Depends(require_login
             active_assignments = db.get_assignments_for_pairing(pairing["id"], completed=False)
             assigned_navs_count = len(active_assignments) if active_assignments else 0
         
-        # Get recent results for this user's pairings
-        pairings = db.list_pairings_for_member(user["user_id"], active_only=False)
-        pairing_ids = [p["id"] for p in pairings]
-        
-        recent_results = []
-        for pairing_id in pairing_ids:
-            pairing_results = db.list_flight_results(pairing_id=pairing_id)
-            recent_results.extend(pairing_results)
-        
-        # Sort by date descending and take top 5
-        recent_results.sort(key=lambda r: r["scored_at"], reverse=True)
-        recent_results = recent_results[:5]
-        
-        # Enhance with NAV names
-        for result in recent_results:
-            nav = db.get_nav(result["nav_id"])
-            result["nav_name"] = nav["name"] if nav else "Unknown"
+        # Get the 5 most recent results of this user's pairings, with NAV names
+        recent_results = db.list_flight_results_enriched(member_id=user["user_id"], limit=5, with_checkpoints=False)
         
         return templates.TemplateResponse("dashboard.html", {
             "request": request,
@@ -1195,23 +1212,8 @@ async def team_dashboard(request: Request, user: dict = Depends(require_competit
             "observer_color": get_avatar_color(observer["name"]) if observer else "avatar-color-2"
         }
     
-    # Get recent results for this user's pairings
-    pairings = db.list_pairings_for_member(user["user_id"], active_only=False)
-    pairing_ids = [p["id"] for p in pairings]
-    
-    recent_results = []
-    for pairing_id in pairing_ids:
-        pairing_results = db.list_flight_results(pairing_id=pairing_id)
-        recent_results.extend(pairing_results)
-    
-    # Sort by date descending and take top 5
-    recent_results.sort(key=lambda r: r["scored_at"], reverse=True)
-    recent_results = recent_results[:5]
-    
-    # Enhance with NAV names
-    for result in recent_results:
-        nav = db.get_nav(result["nav_id"])
-        result["nav_name"] = nav["name"] if nav else "Unknown"
+    # Get the 5 most recent results of this user's pairings, with NAV names
+    recent_results = db.list_flight_results_enriched(member_id=user["user_id"], limit=5, with_checkpoints=False)
     
     return templates.TemplateResponse("team/dashboard.html", {
         "request": request,
@@ -1556,6 +1558,248 @@ async def flight_form(request: Request, user: dict = Depends(require_login)):
         "error": None
     })
 
+def flight_processing_response(request: Request, job_id: int, prenav_id: int, nav_name: str, user: dict):
+    """202 page that polls a scoring job and opens the result when it is done."""
+    return templates.TemplateResponse("team/flight_processing.html", {
+        "request": request,
+        "job_id": job_id,
+        "prenav_id": prenav_id,
+        "nav_name": nav_name,
+        "is_coach": user.get("is_coach", False),
+        "is_admin": user.get("is_admin", False),
+        "member_name": user["name"]
+    }, status_code=202)
+
+async def render_flight_maps(
+    track_points, start_gate: dict, checkpoints: list, output_dir: Path, name_suffix: str,
+    nav_id: Optional[int] = None
+):
+    """
+    Render the route map and every checkpoint detail map in parallel on the stage executor.
+    Returns (route map PNG, checkpoint map PNGs in route order) and logs a timing report.
+    PNG files are only written to output_dir when reports.save_map_pngs is enabled.
+    With a nav_id the route map is composited onto the NAV's cached basemap.
+    """
+    started = time.perf_counter()
+    save_pngs = config.get("reports", {}).get("save_map_pngs", False)
+
+    def debug_path(name: str) -> Optional[Path]:
+        return output_dir / f"{name}_{name_suffix}.png" if save_pngs else None
+
+    route_call = (track_points, start_gate, checkpoints, debug_path("route_map"), nav_id, config["storage"])
+    checkpoint_calls = [
+        (track_points, start_gate, checkpoints, i, debug_path(f"checkpoint_map_{i+1}"))
+        for i in range(len(checkpoints))
+    ]
+    route_render, checkpoint_renders = await asyncio.gather(
+        stage_executor.run("render_maps", pipeline.render_route_map, *route_call),
+        stage_executor.map("render_maps", pipeline.render_checkpoint_map, checkpoint_calls),
+    )
+    wall_time = time.perf_counter() - started
+
+    render_times = [("route", route_render[1])] + [
+        (checkpoint["name"], seconds)
+        for checkpoint, (_, seconds) in zip(checkpoints, checkpoint_renders)
+    ]
+    render_total = sum(seconds for _, seconds in render_times)
+    logger.info(
+        f"Rendered {len(render_times)} maps in {wall_time:.2f}s "
+        f"(render time {render_total:.2f}s, {render_total / wall_time if wall_time else 0:.1f}x parallel): "
+        + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in render_times)
+    )
+    return route_render[0], [png for png, _ in checkpoint_renders]
+
+async def process_scoring_job(job: dict) -> int:
+    """
+    Score one queued flight submission (runs on a scoring queue worker).
+    CPU-bound stages run in the stage executor's worker processes.
+    Returns the new flight result ID; raises ScoringJobError with a message for the submitter.
+    """
+    params = job["params"]
+
+    prenav = db.get_prenav(job["prenav_id"])
+    if not prenav:
+        raise ScoringJobError("Invalid prenav submission")
+    if prenav.get("status") != "open":
+        # A job interrupted after saving its result (e.g. while emailing) is
+        # requeued at startup; it finishes with the result it already saved
+        result_id = db.get_flight_result_id_for_prenav(prenav["id"])
+        if result_id is not None:
+            logger.info(f"Scoring job {job['id']}: prenav {prenav['id']} already scored as result {result_id}")
+            return result_id
+        raise ScoringJobError("This submission has already been scored or archived")
+    pairing = db.get_pairing(prenav["pairing_id"])
+    if not pairing:
+        raise ScoringJobError("Pairing not found")
+    nav = db.get_nav(prenav["nav_id"])
+    checkpoints = nav["checkpoints"]
+    start_gate = db.get_start_gate(params["start_gate_id"])
+    if not start_gate:
+        raise ScoringJobError("Invalid start gate")
+
+    actual_fuel = params["actual_fuel"]
+    secrets_checkpoint = params["secrets_checkpoint"]
+    secrets_enroute = params["secrets_enroute"]
+    gpx_filename = job["gpx_filename"]
+
+    # Parse GPX
+    gpx_path = Path(config["storage"]["gpx_uploads"]) / gpx_filename
+    try:
+        gpx_content = gpx_path.read_bytes()
+    except OSError as e:
+        raise ScoringJobError(f"Uploaded GPX file is missing: {str(e)}")
+
+    # Reuse an earlier identical run (same GPX, route, start gate, rules and leg times)
+    scoring_key = scoring_cache.make_key(
+        track_cache.content_hash(gpx_content), checkpoints, start_gate,
+        config["scoring"], prenav["leg_times"]
+    )
+    cached_scoring = scoring_cache.get(scoring_key)
+    if cached_scoring:
+        logger.info(f"Scoring job {job['id']}: Reusing cached scoring run {scoring_key[:12]}")
+        checkpoint_results = cached_scoring.checkpoint_results
+    else:
+        track_points = await stage_executor.run("load_track", pipeline.load_track, config["storage"], gpx_content)
+        checkpoint_results = await stage_executor.run(
+            "score_checkpoints", pipeline.score_checkpoints,
+            config, track_points, start_gate, checkpoints, prenav["leg_times"]
+        )
+        scoring_cache.put(scoring_key, checkpoint_results)
+
+    logger.info(f"Scoring job {job['id']}: Beginning flight scoring...")
+    logger.info(f"  prenav: {prenav}")
+    logger.info(f"  checkpoint_results count: {len(checkpoint_results)}")
+    logger.info(f"  checkpoint_results: {checkpoint_results}")
+
+    try:
+        totals = pipeline.compute_totals(
+            config, prenav, checkpoint_results, actual_fuel, secrets_checkpoint, secrets_enroute
+        )
+        overall_score = totals["overall_score"]
+
+        # The PDF report is built on first download (see result_report_path);
+        # this is the file name it is served under
+        timestamp = int(datetime.utcnow().timestamp())
+        pdf_filename = f"result_{pairing['id']}_{prenav['nav_id']}_{timestamp}.pdf"
+
+        # Get pairing member names
+        pilot = db.get_user_by_id(pairing["pilot_id"])
+        observer = db.get_user_by_id(pairing["safety_observer_id"])
+
+        # Save the result and mark the submission scored in one transaction, so a
+        # job cancelled part way (and requeued at startup) left either all of it or none
+        with db.write_connection():
+            result_id = db.create_flight_result(
+                prenav_id=prenav["id"],
+                pairing_id=pairing["id"],
+                nav_id=prenav["nav_id"],
+                gpx_filename=gpx_filename,
+                actual_fuel=actual_fuel,
+                secrets_checkpoint=secrets_checkpoint,
+                secrets_enroute=secrets_enroute,
+                start_gate_id=params["start_gate_id"],
+                overall_score=overall_score,
+                checkpoint_results=checkpoint_results,
+                leg_penalties=totals["leg_penalties"],
+                total_time_penalty=totals["total_time_penalty"],
+                total_time_deviation=totals["total_time_deviation"],
+                estimated_total_time=totals["estimated_total_time"],
+                actual_total_time=totals["actual_total_time"],
+                total_off_course=totals["total_off_course"],
+                fuel_error_pct=totals["fuel_error_pct"],
+                estimated_fuel_burn=prenav["fuel_estimate"],
+                checkpoint_radius=config["scoring"]["off_course"].get("checkpoint_radius_nm", 0.25),
+                fuel_penalty=totals["fuel_penalty"],
+                checkpoint_secrets_penalty=totals["checkpoint_secrets_penalty"],
+                enroute_secrets_penalty=totals["enroute_secrets_penalty"],
+                total_time_score=totals["total_time_score"],
+                scoring_inputs={
+                    "nav_name": nav["name"],
+                    "checkpoints": checkpoints,
+                    "start_gate": start_gate,
+                    "scoring": config["scoring"],
+                }
+            )
+            db.update_flight_result_pdf(result_id, pdf_filename)
+
+            # Log flight completion
+            db.log_activity(
+                user_id=job["user_id"],
+                category="flight",
+                activity_type="flight_scored",
+                details=f"Flight scored: {nav['name']} - Score: {overall_score:.1f}",
+                entity_type="flight_result",
+                entity_id=result_id,
+                ip_address=params.get("ip_address")
+            )
+
+            # Mark prenav as scored (v0.4.0)
+            db.mark_prenav_scored(prenav["id"])
+
+            # Mark assignment as complete if exists (Item 37)
+            assignment = db.get_assignment_by_prenav(prenav["id"])
+            if assignment:
+                db.mark_assignment_complete(assignment["id"])
+        logger.info(f"Marked prenav {prenav['id']} as scored")
+        if assignment:
+            logger.info(f"Marked assignment {assignment['id']} as completed (NAV {prenav['nav_id']}, Pairing {pairing['id']})")
+    except Exception as e:
+        import traceback
+        logger.error(f"Error processing flight: {e}", exc_info=True)
+        logger.error(f"Exception type: {type(e).__name__}")
+        logger.error(f"Exception traceback: {traceback.format_exc()}")
+
+        # Log detailed context
+        logger.error(f"Context at error:")
+        logger.error(f"  prenav_id: {prenav['id']}")
+        logger.error(f"  prenav: {prenav}")
+        logger.error(f"  nav_id: {prenav.get('nav_id')}")
+        logger.error(f"  checkpoint_results count: {len(checkpoint_results) if checkpoint_results else 0}")
+        if checkpoint_results:
+            logger.error(f"  first checkpoint: {checkpoint_results[0] if len(checkpoint_results) > 0 else None}")
+
+        # Provide better error message for common issues
+        error_str = str(e)
+        if "NOT NULL" in error_str:
+            raise ScoringJobError(f"Database error: Missing required data. Please check all form fields are filled correctly.")
+        elif "FOREIGN KEY" in error_str:
+            raise ScoringJobError(f"Database error: Invalid reference. Please try again or contact support.")
+        elif len(error_str) == 0 or error_str == "None":
+            raise ScoringJobError("An unknown error occurred during flight scoring. Please try again or contact support.")
+        else:
+            raise ScoringJobError(f"Error processing flight: {error_str}")
+
+    # Send emails (including additional emails)
+    pilot_emails = db.get_all_emails_for_user(pilot["id"]) if pilot else []
+    observer_emails = db.get_all_emails_for_user(observer["id"]) if observer else []
+
+    if pilot_emails:
+        try:
+            await email_service.send_results_notification(
+                team_emails=pilot_emails,
+                team_name=pilot["name"],
+                nav_name=nav["name"],
+                overall_score=overall_score,
+                pdf_filename=pdf_filename
+            )
+        except Exception as email_err:
+            logger.warning(f"Failed to send email to pilot: {email_err}")
+
+    if observer_emails:
+        try:
+            await email_service.send_results_notification(
+                team_emails=observer_emails,
+                team_name=observer["name"],
+                nav_name=nav["name"],
+                overall_score=overall_score,
+                pdf_filename=pdf_filename
+            )
+        except Exception as email_err:
+            logger.warning(f"Failed to send email to observer: {email_err}")
+
+    logger.info(f"Scoring job {job['id']}: Successfully scored prenav_id={prenav['id']}, result_id={result_id}, overall_score={overall_score:.1f}")
+    return result_id
+
 @app.post("/flight", response_class=HTMLResponse)
 async def submit_flight(
     request: Request,
@@ -1569,7 +1813,11 @@ async def submit_flight(
     start_gate_id: int = Form(...),
     gpx_file: UploadFile = File(...)
 ):
-    """Submit post-flight GPX and process scoring. v0.4.6: Fixed actual_fuel field handling."""
+    """
+    Submit post-flight GPX for scoring. v0.4.6: Fixed actual_fuel field handling.
+    Validates the form, saves the GPX and queues a scoring job, returning 202 with
+    a page that polls the job until the result is ready.
+    """
     is_coach = user.get("is_coach", False)
     is_admin = user.get("is_admin", False)
     
@@ -1635,32 +1883,6 @@ async def submit_flight(
             else:
                 logger.info(f"Authorization passed: user {user['user_id']} is coach/admin, can submit for any pairing")
         
-        # Save GPX file
-        if not error:
-            try:
-                gpx_storage = Path(config["storage"]["gpx_uploads"])
-                gpx_storage.mkdir(parents=True, exist_ok=True)
-                
-                gpx_filename = f"gpx_{pairing['id']}_{prenav['nav_id']}_{int(datetime.utcnow().timestamp())}.gpx"
-                gpx_path = gpx_storage / gpx_filename
-                
-                gpx_content = await gpx_file.read()
-                if not gpx_content:
-                    error = "GPX file is empty"
-                else:
-                    gpx_path.write_bytes(gpx_content)
-            except Exception as e:
-                error = f"Failed to save GPX file: {str(e)}"
-        
-        # Parse GPX
-        if not error:
-            try:
-                track_points = parse_gpx(gpx_content)
-                if not track_points:
-                    error = "No track points found in GPX file"
-            except Exception as e:
-                error = f"Failed to parse GPX file: {str(e)}"
-        
         # Get NAV and checkpoints
         if not error:
             nav = db.get_nav(prenav["nav_id"])
@@ -1677,297 +1899,45 @@ async def submit_flight(
             if not start_gate:
                 error = "Invalid start gate"
         
-        # Detect start gate crossing
+        # Read the upload; it is only written once its job is queued
         if not error:
-            try:
-                start_crossing, start_distance = scoring_engine.detect_start_gate_crossing(
-                    track_points, start_gate
-                )
-                
-                if not start_crossing:
-                    error = "Could not detect start gate crossing. Please check your GPX file and try again."
-            except Exception as e:
-                error = f"Error detecting start gate: {str(e)}"
+            gpx_content = await gpx_file.read()
+            if not gpx_content:
+                error = "GPX file is empty"
         
-        # Score checkpoints
-        checkpoint_results = []
+        # Queue scoring; the page polls the job and opens the result when done.
+        # A submission already being scored is shown instead of queued twice
         if not error:
+            gpx_filename = f"gpx_{pairing['id']}_{prenav['nav_id']}_{int(datetime.utcnow().timestamp())}.gpx"
+            job_id, created = db.create_scoring_job(
+                prenav_id=prenav["id"],
+                user_id=user["user_id"],
+                gpx_filename=gpx_filename,
+                params={
+                    "actual_fuel": actual_fuel,
+                    "secrets_checkpoint": secrets_checkpoint,
+                    "secrets_enroute": secrets_enroute,
+                    "start_gate_id": start_gate_id,
+                    "ip_address": request.client.host if request.client else None,
+                }
+            )
+            if not created:
+                logger.info(f"POST /flight: prenav_id={prenav_id} already has scoring job {job_id}")
+                return flight_processing_response(request, job_id, prenav["id"], nav["name"], user)
+            
+            # Save GPX file
             try:
-                previous_point = start_crossing
-                previous_time = start_crossing["time"]
-                
-                for i, checkpoint in enumerate(checkpoints):
-                    timing_point, distance_nm, method, within_025 = scoring_engine.find_checkpoint_crossing(
-                        track_points, checkpoint, previous_point, previous_time
-                    )
-                    
-                    if not timing_point:
-                        logger.error(f"Could not find crossing for checkpoint {checkpoint['name']}")
-                        continue
-                    
-                    # Calculate leg score
-                    estimated_time = prenav["leg_times"][i]
-                    logger.debug(f"Checkpoint {i} ({checkpoint['name']}): estimated_time={estimated_time}s, distance={distance_nm}nm, method={method}")
-                    actual_time = (timing_point["time"] - previous_time).total_seconds()
-                    
-                    leg_score, off_course_penalty = scoring_engine.calculate_leg_score(
-                        actual_time, estimated_time, distance_nm, within_025
-                    )
-                    
-                    checkpoint_results.append({
-                        "name": checkpoint["name"],
-                        "distance_nm": distance_nm,
-                        "within_0_25_nm": within_025,
-                        "method": method,
-                        "estimated_time": estimated_time,
-                        "actual_time": actual_time,
-                        "deviation": actual_time - estimated_time,
-                        "leg_score": leg_score,
-                        "off_course_penalty": off_course_penalty
-                    })
-                    
-                    previous_point = timing_point
-                    previous_time = timing_point["time"]
+                gpx_storage = Path(config["storage"]["gpx_uploads"])
+                gpx_storage.mkdir(parents=True, exist_ok=True)
+                (gpx_storage / gpx_filename).write_bytes(gpx_content)
             except Exception as e:
-                error = f"Error scoring checkpoints: {str(e)}"
+                error = f"Failed to save GPX file: {str(e)}"
+                db.finish_scoring_job(job_id, error=error)
         
-        # If no error, proceed with scoring
         if not error:
-            try:
-                logger.info(f"POST /flight: Beginning flight scoring...")
-                logger.info(f"  prenav: {prenav}")
-                logger.info(f"  checkpoint_results count: {len(checkpoint_results)}")
-                logger.info(f"  checkpoint_results: {checkpoint_results}")
-                
-                # Calculate total scores
-                # Sum of individual leg penalties
-                leg_penalties = sum(cp["leg_score"] for cp in checkpoint_results)
-                
-                # Calculate actual total time from checkpoint crossings
-                actual_total_time = sum(cp["actual_time"] for cp in checkpoint_results)
-                
-                # Get estimated total time from prenav (user input, may have math errors)
-                estimated_total_time = prenav["total_time"]
-                
-                # Calculate total time penalty (separate component)
-                # Sign convention: negative = faster than estimated (actual < estimated)
-                total_time_deviation = actual_total_time - estimated_total_time
-                total_time_penalty = abs(total_time_deviation) * config["scoring"].get("timing_penalty_per_second", 1.0)
-                
-                # Total timing score = leg penalties + total time penalty (both are timing components)
-                total_time_score = leg_penalties + total_time_penalty
-                
-                # Calculate total off-course penalty
-                total_off_course = sum(cp["off_course_penalty"] for cp in checkpoint_results)
-                
-                logger.info(f"Timing breakdown: leg_penalties={leg_penalties:.1f}, total_time_penalty={total_time_penalty:.1f}, total={total_time_score:.1f}")
-                
-                fuel_penalty = scoring_engine.calculate_fuel_penalty(
-                    prenav["fuel_estimate"], actual_fuel
-                )
-                
-                # Calculate fuel error percentage
-                fuel_error_pct = 0
-                if prenav["fuel_estimate"] > 0:
-                    fuel_error_pct = ((actual_fuel - prenav["fuel_estimate"]) / prenav["fuel_estimate"]) * 100
-                
-                checkpoint_secrets_penalty, enroute_secrets_penalty = scoring_engine.calculate_secrets_penalty(
-                    secrets_checkpoint, secrets_enroute
-                )
-                
-                checkpoint_scores = [(cp["leg_score"], cp["off_course_penalty"]) for cp in checkpoint_results]
-                
-                # Pass ONLY the total_time_penalty (not leg_penalties + total_time_penalty)
-                # checkpoint_scores already contains the leg_score from each checkpoint
-                overall_score = scoring_engine.calculate_overall_score(
-                    checkpoint_scores,
-                    total_time_penalty,  # Changed from total_time_score to total_time_penalty
-                    fuel_penalty,
-                    checkpoint_secrets_penalty,
-                    enroute_secrets_penalty
-                )
-                
-                # Generate enhanced PDF with maps
-                pdf_storage = Path(config["storage"]["pdf_reports"])
-                pdf_storage.mkdir(parents=True, exist_ok=True)
-                
-                # Generate full route map
-                timestamp = int(datetime.utcnow().timestamp())
-                full_route_map_filename = f"route_map_{pairing['id']}_{prenav['nav_id']}_{timestamp}.png"
-                full_route_map_path = pdf_storage / full_route_map_filename
-                
-                generate_full_route_map(track_points, start_gate, checkpoints, full_route_map_path)
-                
-                # Generate checkpoint detail maps
-                checkpoint_maps_paths = []
-                for i, checkpoint in enumerate(checkpoints):
-                    map_filename = f"checkpoint_map_{i+1}_{pairing['id']}_{prenav['nav_id']}_{timestamp}.png"
-                    map_path = pdf_storage / map_filename
-                    # Determine previous checkpoint or start gate
-                    prev_checkpoint = checkpoints[i-1] if i > 0 else None
-                    generate_checkpoint_detail_map(
-                        track_points, checkpoint, i+1, map_path,
-                        start_gate=start_gate,
-                        previous_checkpoint=prev_checkpoint
-                    )
-                    checkpoint_maps_paths.append(map_path)
-                
-                # Generate PDF
-                pdf_filename = f"result_{pairing['id']}_{prenav['nav_id']}_{timestamp}.pdf"
-                pdf_path = pdf_storage / pdf_filename
-                
-                # Get pairing member names
-                pilot = db.get_user_by_id(pairing["pilot_id"])
-                observer = db.get_user_by_id(pairing["safety_observer_id"])
-                
-                pairing_display = {
-                    "pilot_name": pilot["name"] if pilot else "Unknown",
-                    "observer_name": observer["name"] if observer else "Unknown"
-                }
-                
-                result_data_for_pdf = {
-                    "overall_score": overall_score,
-                    "total_time_score": total_time_score,
-                    "leg_penalties": leg_penalties,
-                    "total_time_penalty": total_time_penalty,
-                    "total_time_deviation": total_time_deviation,
-                    "estimated_total_time": estimated_total_time,
-                    "actual_total_time": actual_total_time,
-                    "total_off_course": total_off_course,
-                    "fuel_penalty": fuel_penalty,
-                    "fuel_error_pct": fuel_error_pct,
-                    "estimated_fuel_burn": prenav["fuel_estimate"],
-                    "actual_fuel_burn": actual_fuel,
-                    "checkpoint_secrets_penalty": checkpoint_secrets_penalty,
-                    "enroute_secrets_penalty": enroute_secrets_penalty,
-                    "secrets_missed_checkpoint": secrets_checkpoint,
-                    "secrets_missed_enroute": secrets_enroute,
-                    "checkpoint_results": checkpoint_results,
-                    "scored_at": datetime.utcnow().isoformat(),
-                    "flight_started_at": prenav.get("submitted_at", datetime.utcnow().isoformat())
-                }
-                
-                # Call enhanced PDF generator
-                generate_enhanced_pdf_report(
-                    result_data_for_pdf, nav, pairing_display,
-                    start_gate, checkpoints, track_points,
-                    full_route_map_path, checkpoint_maps_paths,
-                    pdf_path
-                )
-                
-                # Save result to database
-                result_id = db.create_flight_result(
-                    prenav_id=prenav["id"],
-                    pairing_id=pairing["id"],
-                    nav_id=prenav["nav_id"],
-                    gpx_filename=gpx_filename,
-                    actual_fuel=actual_fuel,
-                    secrets_checkpoint=secrets_checkpoint,
-                    secrets_enroute=secrets_enroute,
-                    start_gate_id=start_gate_id,
-                    overall_score=overall_score,
-                    checkpoint_results=checkpoint_results,
-                    leg_penalties=leg_penalties,
-                    total_time_penalty=total_time_penalty,
-                    total_time_deviation=total_time_deviation,
-                    estimated_total_time=estimated_total_time,
-                    actual_total_time=actual_total_time,
-                    total_off_course=total_off_course,
-                    fuel_error_pct=fuel_error_pct,
-                    estimated_fuel_burn=prenav["fuel_estimate"],
-                    checkpoint_radius=config["scoring"]["off_course"].get("checkpoint_radius_nm", 0.25)
-                )
-                
-                # Log flight completion
-                ip_address = request.client.host if request.client else None
-                db.log_activity(
-                    user_id=user["user_id"],
-                    category="flight",
-                    activity_type="flight_scored",
-                    details=f"Flight scored: {nav['name']} - Score: {overall_score:.1f}",
-                    entity_type="flight_result",
-                    entity_id=result_id,
-                    ip_address=ip_address
-                )
-                
-                # Mark prenav as scored (v0.4.0)
-                db.mark_prenav_scored(prenav["id"])
-                logger.info(f"Marked prenav {prenav['id']} as scored")
-                
-                # Mark assignment as complete if exists (Item 37)
-                assignment = db.get_assignment_by_prenav(prenav["id"])
-                if assignment:
-                    db.mark_assignment_complete(assignment["id"])
-                    logger.info(f"Marked assignment {assignment['id']} as completed (NAV {prenav['nav_id']}, Pairing {pairing['id']})")
-                
-                # Update with PDF filename
-                from app.database import Database as DB
-                with db.get_connection() as conn:
-                    conn.execute(
-                        "UPDATE flight_results SET pdf_filename = ? WHERE id = ?",
-                        (pdf_filename, result_id)
-                    )
-                
-                # Send emails (including additional emails)
-                pilot_emails = db.get_all_emails_for_user(pilot["id"]) if pilot else []
-                observer_emails = db.get_all_emails_for_user(observer["id"]) if observer else []
-                
-                team_name = f"{pilot['name']} / {observer['name']}" if pilot and observer else "Team"
-                
-                if pilot_emails:
-                    try:
-                        await email_service.send_results_notification(
-                            team_emails=pilot_emails,
-                            team_name=pilot["name"],
-                            nav_name=nav["name"],
-                            overall_score=overall_score,
-                            pdf_filename=pdf_filename
-                        )
-                    except Exception as email_err:
-                        logger.warning(f"Failed to send email to pilot: {email_err}")
-                
-                if observer_emails:
-                    try:
-                        await email_service.send_results_notification(
-                            team_emails=observer_emails,
-                            team_name=observer["name"],
-                            nav_name=nav["name"],
-                            overall_score=overall_score,
-                            pdf_filename=pdf_filename
-                        )
-                    except Exception as email_err:
-                        logger.warning(f"Failed to send email to observer: {email_err}")
-                
-                # Redirect to results page
-                logger.info(f"POST /flight: Successfully scored prenav_id={prenav_id}, result_id={result_id}, overall_score={overall_score:.1f}. Redirecting to results page.")
-                return RedirectResponse(url=f"/results/{result_id}", status_code=303)
-            except Exception as e:
-                import traceback
-                logger.error(f"Error processing flight: {e}", exc_info=True)
-                logger.error(f"Exception type: {type(e).__name__}")
-                logger.error(f"Exception args: {e.args}")
-                logger.error(f"Exception message: {str(e)}")
-                logger.error(f"Exception traceback: {traceback.format_exc()}")
-                
-                # Log detailed context
-                logger.error(f"Context at error:")
-                logger.error(f"  prenav_id: {prenav_id}")
-                logger.error(f"  prenav: {prenav}")
-                logger.error(f"  nav_id: {prenav.get('nav_id') if prenav else None}")
-                logger.error(f"  checkpoint_results count: {len(checkpoint_results) if checkpoint_results else 0}")
-                if checkpoint_results:
-                    logger.error(f"  first checkpoint: {checkpoint_results[0] if len(checkpoint_results) > 0 else None}")
-                
-                # Provide better error message for common issues
-                error_str = str(e)
-                if "NOT NULL" in error_str:
-                    error = f"Database error: Missing required data. Please check all form fields are filled correctly."
-                elif "FOREIGN KEY" in error_str:
-                    error = f"Database error: Invalid reference. Please try again or contact support."
-                elif len(error_str) == 0 or error_str == "None":
-                    error = "An unknown error occurred during flight scoring. Please try again or contact support."
-                else:
-                    error = f"Error processing flight: {error_str}"
+            scoring_queue.enqueue(job_id)
+            logger.info(f"POST /flight: Queued scoring job {job_id} for prenav_id={prenav_id}")
+            return flight_processing_response(request, job_id, prenav["id"], nav["name"], user)
     
     except Exception as e:
         logger.error(f"Unexpected error in submit_flight: {e}", exc_info=True)
@@ -2022,6 +1992,27 @@ async def submit_flight(
             "error": error
         })
 
+@app.get("/flight/jobs/{job_id}")
+async def flight_job_status(job_id: int, user: dict = Depends(require_login)):
+    """Status of a scoring job, polled by the flight processing page."""
+    job = db.get_scoring_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scoring job not found")
+    
+    if not (user.get("is_coach") or user.get("is_admin")) and job["user_id"] != user["user_id"]:
+        prenav = db.get_prenav(job["prenav_id"])
+        pairing = db.get_pairing(prenav["pairing_id"]) if prenav else None
+        if not pairing or user["user_id"] not in [pairing["pilot_id"], pairing["safety_observer_id"]]:
+            raise HTTPException(status_code=403, detail="You don't have permission to view this job")
+    
+    return {
+        "id": job["id"],
+        "status": job["status"],
+        "result_url": f"/results/{job['result_id']}" if job["result_id"] else None,
+        "error": job["error"],
+        "queued_jobs": scoring_queue.pending(),
+    }
+
 @app.get("/flight/delete/{prenav_id}/confirm", response_class=HTMLResponse)
 async def confirm_delete_prenav(request: Request, prenav_id: int, user: dict = Depends(require_admin)):
     """Show confirmation page for pre-flight submission deletion."""
@@ -2066,6 +2057,32 @@ async def delete_prenav_submission(prenav_id: int, user: dict = Depends(require_
         logger.error(f"Error deleting prenav {prenav_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to delete submission")
 
+def result_display(result: dict) -> dict:
+    """Template fields of a flight result page, read from the stored result columns."""
+    return {
+        "id": result["id"],
+        "overall_score": result["overall_score"],
+        "checkpoint_results": result["checkpoint_results"],
+        "total_deviation": sum(abs(cp["deviation"]) for cp in result["checkpoint_results"]),
+        **pipeline.stored_penalties(config, result),
+        "estimated_fuel_burn": result.get("estimated_fuel_burn", 0),
+        "actual_fuel_burn": result["actual_fuel"],
+        "pdf_filename": result.get("pdf_filename"),
+        "scored_at": result["scored_at"],
+        "flight_started_at": result.get("flight_started_at"),  # Time when start gate was triggered
+        # New fields from v0.4.8
+        "leg_penalties": result.get("leg_penalties", 0),
+        "total_time_penalty": result.get("total_time_penalty", 0),
+        "total_time_deviation": result.get("total_time_deviation", 0),
+        "estimated_total_time": result.get("estimated_total_time", 0),
+        "actual_total_time": result.get("actual_total_time", 0),
+        "total_off_course": result.get("total_off_course", 0),
+        "fuel_error_pct": result.get("fuel_error_pct", 0),
+        "checkpoint_radius": result.get("checkpoint_radius", 0.25),
+        "secrets_missed_checkpoint": result["secrets_missed_checkpoint"],
+        "secrets_missed_enroute": result["secrets_missed_enroute"]
+    }
+
 @app.get("/results/{result_id}", response_class=HTMLResponse)
 async def view_result(request: Request, result_id: int, user: dict = Depends(require_login)):
     """View specific result. Issue 18: Better error handling and logging."""
@@ -2102,55 +2119,11 @@ async def view_result(request: Request, result_id: int, user: dict = Depends(req
                 "observer_name": observer["name"] if observer else "Unknown"
             }
         
-        # Get prenav - use fallback from result if prenav is missing
-        prenav = db.get_prenav(result["prenav_id"])
-        if not prenav:
-            logger.warning(f"Prenav {result['prenav_id']} not found for result {result_id}, using defaults from result")
-            # Create minimal prenav object from result data to allow viewing
-            prenav = {
-                "fuel_estimate": result.get("estimated_fuel_burn", 0),
-                "total_time": result.get("estimated_total_time", 0)
-            }
-        
-        # Build result display
-        result_display = {
-            "id": result["id"],
-            "overall_score": result["overall_score"],
-            "checkpoint_results": result["checkpoint_results"],
-            "total_time_score": result.get("leg_penalties", 0) + result.get("total_time_penalty", 0),
-            "total_deviation": sum(abs(cp["deviation"]) for cp in result["checkpoint_results"]),
-            "fuel_penalty": 0,  # Calculate from prenav and actual
-            "checkpoint_secrets_penalty": result["secrets_missed_checkpoint"] * config["scoring"]["secrets"]["checkpoint_penalty"],
-            "enroute_secrets_penalty": result["secrets_missed_enroute"] * config["scoring"]["secrets"]["enroute_penalty"],
-            "estimated_fuel_burn": result.get("estimated_fuel_burn") or prenav["fuel_estimate"],
-            "actual_fuel_burn": result["actual_fuel"],
-            "pdf_filename": result.get("pdf_filename"),
-            "scored_at": result["scored_at"],
-            "flight_started_at": prenav.get("submitted_at"),  # Time when start gate was triggered
-            # New fields from v0.4.8
-            "leg_penalties": result.get("leg_penalties", 0),
-            "total_time_penalty": result.get("total_time_penalty", 0),
-            "total_time_deviation": result.get("total_time_deviation", 0),
-            "estimated_total_time": result.get("estimated_total_time") or prenav.get("total_time", 0),
-            "actual_total_time": result.get("actual_total_time", 0),
-            "total_off_course": result.get("total_off_course", 0),
-            "fuel_error_pct": result.get("fuel_error_pct", 0),
-            "checkpoint_radius": result.get("checkpoint_radius", 0.25),
-            "secrets_missed_checkpoint": result["secrets_missed_checkpoint"],
-            "secrets_missed_enroute": result["secrets_missed_enroute"]
-        }
-        
-        # Recalculate fuel penalty
-        fuel_penalty = scoring_engine.calculate_fuel_penalty(
-            prenav["fuel_estimate"], result["actual_fuel"]
-        )
-        result_display["fuel_penalty"] = fuel_penalty
-        
         logger.debug(f"Successfully loaded result {result_id} for user {user['user_id']}")
         
         return templates.TemplateResponse("team/results.html", {
             "request": request,
-            "result": result_display,
+            "result": result_display(result),
             "nav": nav,
             "pairing": pairing_info,
             "member_name": user["name"]
@@ -2161,6 +2134,108 @@ async def view_result(request: Request, result_id: int, user: dict = Depends(req
         logger.error(f"Error viewing result {result_id}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error loading result: {str(e)}")
 
+# Reports being built, by cache key, so concurrent downloads share one build
+_report_builds: Dict[str, asyncio.Future] = {}
+
+async def result_report_path(result: dict) -> Optional[Path]:
+    """
+    Path of the PDF report for a flight result, building it on first request
+    from the route and rules the flight was scored with (its scoring_inputs).
+    Reports are cached by result row and generator code (see ReportCache).
+    Returns None when the report cannot be built, e.g. the GPX upload is gone.
+    """
+    scoring_inputs = result.get("scoring_inputs")
+    if not scoring_inputs or not result.get("gpx_filename"):
+        return None
+    gpx_path = Path(config["storage"]["gpx_uploads"]) / result["gpx_filename"]
+    if not gpx_path.exists():
+        return None
+
+    prenav = db.get_prenav(result["prenav_id"]) or {}
+    pairing = db.get_pairing(result["pairing_id"])
+    pilot = db.get_user_by_id(pairing["pilot_id"]) if pairing else None
+    observer = db.get_user_by_id(pairing["safety_observer_id"]) if pairing else None
+    pairing_display = {
+        "pilot_name": pilot["name"] if pilot else "Unknown",
+        "observer_name": observer["name"] if observer else "Unknown"
+    }
+    map_backend = config.get("reports", {}).get("map_backend", "raster")
+
+    # The result row carries the route and rules; these are the rest of the report
+    report_inputs = {
+        "pairing": pairing_display,
+        "prenav": [prenav.get("fuel_estimate"), prenav.get("total_time"), prenav.get("submitted_at")],
+        "map_backend": map_backend,
+    }
+    key = report_cache.make_key(result, report_inputs)
+    cached_path = report_cache.get(result["id"], key)
+    if cached_path:
+        return cached_path
+
+    build = _report_builds.get(key)
+    if build is None:
+        build = asyncio.ensure_future(build_result_report(
+            result, prenav, pairing_display, gpx_path, key, map_backend
+        ))
+        _report_builds[key] = build
+        build.add_done_callback(lambda _: _report_builds.pop(key, None))
+    # Shielded so one client disconnecting does not cancel a build others wait on
+    return await asyncio.shield(build)
+
+async def build_result_report(
+    result: dict, prenav: dict, pairing_display: dict,
+    gpx_path: Path, key: str, map_backend: str
+) -> Path:
+    """Build a result's PDF report on the stage executor and store it in the report cache."""
+    started = time.perf_counter()
+    scoring_inputs = result["scoring_inputs"]
+    checkpoints = scoring_inputs["checkpoints"]
+    start_gate = scoring_inputs["start_gate"]
+    nav = {"id": result["nav_id"], "name": scoring_inputs["nav_name"]}
+    scoring_config = {**config, "scoring": scoring_inputs["scoring"]}
+    gpx_content = gpx_path.read_bytes()
+    track_points = await stage_executor.run("load_track", pipeline.load_track, config["storage"], gpx_content)
+
+    route_map, checkpoint_maps = None, None
+    if map_backend != "vector":
+        # Maps rendered for an identical scoring run are kept with it in the scoring cache
+        scoring_key = scoring_cache.make_key(
+            track_cache.content_hash(gpx_content), checkpoints, start_gate,
+            scoring_config["scoring"], prenav.get("leg_times") or []
+        )
+        cached_scoring = scoring_cache.get(scoring_key)
+        map_names = ["route_map.png"] + [f"checkpoint_map_{i+1}.png" for i in range(len(checkpoints))]
+        cached_maps = [cached_scoring.artifact_bytes(name) for name in map_names] if cached_scoring else []
+        if cached_maps and all(cached_maps):
+            route_map, checkpoint_maps = cached_maps[0], cached_maps[1:]
+        else:
+            route_map, checkpoint_maps = await render_flight_maps(
+                track_points, start_gate, checkpoints,
+                Path(config["storage"]["pdf_reports"]), f"result_{result['id']}",
+                nav_id=nav["id"]
+            )
+            if cached_scoring:
+                scoring_cache.put(
+                    scoring_key, cached_scoring.checkpoint_results,
+                    dict(zip(map_names, [route_map] + checkpoint_maps))
+                )
+
+    pdf_path = report_cache.reserve_report(result["id"])
+    try:
+        await stage_executor.run(
+            "build_pdf", pipeline.build_pdf,
+            pipeline.report_data(scoring_config, result, prenav), nav, pairing_display,
+            start_gate, checkpoints, track_points,
+            route_map, checkpoint_maps,
+            pdf_path, map_backend
+        )
+    except BaseException:
+        pdf_path.unlink(missing_ok=True)
+        raise
+    cached_path = report_cache.put(result["id"], key, pdf_path)
+    logger.info(f"Built PDF report for result {result['id']} in {time.perf_counter() - started:.2f}s")
+    return cached_path
+
 @app.get("/results/{result_id}/pdf")
 async def download_pdf(result_id: int, user: dict = Depends(require_login)):
     """Download PDF report. v0.4.5: Allow coaches/admins to download any PDF."""
@@ -2177,14 +2252,19 @@ async def download_pdf(result_id: int, user: dict = Depends(require_login)):
         if user["user_id"] not in [pairing["pilot_id"], pairing["safety_observer_id"]]:
             raise HTTPException(status_code=403, detail="Not authorized")
     
-    if not result.get("pdf_filename"):
-        raise HTTPException(status_code=404, detail="PDF not found")
-    
-    pdf_path = Path(config["storage"]["pdf_reports"]) / result["pdf_filename"]
+    filename = result.get("pdf_filename") or f"result_{result_id}.pdf"
+    # Results scored before reports were built on demand keep the PDF written at scoring time
+    pdf_path = Path(config["storage"]["pdf_reports"]) / filename
     if not pdf_path.exists():
-        raise HTTPException(status_code=404, detail="PDF file not found")
+        try:
+            pdf_path = await result_report_path(result)
+        except Exception as e:
+            logger.error(f"Error building PDF report for result {result_id}: {e}", exc_info=True)
+            pdf_path = None
+        if pdf_path is None:
+            raise HTTPException(status_code=404, detail="PDF report could not be generated")
     
-    return FileResponse(pdf_path, media_type="application/pdf", filename=result["pdf_filename"])
+    return FileResponse(pdf_path, media_type="application/pdf", filename=filename)
 
 @app.get("/coach/navs/{nav_id}/pdf")
 async def download_nav_pdf(nav_id: int, user: dict = Depends(require_login)):
@@ -2241,43 +2321,33 @@ async def download_nav_pdf(nav_id: int, user: dict = Depends(require_login)):
         raise HTTPException(status_code=500, detail=f"Error downloading PDF: {str(e)}")
 
 @app.get("/results", response_class=HTMLResponse)
-async def list_results(request: Request, user: dict = Depends(require_login)):
+async def list_results(
+    request: Request,
+    user: dict = Depends(require_login),
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None
+):
     """List results - competitors see only their results, coaches/admins see all. Issue 18: Better error handling."""
+    page_size = clamp_page_size(page_size)
+    check_page_cursor(cursor)
     try:
         is_coach = user.get("is_coach", False)
         is_admin = user.get("is_admin", False)
         
         logger.info(f"Fetching results for user {user['user_id']}")
         
+        # Newest first, one page at a time, with NAV and pairing names
         if is_coach or is_admin:
             # Coaches/Admins see ALL results
-            results = db.list_flight_results()
+            results = db.list_flight_results_enriched(page_size=page_size, cursor=cursor, with_checkpoints=False)
         else:
             # Competitors see only their own results
-            pairings = db.list_pairings_for_member(user["user_id"], active_only=False)
-            pairing_ids = [p["id"] for p in pairings]
-            
-            results = []
-            for pairing_id in pairing_ids:
-                pairing_results = db.list_flight_results(pairing_id=pairing_id)
-                results.extend(pairing_results)
+            results = db.list_flight_results_enriched(
+                member_id=user["user_id"], page_size=page_size, cursor=cursor, with_checkpoints=False
+            )
         
         logger.info(f"Found {len(results)} results")
         
-        # Sort by date descending
-        results.sort(key=lambda r: r["scored_at"], reverse=True)
-        
-        # Enhance with NAV and pairing names
-        for result in results:
-            nav = db.get_nav(result["nav_id"])
-            result["nav_name"] = nav["name"] if nav else "Unknown"
-            
-            pairing = db.get_pairing(result["pairing_id"])
-            if pairing:
-                pilot = db.get_user_by_id(pairing["pilot_id"])
-                observer = db.get_user_by_id(pairing["safety_observer_id"])
-                result["team_name"] = f"{pilot['name']} / {observer['name']}" if pilot and observer else "Unknown"
-        
         logger.debug(f"Successfully loaded results page for user {user['user_id']}")
         
         # Use coach template for coaches/admins, team template for competitors
@@ -2286,7 +2356,8 @@ async def list_results(request: Request, user: dict = Depends(require_login)):
         return templates.TemplateResponse(template_name, {
             "request": request,
             "results": results,
-            "member_name": user["name"]
+            "member_name": user["name"],
+            **page_links(request, cursor, results.next_cursor)
         })
     except Exception as e:
         logger.error(f"Results page error for user {user['user_id']}: {e}", exc_info=True)
@@ -2299,30 +2370,18 @@ async def coach_dashboard(request: Request, user: dict = Depends(require_coach))
     """Coach main dashboard."""
     members = db.list_users(filter_type="approved")
     pairings = db.list_pairings(active_only=True)
-    results = db.list_flight_results()
     
     # Get pending approvals count (for admins)
     pending_users = db.list_users(filter_type="pending")
     pending_count = len(pending_users)
     
-    # Recent results (last 5)
-    recent = results[:5] if results else []
-    
-    # Enhance recent results
-    for result in recent:
-        nav = db.get_nav(result["nav_id"])
-        result["nav_name"] = nav["name"] if nav else "Unknown"
-        
-        pairing = db.get_pairing(result["pairing_id"])
-        if pairing:
-            pilot = db.get_user_by_id(pairing["pilot_id"])
-            observer = db.get_user_by_id(pairing["safety_observer_id"])
-            result["team_name"] = f"{pilot['name']} / {observer['name']}" if pilot and observer else "Unknown"
+    # Recent results (last 5) with NAV and team names
+    recent = db.list_flight_results_enriched(limit=5, with_checkpoints=False)
     
     # Calculate stats - ensure they're integers
     total_users_count = len(members) if members else 0
     active_pairings_count = len(pairings) if pairings else 0
-    recent_results_count = len(results) if results else 0
+    recent_results_count = db.count_flight_results()
     
     return templates.TemplateResponse("coach/dashboard.html", {
         "request": request,
@@ -2343,48 +2402,29 @@ async def coach_results(
     pairing_id: Optional[int] = None,
     nav_id: Optional[int] = None,
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None
 ):
     """Coach view results."""
     # Apply filters
     start_dt = datetime.fromisoformat(start_date) if start_date else None
     end_dt = datetime.fromisoformat(end_date + "T23:59:59") if end_date else None
     
-    results = db.list_flight_results(
+    # One page of results with NAV, pilot and observer names and the pre-flight fuel estimate
+    check_page_cursor(cursor)
+    results = db.list_flight_results_enriched(
         pairing_id=pairing_id,
         nav_id=nav_id,
         start_date=start_dt,
-        end_date=end_dt
+        end_date=end_dt,
+        page_size=clamp_page_size(page_size),
+        cursor=cursor,
+        with_checkpoints=False,
     )
     
-    # Enhance results
-    for result in results:
-        nav = db.get_nav(result["nav_id"])
-        result["nav_name"] = nav["name"] if nav else "Unknown"
-        
-        pairing = db.get_pairing(result["pairing_id"])
-        if pairing:
-            pilot = db.get_user_by_id(pairing["pilot_id"])
-            observer = db.get_user_by_id(pairing["safety_observer_id"])
-            result["pilot_name"] = pilot["name"] if pilot else "Unknown"
-            result["observer_name"] = observer["name"] if observer else "Unknown"
-        
-        # Calculate component scores
-        prenav = db.get_prenav(result["prenav_id"])
-        if prenav:
-            fuel_penalty = scoring_engine.calculate_fuel_penalty(
-                prenav["fuel_estimate"], result["actual_fuel"]
-            )
-            result["fuel_penalty"] = fuel_penalty
-            result["total_time_score"] = result.get("leg_penalties", 0) + result.get("total_time_penalty", 0)
-    
-    # Get all pairings and NAVs for filter dropdowns
+    # Get all pairings (with pilot and observer names) and NAVs for filter dropdowns
     pairings = db.list_pairings(active_only=False)
-    for pairing in pairings:
-        pilot = db.get_user_by_id(pairing["pilot_id"])
-        observer = db.get_user_by_id(pairing["safety_observer_id"])
-        pairing["pilot_name"] = pilot["name"] if pilot else "Unknown"
-        pairing["observer_name"] = observer["name"] if observer else "Unknown"
     
     navs = db.list_navs()
     
@@ -2396,7 +2436,8 @@ async def coach_results(
         "selected_pairing": pairing_id,
         "selected_nav": nav_id,
         "start_date": start_date or "",
-        "end_date": end_date or ""
+        "end_date": end_date or "",
+        **page_links(request, cursor, results.next_cursor)
     })
 
 @app.get("/coach/results/{result_id}", response_class=HTMLResponse)
@@ -2420,46 +2461,9 @@ async def coach_view_result(request: Request, result_id: int, user: dict = Depen
                 "observer_name": observer["name"] if observer else "Unknown"
             }
         
-        prenav = db.get_prenav(result["prenav_id"])
-        
-        # Handle missing prenav gracefully
-        if not prenav:
-            logger.warning(f"Prenav {result['prenav_id']} not found for result {result_id}, using defaults from result")
-            prenav = {
-                "fuel_estimate": result.get("estimated_fuel_burn", 0),
-                "total_time": result.get("estimated_total_time", 0)
-            }
-        
-        result_display = {
-            "id": result["id"],
-            "overall_score": result["overall_score"],
-            "checkpoint_results": result["checkpoint_results"],
-            "total_time_score": result.get("leg_penalties", 0) + result.get("total_time_penalty", 0),
-            "total_deviation": sum(abs(cp["deviation"]) for cp in result["checkpoint_results"]),
-            "fuel_penalty": scoring_engine.calculate_fuel_penalty(prenav["fuel_estimate"], result["actual_fuel"]),
-            "checkpoint_secrets_penalty": result["secrets_missed_checkpoint"] * config["scoring"]["secrets"]["checkpoint_penalty"],
-            "enroute_secrets_penalty": result["secrets_missed_enroute"] * config["scoring"]["secrets"]["enroute_penalty"],
-            "estimated_fuel_burn": result.get("estimated_fuel_burn") or prenav["fuel_estimate"],
-            "actual_fuel_burn": result["actual_fuel"],
-            "pdf_filename": result.get("pdf_filename"),
-            "scored_at": result["scored_at"],
-            "flight_started_at": prenav.get("submitted_at"),  # Time when start gate was triggered
-            # New fields from v0.4.8
-            "leg_penalties": result.get("leg_penalties", 0),
-            "total_time_penalty": result.get("total_time_penalty", 0),
-            "total_time_deviation": result.get("total_time_deviation", 0),
-            "estimated_total_time": result.get("estimated_total_time") or prenav.get("total_time", 0),
-            "actual_total_time": result.get("actual_total_time", 0),
-            "total_off_course": result.get("total_off_course", 0),
-            "fuel_error_pct": result.get("fuel_error_pct", 0),
-            "checkpoint_radius": result.get("checkpoint_radius", 0.25),
-            "secrets_missed_checkpoint": result["secrets_missed_checkpoint"],
-            "secrets_missed_enroute": result["secrets_missed_enroute"]
-        }
-        
         return templates.TemplateResponse("team/results.html", {
             "request": request,
-            "result": result_display,
+            "result": result_display(result),
             "nav": nav,
             "pairing": pairing_info,
             "member_name": "Coach",
@@ -2486,6 +2490,7 @@ async def coach_delete_result(result_id: int, user: dict = Depends(require_admin
             pdf_path = Path(config["storage"]["pdf_reports"]) / result["pdf_filename"]
             if pdf_path.exists():
                 pdf_path.unlink()
+        report_cache.discard(result_id)
         
         # Delete from DB
         db.delete_flight_result(result_id)
@@ -3344,6 +3349,7 @@ async def coach_delete_route(nav_id: int, request: Request, user: dict = Depends
         nav = db.get_nav(nav_id)
         nav_name = nav["name"] if nav else "Unknown"
         db.delete_nav(nav_id)
+        basemap_cache.discard(nav_id)
         
         # Log activity
         ip_address = request.client.host if request.client else None
@@ -3391,6 +3397,7 @@ async def coach_create_checkpoint(
     """Create checkpoint."""
     try:
         checkpoint_id = db.create_checkpoint(nav_id, sequence, name, lat, lon)
+        basemap_cache.discard(nav_id)
         return RedirectResponse(url=f"/coach/navs/checkpoints/{nav_id}?message=Checkpoint created", status_code=303)
     except Exception as e:
         logger.error(f"Error creating checkpoint: {e}")
@@ -3422,6 +3429,7 @@ async def coach_delete_checkpoint(checkpoint_id: int, user: dict = Depends(requi
             raise HTTPException(status_code=404, detail="Checkpoint not found")
         nav_id = checkpoint["nav_id"]
         db.delete_checkpoint(checkpoint_id)
+        basemap_cache.discard(nav_id)
         return RedirectResponse(url=f"/coach/navs/checkpoints/{nav_id}?message=Checkpoint deleted", status_code=303)
     except Exception as e:
         logger.error(f"Error deleting checkpoint: {e}")
@@ -3688,6 +3696,24 @@ async def coach_backup_status(request: Request, user: dict = Depends(require_adm
             "message": f"Error: {str(e)}"
         }
 
+@app.get("/coach/database/pool")
+async def coach_database_pool(request: Request, user: dict = Depends(require_admin)):
+    """Get database connection pool statistics (admin only). Returns JSON."""
+    return db.pool_stats()
+
+@app.get("/coach/database/writer")
+async def coach_database_writer(request: Request, user: dict = Depends(require_admin)):
+    """Get database writer thread statistics (admin only). Returns JSON."""
+    return db.writer_stats()
+
+@app.get("/coach/navs/{nav_id}/leg-stats")
+async def coach_nav_leg_stats(nav_id: int, request: Request, user: dict = Depends(require_coach)):
+    """Get per-checkpoint statistics across all flights of a NAV. Returns JSON."""
+    nav = db.get_nav(nav_id)
+    if not nav:
+        raise HTTPException(status_code=404, detail="NAV not found")
+    return {"nav_id": nav_id, "nav_name": nav["name"], "legs": db.get_leg_stats(nav_id)}
+
 # ===== CHECKPOINT MANAGEMENT (Item 36) =====
 
 @app.post("/coach/navs/checkpoints/create")
@@ -3703,6 +3729,7 @@ async def coach_create_checkpoint_new(
     """Create checkpoint - Item 36."""
     try:
         checkpoint_id = db.create_checkpoint(nav_id, sequence, name, lat, lon)
+        basemap_cache.discard(nav_id)
         logger.info(f"Created checkpoint {checkpoint_id} for NAV {nav_id}")
         return RedirectResponse(url=f"/coach/navs/route/{nav_id}?message=Checkpoint created", status_code=303)
     except Exception as e:
@@ -3728,6 +3755,7 @@ async def coach_update_checkpoint(
         
         nav_id = checkpoint["nav_id"]
         db.update_checkpoint(checkpoint_id, sequence, name, lat, lon)
+        basemap_cache.discard(nav_id)
         logger.info(f"Updated checkpoint {checkpoint_id}")
         return RedirectResponse(url=f"/coach/navs/route/{nav_id}?message=Checkpoint updated", status_code=303)
     except Exception as e:
@@ -3748,6 +3776,7 @@ async def coach_delete_checkpoint_new(
         
         nav_id = checkpoint["nav_id"]
         db.delete_checkpoint(checkpoint_id)
+        basemap_cache.discard(nav_id)
         logger.info(f"Deleted checkpoint {checkpoint_id}")
         return {"success": True}
     except Exception as e:
@@ -3765,6 +3794,8 @@ async def coach_reorder_checkpoints(request: Request, user: dict = Depends(requi
         # Update sequence for each checkpoint
         for cp in checkpoints:
             db.update_checkpoint_sequence(cp["id"], cp["sequence"])
+        if nav_id is not None:
+            basemap_cache.discard(int(nav_id))
         
         logger.info(f"Reordered {len(checkpoints)} checkpoints for NAV {nav_id}")
         return {"success": True}
@@ -3779,32 +3810,30 @@ async def coach_assignments(
     request: Request,
     user: dict = Depends(require_coach),
     status: str = "all",
-    semester: str = None
+    semester: str = None,
+    cursor: Optional[str] = None,
+    page_size: Optional[int] = None
 ):
     """View all NAV assignments. Coach/Admin only. Item 37."""
+    check_page_cursor(cursor)
     try:
         # Get filter params
         completed = None if status == "all" else (status == "completed")
         
-        # Get assignments
-        assignments = db.get_all_assignments(completed=completed, semester=semester)
+        # Get one page of assignments
+        assignments = db.get_all_assignments(
+            completed=completed, semester=semester,
+            page_size=clamp_page_size(page_size), cursor=cursor
+        )
         
-        # Get stats
-        all_assignments = db.get_all_assignments()
-        stats = {
-            "total": len(all_assignments),
-            "active": len([a for a in all_assignments if not a.get("completed_at")]),
-            "completed": len([a for a in all_assignments if a.get("completed_at")])
-        }
+        # Get stats and unique semesters
+        stats = db.get_assignment_stats()
+        semesters = stats.pop("semesters")
         
         # Get available pairings and NAVs for assignment form
         pairings = db.list_pairings(active_only=True)
         navs = db.list_navs()
         
-        # Get unique semesters
-        semesters = list(set([a.get("semester", "Spring 2026") for a in all_assignments]))
-        semesters.sort(reverse=True)
-        
         return templates.TemplateResponse("coach/assignments.html", {
             "request": request,
             "user": user,
@@ -3817,7 +3846,8 @@ async def coach_assignments(
             "filter_semester": semester,
             "is_admin": user["is_admin"],
             "message": request.query_params.get("message"),
-            "error": request.query_params.get("error")
+            "error": request.query_params.get("error"),
+            **page_links(request, cursor, assignments.next_cursor)
         })
     except Exception as e:
         logger.error(f"Error displaying assignments: {e}")
@@ -4262,6 +4292,9 @@ async def coach_activity_log_export(
 async def shutdown_event():
     """App shutdown."""
     logger.info("NAV Scoring app shutting down")
+    await scoring_queue.stop()
+    stage_executor.stop()
+    db.close()
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -0,0 +1,272 @@
+"""
+Route basemap cache for NAV Scoring System.
+The planned route, start gate, checkpoint markers, labels, axes and legend of
+the full route map are the same for every flight on a NAV. They are rendered
+once per (NAV, checkpoint version) into two RGBA layers, one below and one
+above the track, and each flight only renders its track and composites it in.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.disk_cache import DiskCache
+from app.pdf_generator import (
+    COLOR_ACTUAL_TRACK,
+    draw_route_static,
+    draw_route_track,
+    format_route_axes,
+    get_bounding_box,
+)
+from app.scoring_cache import checkpoint_fingerprint, code_fingerprint
+from app.simplify import pixel_size_nm
+from app.track import TrackArray
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layer layout changes
+BASEMAP_FORMAT = 1
+BASEMAP_MODULES = ("pdf_generator.py", "basemap.py", "simplify.py")
+DPI = 100
+# Same padding savefig(bbox_inches='tight') adds around the drawn area
+TIGHT_PAD_INCHES = 0.1
+# Basemaps kept in memory per process
+MEMORY_ENTRIES = 8
+
+
+class RouteBasemap:
+    """Pre-rendered static layers of one NAV's route map."""
+
+    def __init__(
+        self,
+        below: np.ndarray,
+        above: np.ndarray,
+        extent: Tuple[float, float, float, float],
+        axes_position: Tuple[float, float, float, float],
+        crop: Tuple[int, int, int, int],
+        figure_size: Tuple[float, float],
+    ):
+        self.below = below                  # opaque RGBA: background, grid, axes, planned route
+        self.above = above                  # transparent RGBA: markers, labels, legend
+        self.extent = extent                # (min_lat, min_lon, max_lat, max_lon)
+        self.axes_position = axes_position  # figure fraction (left, bottom, width, height)
+        self.crop = crop                    # pixel box (left, top, right, bottom) of the tight bbox
+        self.figure_size = figure_size
+
+    def contains(self, track: TrackArray) -> bool:
+        """True when the whole track fits inside the basemap extent."""
+        if not len(track):
+            return True
+        min_lat, min_lon, max_lat, max_lon = self.extent
+        return bool(
+            track.lat.min() >= min_lat and track.lat.max() <= max_lat
+            and track.lon.min() >= min_lon and track.lon.max() <= max_lon
+        )
+
+
+def _figure_rgba(fig) -> np.ndarray:
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba()).copy()
+
+
+def render_basemap(
+    start_gate: Dict,
+    checkpoints: List[Dict],
+    figure_size: Tuple[float, float] = (10, 8),
+) -> RouteBasemap:
+    """Render the static layers of a NAV's route map, extent padded around the route."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib.lines import Line2D
+
+    extent = get_bounding_box([start_gate] + checkpoints, padding_nm=1.5)
+    fig, ax = plt.subplots(figsize=figure_size, dpi=DPI)
+    try:
+        # Legend entry for the track that is composited in later
+        track_proxy = Line2D([], [], color=COLOR_ACTUAL_TRACK, linewidth=1.5, alpha=0.7, label='Actual Track')
+        ax.add_line(track_proxy)
+        below, above = draw_route_static(ax, start_gate, checkpoints)
+        above.append(format_route_axes(ax, extent))
+        plt.tight_layout()
+
+        # Crop box matching savefig(bbox_inches='tight'); image rows run top-down
+        fig.canvas.draw()
+        tight = fig.get_tightbbox(fig.canvas.get_renderer()).padded(TIGHT_PAD_INCHES)
+        height_px = int(round(figure_size[1] * DPI))
+        width_px = int(round(figure_size[0] * DPI))
+        crop = (
+            max(0, int(np.floor(tight.x0 * DPI))),
+            max(0, int(np.floor(height_px - tight.y1 * DPI))),
+            min(width_px, int(np.ceil(tight.x1 * DPI))),
+            min(height_px, int(np.ceil(height_px - tight.y0 * DPI))),
+        )
+
+        for artist in above:
+            artist.set_visible(False)
+        below_rgba = _figure_rgba(fig)
+
+        # Only the layer above the track, on a transparent figure
+        for artist in above:
+            artist.set_visible(True)
+        for artist in below:
+            artist.set_visible(False)
+        for hidden in (ax.xaxis, ax.yaxis, ax.title, ax.patch, fig.patch, *ax.spines.values()):
+            hidden.set_visible(False)
+        ax.xaxis.label.set_visible(False)
+        ax.yaxis.label.set_visible(False)
+        above_rgba = _figure_rgba(fig)
+
+        pos = ax.get_position()
+        axes_position = (pos.x0, pos.y0, pos.width, pos.height)
+    finally:
+        plt.close(fig)
+
+    return RouteBasemap(below_rgba, above_rgba, extent, axes_position, crop, tuple(figure_size))
+
+
+def _over(dst: np.ndarray, src: np.ndarray) -> np.ndarray:
+    """Alpha-composite straight-alpha RGBA src over opaque dst (float32 0..1)."""
+    alpha = src[..., 3:4]
+    out = dst.copy()
+    out[..., :3] = src[..., :3] * alpha + dst[..., :3] * (1 - alpha)
+    return out
+
+
+def composite_route_map(
+    basemap: RouteBasemap,
+    track: TrackArray,
+    checkpoints: Optional[List[Dict]] = None,
+) -> np.ndarray:
+    """Route map RGBA image: basemap below layer, then the track, then the above layer."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=basemap.figure_size, dpi=DPI)
+    try:
+        fig.patch.set_visible(False)
+        ax = fig.add_axes(basemap.axes_position)
+        ax.set_axis_off()
+        size_px = (basemap.figure_size[0] * DPI, basemap.figure_size[1] * DPI)
+        draw_route_track(ax, track, checkpoints, pixel_size_nm(basemap.extent, size_px) / 2)
+        min_lat, min_lon, max_lat, max_lon = basemap.extent
+        ax.set_xlim(min_lon, max_lon)
+        ax.set_ylim(min_lat, max_lat)
+        track_rgba = _figure_rgba(fig)
+    finally:
+        plt.close(fig)
+
+    image = basemap.below.astype(np.float32) / 255
+    image = _over(image, track_rgba.astype(np.float32) / 255)
+    image = _over(image, basemap.above.astype(np.float32) / 255)
+    left, top, right, bottom = basemap.crop
+    return (image[top:bottom, left:right] * 255 + 0.5).astype(np.uint8)
+
+
+class BasemapCache(DiskCache):
+    """
+    Route basemaps on disk (shared by worker processes, least recently used
+    evicted by total size) with a small in-memory LRU.
+    """
+
+    name = "basemap_cache"
+    default_max_mb = 256
+    pattern = "nav_*.npz"
+    label = "basemap cache"
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize basemap cache.
+
+        Args:
+            config: Storage configuration dict (pdf_reports, basemap_cache,
+                basemap_cache_max_mb with a 256 MB default; see DiskCache)
+        """
+        super().__init__(config)
+        self.fingerprint = code_fingerprint(BASEMAP_MODULES)
+        self.memory: "OrderedDict[str, RouteBasemap]" = OrderedDict()
+
+    def make_key(self, start_gate: Dict, checkpoints: List[Dict], figure_size: Tuple[float, float]) -> str:
+        """Key for a NAV's checkpoint version (route, start gate and basemap code)."""
+        material = {
+            "format": BASEMAP_FORMAT,
+            "code": self.fingerprint,
+            "start_gate": [start_gate.get("id"), start_gate["lat"], start_gate["lon"]],
+            "checkpoints": checkpoint_fingerprint(checkpoints),
+            "figure_size": list(figure_size),
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode()).hexdigest()
+
+    def path_for(self, nav_id: int, key: str) -> Path:
+        return self.cache_path / f"nav_{nav_id}_{key[:32]}.npz"
+
+    def get(
+        self,
+        nav_id: int,
+        start_gate: Dict,
+        checkpoints: List[Dict],
+        figure_size: Tuple[float, float] = (10, 8),
+    ) -> RouteBasemap:
+        """The NAV's basemap for this checkpoint version, rendering it on a miss."""
+        key = self.make_key(start_gate, checkpoints, figure_size)
+        path = self.path_for(nav_id, key)
+        basemap = self.memory.get(key)
+        if basemap is not None:
+            self.memory.move_to_end(key)
+            self.touch(path)
+            return basemap
+
+        basemap = self._load(path)
+        if basemap is None:
+            basemap = render_basemap(start_gate, checkpoints, figure_size)
+            self._store(path, basemap)
+            logger.info(f"Rendered route basemap for NAV {nav_id}")
+
+        self.memory[key] = basemap
+        while len(self.memory) > MEMORY_ENTRIES:
+            self.memory.popitem(last=False)
+        return basemap
+
+    def _load(self, path: Path) -> Optional[RouteBasemap]:
+        try:
+            with np.load(path) as data:
+                basemap = RouteBasemap(
+                    data["below"], data["above"],
+                    tuple(data["extent"].tolist()), tuple(data["axes_position"].tolist()),
+                    tuple(int(v) for v in data["crop"]), tuple(data["figure_size"].tolist()),
+                )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable basemap {path.name}: {e}")
+            self.remove(path)
+            return None
+        self.touch(path)
+        return basemap
+
+    def _store(self, path: Path, basemap: RouteBasemap):
+        stored = self.write_atomic(path, lambda f: np.savez_compressed(
+            f, below=basemap.below, above=basemap.above,
+            extent=np.array(basemap.extent), axes_position=np.array(basemap.axes_position),
+            crop=np.array(basemap.crop), figure_size=np.array(basemap.figure_size),
+        ))
+        if stored:
+            self.evict()
+
+    def discard(self, nav_id: int) -> int:
+        """Remove every stored basemap of a NAV (after its checkpoints change). Returns count removed."""
+        removed = 0
+        for path in self.cache_path.glob(f"nav_{nav_id}_*.npz"):
+            if self.remove(path):
+                removed += 1
+        # Other processes keep stale in-memory copies, but their keys no longer match
+        self.memory.clear()
+        if removed:
+            logger.info(f"Discarded {removed} route basemaps for NAV {nav_id}")
+        return removed
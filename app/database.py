@@ -6,21 +6,121 @@ Handles schema migrations, queries, and data access.
 import sqlite3
 import json
 import logging
+import base64
+import binascii
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Callable
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 import pytz
 
+from app.db_pool import ConnectionPool
+from app.db_writer import DEFAULT_MAX_BATCH, WriteQueue, writes
+
 logger = logging.getLogger(__name__)
 
 
+class Page(list):
+    """One page of a keyset-paginated listing. next_cursor is None on the last page."""
+
+    def __init__(self, rows=(), next_cursor: Optional[str] = None):
+        super().__init__(rows)
+        self.next_cursor = next_cursor
+
+
+class ResultRow(dict):
+    """
+    A flight_results row whose checkpoint_results JSON is decoded on first
+    access rather than when the row is read. Until then the key is not in the
+    dict, so copies and iteration only include it once it has been accessed.
+    """
+
+    __slots__ = ("_checkpoint_json",)
+
+    def __init__(self, row):
+        super().__init__(row)
+        self._checkpoint_json = self.pop("checkpoint_results", None)
+
+    def __missing__(self, key):
+        if key == "checkpoint_results" and self._checkpoint_json is not None:
+            value = json.loads(self._checkpoint_json)
+            self[key] = value
+            self._checkpoint_json = None
+            return value
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return super().__contains__(key) or (key == "checkpoint_results" and self._checkpoint_json is not None)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def encode_cursor(*values) -> str:
+    """Opaque page cursor for the sort key of the last row on a page."""
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Sort key values from a page cursor. Raises ValueError when it is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid page cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid page cursor")
+    if not all(isinstance(v, (str, int, float)) and not isinstance(v, bool) for v in values):
+        raise ValueError("Invalid page cursor")
+    return values
+
+
+def paginate(query: str, params: list, sort_column: str, id_column: str,
+             page_size: Optional[int], cursor: Optional[str]) -> str:
+    """
+    Finish a "WHERE ..." listing query newest first by (sort_column, id_column),
+    starting after cursor and fetching one row more than page_size (to detect
+    a next page). Appends to params; returns the query.
+    """
+    if cursor:
+        sort_value, id_value = decode_cursor(cursor, 2)
+        query += f" AND ({sort_column} < ? OR ({sort_column} = ? AND {id_column} < ?))"
+        params.extend([sort_value, sort_value, id_value])
+    query += f" ORDER BY {sort_column} DESC, {id_column} DESC"
+    if page_size:
+        query += " LIMIT ?"
+        params.append(page_size + 1)
+    return query
+
+
+def make_page(rows: List[Dict], page_size: Optional[int], sort_key: str) -> Page:
+    """Trim the look-ahead row of a paginate() query and set the next page's cursor."""
+    if not page_size or len(rows) <= page_size:
+        return Page(rows)
+    rows = rows[:page_size]
+    return Page(rows, encode_cursor(rows[-1][sort_key], rows[-1]["id"]))
+
+
 class Database:
-    def __init__(self, db_path: str = "data/navs.db"):
+    def __init__(self, db_path: str = "data/navs.db", config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            db_path: SQLite database file
+            config: Database configuration dict (connection pool settings, see
+                ConnectionPool; write_batch_max, most writes committed together)
+        """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        config = config or {}
+        # Readers share a pool of read-only connections; every write goes through the writer thread
+        self.pool = ConnectionPool(self.db_path, config, query_only=True)
+        self.writer = WriteQueue(self.db_path, config.get("write_batch_max", DEFAULT_MAX_BATCH))
         # Don't initialize immediately - do it lazily on first use
         self._initialized = False
+        # flight_results columns except the JSON ones (read once, after migrations)
+        self._summary_columns: Optional[List[str]] = None
 
     def _ensure_initialized(self):
         """Ensure database is initialized (lazy initialization)."""
@@ -31,24 +131,60 @@ class Database:
 
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections."""
+        """
+        Context manager for database connections. Inside a write call this is
+        the writer's connection (the writer commits); otherwise a read-only
+        connection borrowed from the pool.
+        """
         self._ensure_initialized()
-        # Use WAL mode for better concurrency, shorter timeout for faster failure detection
-        conn = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        # Enable WAL mode for better concurrent access
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA busy_timeout=5000")
+        if self.writer.owns_connection():
+            # Keep each block atomic within the writer's transaction
+            conn = self.writer.connection
+            conn.execute("SAVEPOINT connection_block")
+            try:
+                yield conn
+            except Exception as e:
+                conn.execute("ROLLBACK TO connection_block")
+                conn.execute("RELEASE connection_block")
+                logger.error(f"Database error: {e}")
+                raise
+            conn.execute("RELEASE connection_block")
+            return
+        conn = self.pool.acquire()
+        broken = False
         try:
             yield conn
             conn.commit()
         except Exception as e:
-            conn.rollback()
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                broken = True
             logger.error(f"Database error: {e}")
             raise
         finally:
-            conn.close()
+            self.pool.release(conn, discard=broken)
+
+    def write_connection(self):
+        """
+        Context manager for raw SQL writes (maintenance scripts): the write
+        connection for one transaction, committed when the block exits.
+        """
+        self._ensure_initialized()
+        return self.writer.transaction()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool counters for monitoring."""
+        return self.pool.stats()
+
+    def writer_stats(self) -> Dict[str, Any]:
+        """Writer thread counters for monitoring."""
+        return self.writer.stats()
+
+    def close(self):
+        """Stop the writer thread (after its queued writes) and close the pooled connections."""
+        self.writer.stop()
+        self.pool.close()
 
     def _init_db(self):
         """Initialize database with schema and run migrations."""
@@ -193,6 +329,7 @@ class Database:
 
     # ===== MEMBER MANAGEMENT =====
 
+    @writes
     def create_member(self, username: str, password_hash: str, email: str, name: str) -> int:
         """Create a new member account. Returns member ID."""
         with self.get_connection() as conn:
@@ -238,6 +375,7 @@ class Database:
             cursor.execute("SELECT * FROM users WHERE is_approved = 1 ORDER BY name")
             return [dict(row) for row in cursor.fetchall()]
 
+    @writes
     def update_member(self, member_id: int, **kwargs) -> bool:
         """Update member fields. Returns success."""
         allowed_fields = {"password_hash", "email", "name", "is_active"}
@@ -253,6 +391,7 @@ class Database:
             cursor.execute(f"UPDATE members SET {set_clause} WHERE id = ?", values)
             return cursor.rowcount > 0
 
+    @writes
     def update_member_last_login(self, member_id: int) -> bool:
         """Update last login timestamp."""
         with self.get_connection() as conn:
@@ -263,6 +402,7 @@ class Database:
             )
             return cursor.rowcount > 0
 
+    @writes
     def delete_member(self, member_id: int) -> bool:
         """Delete a member."""
         with self.get_connection() as conn:
@@ -270,6 +410,7 @@ class Database:
             cursor.execute("DELETE FROM members WHERE id = ?", (member_id,))
             return cursor.rowcount > 0
 
+    @writes
     def bulk_create_members(self, members: List[Tuple[str, str, str]]) -> int:
         """Bulk create members. Input: [(username, email, name), ...]"""
         with self.get_connection() as conn:
@@ -286,6 +427,7 @@ class Database:
 
     # ===== COACH MANAGEMENT =====
 
+    @writes
     def init_coach(self, username: str, password_hash: str, email: str) -> bool:
         """Initialize coach account."""
         with self.get_connection() as conn:
@@ -309,6 +451,7 @@ class Database:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    @writes
     def update_coach_password(self, password_hash: str) -> bool:
         """Update coach password."""
         with self.get_connection() as conn:
@@ -316,6 +459,7 @@ class Database:
             cursor.execute("UPDATE coach SET password_hash = ? WHERE id = 1", (password_hash,))
             return cursor.rowcount > 0
 
+    @writes
     def update_coach_last_login(self) -> bool:
         """Update coach last login timestamp."""
         with self.get_connection() as conn:
@@ -330,6 +474,7 @@ class Database:
         coach = self.get_coach()
         return coach.get("is_admin", 0) == 1 if coach else False
 
+    @writes
     def set_coach_admin(self, is_admin: bool) -> bool:
         """Set admin status for coach."""
         with self.get_connection() as conn:
@@ -342,6 +487,7 @@ class Database:
 
     # ===== UNIFIED USER MANAGEMENT (NEW) =====
 
+    @writes
     def create_user(self, username: str, password_hash: str, email: str, name: str, 
                    is_coach: bool = False, is_admin: bool = False, is_approved: bool = False,
                    email_verified: bool = False, must_reset_password: bool = False) -> int:
@@ -422,6 +568,7 @@ class Database:
             """)
             return [dict(row) for row in cursor.fetchall()]
 
+    @writes
     def update_user(self, user_id: int, **kwargs) -> bool:
         """Update user fields. Returns success."""
         allowed_fields = {"password_hash", "email", "name", "is_coach", "is_admin", "is_approved", "profile_picture_path", "must_reset_password", "can_modify_profile_picture"}
@@ -441,6 +588,7 @@ class Database:
         """Approve a pending user account."""
         return self.update_user(user_id, is_approved=1)
 
+    @writes
     def delete_user(self, user_id: int) -> bool:
         """Delete a user."""
         with self.get_connection() as conn:
@@ -448,6 +596,7 @@ class Database:
             cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
             return cursor.rowcount > 0
 
+    @writes
     def update_user_last_login(self, user_id: int) -> bool:
         """Update last login timestamp for user."""
         with self.get_connection() as conn:
@@ -460,6 +609,7 @@ class Database:
 
     # ===== USER EMAIL MANAGEMENT =====
 
+    @writes
     def add_user_email(self, user_id: int, email: str) -> bool:
         """Add additional email address for user. Returns success."""
         try:
@@ -481,6 +631,7 @@ class Database:
             logger.error(f"Error adding email for user {user_id}: {e}")
             return False
 
+    @writes
     def remove_user_email(self, user_id: int, email: str) -> bool:
         """Remove additional email address for user. Cannot remove primary email. Returns success."""
         try:
@@ -564,6 +715,7 @@ class Database:
 
     # ===== EMAIL VERIFICATION =====
 
+    @writes
     def create_verification_pending(self, email: str, password_hash: str, name: str, 
                                    verification_token: str) -> int:
         """Create a pending verification entry. Returns ID."""
@@ -599,6 +751,7 @@ class Database:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    @writes
     def delete_verification_pending(self, verification_id: int) -> bool:
         """Delete a verification pending entry."""
         with self.get_connection() as conn:
@@ -606,6 +759,7 @@ class Database:
             cursor.execute("DELETE FROM verification_pending WHERE id = ?", (verification_id,))
             return cursor.rowcount > 0
 
+    @writes
     def cleanup_expired_verification_pending(self) -> int:
         """Delete expired verification pending entries. Returns count deleted."""
         from datetime import datetime
@@ -622,6 +776,7 @@ class Database:
 
     # ===== PAIRING MANAGEMENT =====
 
+    @writes
     def create_pairing(self, pilot_id: int, safety_observer_id: int) -> int:
         """Create a new pairing. Returns pairing ID."""
         if pilot_id == safety_observer_id:
@@ -724,6 +879,7 @@ class Database:
         pairings = self.list_pairings_for_member(member_id, active_only=True)
         return pairings[0] if pairings else None
 
+    @writes
     def update_pairing(self, pairing_id: int, **kwargs) -> bool:
         """Update pairing fields. Returns success."""
         allowed_fields = {"pilot_id", "safety_observer_id", "is_active"}
@@ -743,6 +899,7 @@ class Database:
         """Disable a pairing (set is_active = 0)."""
         return self.update_pairing(pairing_id, is_active=0)
 
+    @writes
     def delete_pairing(self, pairing_id: int) -> bool:
         """Delete a pairing."""
         with self.get_connection() as conn:
@@ -752,6 +909,7 @@ class Database:
 
     # ===== AIRPORT MANAGEMENT =====
 
+    @writes
     def create_airport(self, code: str) -> int:
         """Create airport. Returns airport ID."""
         with self.get_connection() as conn:
@@ -777,6 +935,7 @@ class Database:
             cursor.execute("SELECT * FROM airports ORDER BY code")
             return [dict(row) for row in cursor.fetchall()]
 
+    @writes
     def delete_airport(self, airport_id: int) -> bool:
         """Delete airport."""
         with self.get_connection() as conn:
@@ -786,6 +945,7 @@ class Database:
 
     # ===== START GATE MANAGEMENT =====
 
+    @writes
     def create_start_gate(self, airport_id: int, name: str, lat: float, lon: float) -> int:
         """Create start gate. Returns gate ID."""
         with self.get_connection() as conn:
@@ -799,6 +959,7 @@ class Database:
             )
             return cursor.lastrowid
 
+    @writes
     def delete_start_gate(self, gate_id: int) -> bool:
         """Delete start gate."""
         with self.get_connection() as conn:
@@ -808,6 +969,7 @@ class Database:
 
     # ===== NAV & CHECKPOINT MANAGEMENT =====
 
+    @writes
     def create_nav(self, name: str, airport_id: int) -> int:
         """Create NAV route. Returns nav ID."""
         with self.get_connection() as conn:
@@ -818,6 +980,7 @@ class Database:
             )
             return cursor.lastrowid
 
+    @writes
     def delete_nav(self, nav_id: int) -> bool:
         """Delete NAV route."""
         with self.get_connection() as conn:
@@ -825,6 +988,7 @@ class Database:
             cursor.execute("DELETE FROM navs WHERE id = ?", (nav_id,))
             return cursor.rowcount > 0
 
+    @writes
     def create_checkpoint(self, nav_id: int, sequence: int, name: str, lat: float, lon: float) -> int:
         """Create checkpoint. Returns checkpoint ID."""
         with self.get_connection() as conn:
@@ -846,6 +1010,7 @@ class Database:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    @writes
     def delete_checkpoint(self, checkpoint_id: int) -> bool:
         """Delete checkpoint."""
         with self.get_connection() as conn:
@@ -853,6 +1018,7 @@ class Database:
             cursor.execute("DELETE FROM checkpoints WHERE id = ?", (checkpoint_id,))
             return cursor.rowcount > 0
 
+    @writes
     def update_checkpoint(self, checkpoint_id: int, sequence: int, name: str, lat: float, lon: float) -> bool:
         """Update checkpoint details. Item 36."""
         with self.get_connection() as conn:
@@ -864,6 +1030,7 @@ class Database:
             """, (sequence, name, lat, lon, checkpoint_id))
             return cursor.rowcount > 0
 
+    @writes
     def update_checkpoint_sequence(self, checkpoint_id: int, sequence: int) -> bool:
         """Update checkpoint sequence (for drag-and-drop reordering). Item 36."""
         with self.get_connection() as conn:
@@ -904,6 +1071,7 @@ class Database:
             )
             return [dict(row) for row in cursor.fetchall()]
 
+    @writes
     def update_nav_pdf(self, nav_id: int, pdf_path: str) -> bool:
         """Update NAV PDF path."""
         with self.get_connection() as conn:
@@ -911,6 +1079,7 @@ class Database:
             cursor.execute("UPDATE navs SET pdf_path = ? WHERE id = ?", (pdf_path, nav_id))
             return cursor.rowcount > 0
 
+    @writes
     def delete_nav_pdf(self, nav_id: int) -> bool:
         """Delete NAV PDF path (sets to NULL)."""
         with self.get_connection() as conn:
@@ -966,6 +1135,7 @@ class Database:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    @writes
     def create_secret(
         self, nav_id: int, name: str, lat: float, lon: float, secret_type: str
     ) -> int:
@@ -981,6 +1151,7 @@ class Database:
             )
             return cursor.lastrowid
 
+    @writes
     def delete_secret(self, secret_id: int) -> bool:
         """Delete a secret."""
         with self.get_connection() as conn:
@@ -990,6 +1161,7 @@ class Database:
 
     # ===== PRE-NAV SUBMISSIONS =====
 
+    @writes
     def create_prenav(
         self,
         pairing_id: int,
@@ -1064,6 +1236,7 @@ class Database:
             prenav["leg_times"] = json.loads(prenav["leg_times"])
             return prenav
 
+    @writes
     def delete_expired_prenavs(self) -> int:
         """Delete expired pre-NAV submissions. Returns count deleted."""
         with self.get_connection() as conn:
@@ -1188,6 +1361,7 @@ class Database:
             
             return submissions
 
+    @writes
     def mark_prenav_scored(self, prenav_id: int) -> bool:
         """Mark a prenav submission as scored. Returns success."""
         with self.get_connection() as conn:
@@ -1198,6 +1372,7 @@ class Database:
             )
             return cursor.rowcount > 0
 
+    @writes
     def archive_prenav(self, prenav_id: int) -> bool:
         """Archive a prenav submission (admin only). Returns success."""
         with self.get_connection() as conn:
@@ -1268,16 +1443,17 @@ class Database:
             
             return prenav
 
+    @writes
     def delete_prenav_submission(self, prenav_id: int) -> bool:
         """Delete a pre-flight submission (admin only). Returns success."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM prenav_submissions WHERE id = ?', (prenav_id,))
-            conn.commit()
             return cursor.rowcount > 0
 
     # ===== FLIGHT RESULTS =====
 
+    @writes
     def create_flight_result(
         self,
         prenav_id: int,
@@ -1299,8 +1475,20 @@ class Database:
         fuel_error_pct: float = 0,
         estimated_fuel_burn: float = 0,
         checkpoint_radius: float = 0.25,
+        fuel_penalty: Optional[float] = None,
+        checkpoint_secrets_penalty: Optional[float] = None,
+        enroute_secrets_penalty: Optional[float] = None,
+        total_time_score: Optional[float] = None,
+        scoring_inputs: Optional[Dict] = None,
     ) -> int:
-        """Create a flight result. Returns result ID."""
+        """
+        Create a flight result. Returns result ID.
+        Penalties left as None are filled in by the next backfill_result_penalties.
+        scoring_inputs is the route and rules the flight was scored with (NAV name,
+        checkpoints, start gate, scoring config); its report is built from them.
+        """
+        if total_time_score is None:
+            total_time_score = leg_penalties + total_time_penalty
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -1310,8 +1498,10 @@ class Database:
                  secrets_missed_checkpoint, secrets_missed_enroute, start_gate_id,
                  overall_score, checkpoint_results, leg_penalties, total_time_penalty,
                  total_time_deviation, estimated_total_time, actual_total_time,
-                 total_off_course, fuel_error_pct, estimated_fuel_burn, checkpoint_radius)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 total_off_course, fuel_error_pct, estimated_fuel_burn, checkpoint_radius,
+                 fuel_penalty, checkpoint_secrets_penalty, enroute_secrets_penalty, total_time_score,
+                 scoring_inputs)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     prenav_id,
@@ -1333,31 +1523,107 @@ class Database:
                     fuel_error_pct,
                     estimated_fuel_burn,
                     checkpoint_radius,
+                    fuel_penalty,
+                    checkpoint_secrets_penalty,
+                    enroute_secrets_penalty,
+                    total_time_score,
+                    json.dumps(scoring_inputs, default=str) if scoring_inputs is not None else None,
                 ),
             )
-            return cursor.lastrowid
+            result_id = cursor.lastrowid
+            self._insert_checkpoint_results(cursor, result_id, nav_id, checkpoint_results)
+            return result_id
+
+    @staticmethod
+    def _insert_checkpoint_results(cursor, result_id: int, nav_id: int, checkpoint_results: List[Dict]):
+        """
+        One flight_checkpoint_results row per leg, under the sequence of the NAV
+        checkpoint it was scored against (recorded in each leg by the pipeline).
+        """
+        cursor.executemany(
+            """
+            INSERT INTO flight_checkpoint_results
+            (result_id, nav_id, sequence, checkpoint_name, method, distance_nm, within_0_25_nm,
+             estimated_time, actual_time, deviation, leg_score, off_course_penalty)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    result_id,
+                    nav_id,
+                    cp["sequence"],
+                    cp.get("name"),
+                    cp.get("method"),
+                    cp.get("distance_nm"),
+                    cp.get("within_0_25_nm"),
+                    cp.get("estimated_time"),
+                    cp.get("actual_time"),
+                    cp.get("deviation"),
+                    cp.get("leg_score"),
+                    cp.get("off_course_penalty"),
+                )
+                for cp in checkpoint_results
+            ],
+        )
 
     def get_flight_result(self, result_id: int) -> Optional[Dict]:
-        """Get flight result by ID."""
+        """Get flight result by ID, with flight_started_at (when its pre-NAV was submitted)."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM flight_results WHERE id = ?", (result_id,))
+            cursor.execute(
+                """
+                SELECT fr.*, ps.submitted_at AS flight_started_at
+                FROM flight_results fr
+                LEFT JOIN prenav_submissions ps ON ps.id = fr.prenav_id
+                WHERE fr.id = ?
+                """,
+                (result_id,),
+            )
             row = cursor.fetchone()
             if not row:
                 return None
             result = dict(row)
             result["checkpoint_results"] = json.loads(result["checkpoint_results"])
+            if result.get("scoring_inputs"):
+                result["scoring_inputs"] = json.loads(result["scoring_inputs"])
             return result
 
+    def get_flight_result_id_for_prenav(self, prenav_id: int) -> Optional[int]:
+        """ID of the flight result scored for a pre-NAV submission, or None."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id FROM flight_results WHERE prenav_id = ? ORDER BY id LIMIT 1",
+                (prenav_id,),
+            )
+            row = cursor.fetchone()
+            return row["id"] if row else None
+
+    def _result_summary_columns(self, conn, alias: str) -> str:
+        """Select list of every flight_results column except the checkpoint_results and scoring_inputs JSON."""
+        if self._summary_columns is None:
+            columns = [row["name"] for row in conn.execute("PRAGMA table_info(flight_results)")]
+            self._summary_columns = [c for c in columns if c not in ("checkpoint_results", "scoring_inputs")]
+        return ", ".join(f"{alias}.{c}" for c in self._summary_columns)
+
     def list_flight_results(
         self,
         pairing_id: Optional[int] = None,
         nav_id: Optional[int] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-    ) -> List[Dict]:
-        """List flight results with optional filters."""
-        query = "SELECT * FROM flight_results WHERE 1=1"
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        with_checkpoints: bool = True,
+    ) -> Page:
+        """
+        List flight results with optional filters, newest first.
+        With page_size, returns at most that many results starting after cursor
+        (a previous page's next_cursor).
+        Rows are ResultRows (checkpoint_results decoded on access); with
+        with_checkpoints=False the checkpoint_results column is not read at all.
+        """
+        query = "SELECT {columns} FROM flight_results fr WHERE 1=1"
         params = []
 
         if pairing_id:
@@ -1373,27 +1639,292 @@ class Database:
             query += " AND scored_at <= ?"
             params.append(end_date)
 
-        query += " ORDER BY scored_at DESC"
+        query = paginate(query, params, "scored_at", "id", page_size, cursor)
 
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
+            columns = "fr.*" if with_checkpoints else self._result_summary_columns(conn, "fr")
+            db_cursor = conn.cursor()
+            db_cursor.execute(query.format(columns=columns), params)
+            results = [ResultRow(row) for row in db_cursor.fetchall()]
+            return make_page(results, page_size, "scored_at")
+
+    def list_flight_results_enriched(
+        self,
+        pairing_id: Optional[int] = None,
+        nav_id: Optional[int] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        member_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+        with_checkpoints: bool = True,
+    ) -> Page:
+        """
+        List flight results with their display names in one query: nav_name,
+        pilot_name, observer_name and team_name.
+        member_id limits results to pairings the member flew in (as pilot or observer).
+        Paginated, and with_checkpoints, like list_flight_results.
+        """
+        query = """
+            SELECT {columns},
+                   n.name AS nav_name,
+                   p.pilot_id, p.safety_observer_id,
+                   pilot.name AS pilot_name,
+                   observer.name AS observer_name
+            FROM flight_results fr
+            LEFT JOIN navs n ON n.id = fr.nav_id
+            LEFT JOIN pairings p ON p.id = fr.pairing_id
+            LEFT JOIN users pilot ON pilot.id = p.pilot_id
+            LEFT JOIN users observer ON observer.id = p.safety_observer_id
+            WHERE 1=1
+        """
+        params = []
+
+        if pairing_id:
+            query += " AND fr.pairing_id = ?"
+            params.append(pairing_id)
+        if nav_id:
+            query += " AND fr.nav_id = ?"
+            params.append(nav_id)
+        if start_date:
+            query += " AND fr.scored_at >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND fr.scored_at <= ?"
+            params.append(end_date)
+        if member_id:
+            query += " AND (p.pilot_id = ? OR p.safety_observer_id = ?)"
+            params.extend([member_id, member_id])
+
+        query = paginate(query, params, "fr.scored_at", "fr.id", page_size, cursor)
+        if limit and not page_size:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self.get_connection() as conn:
+            columns = "fr.*" if with_checkpoints else self._result_summary_columns(conn, "fr")
+            db_cursor = conn.cursor()
+            db_cursor.execute(query.format(columns=columns), params)
             results = []
+            for row in db_cursor.fetchall():
+                result = ResultRow(row)
+                result["nav_name"] = result["nav_name"] or "Unknown"
+                if result["pilot_name"] and result["observer_name"]:
+                    result["team_name"] = f"{result['pilot_name']} / {result['observer_name']}"
+                else:
+                    result["team_name"] = "Unknown"
+                result["pilot_name"] = result["pilot_name"] or "Unknown"
+                result["observer_name"] = result["observer_name"] or "Unknown"
+                results.append(result)
+            return make_page(results, page_size, "scored_at")
+
+    def count_flight_results(self) -> int:
+        """Number of flight results."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM flight_results")
+            return cursor.fetchone()[0]
+
+    def get_leg_stats(self, nav_id: int) -> List[Dict]:
+        """
+        Per-checkpoint statistics over every scored flight of a NAV, in
+        sequence order: flights, average (and average absolute) deviation in
+        seconds, average leg score and off-course penalty, and the share of
+        flights that passed within 0.25 NM.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT sequence,
+                       MAX(checkpoint_name) AS checkpoint_name,
+                       COUNT(*) AS flights,
+                       AVG(deviation) AS avg_deviation,
+                       AVG(ABS(deviation)) AS avg_abs_deviation,
+                       AVG(leg_score) AS avg_leg_score,
+                       AVG(off_course_penalty) AS avg_off_course_penalty,
+                       AVG(within_0_25_nm) AS within_0_25_nm_rate
+                FROM flight_checkpoint_results
+                WHERE nav_id = ?
+                GROUP BY sequence
+                ORDER BY sequence
+                """,
+                (nav_id,),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    @writes
+    def backfill_result_penalties(self, compute_penalties: Callable[[Dict], Dict]) -> int:
+        """
+        Store the penalty components of results scored before they were stored
+        (fuel_penalty still NULL). compute_penalties gets the result row, with
+        estimated_fuel_burn and estimated_total_time taken from its pre-NAV
+        where the result has none, and returns fuel_penalty,
+        checkpoint_secrets_penalty, enroute_secrets_penalty and total_time_score.
+        Returns the number of results updated.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT fr.id, fr.actual_fuel, fr.secrets_missed_checkpoint, fr.secrets_missed_enroute,
+                       fr.leg_penalties, fr.total_time_penalty, fr.total_time_score,
+                       COALESCE(NULLIF(fr.estimated_fuel_burn, 0), ps.fuel_estimate, 0) AS estimated_fuel_burn,
+                       COALESCE(NULLIF(fr.estimated_total_time, 0), ps.total_time, 0) AS estimated_total_time
+                FROM flight_results fr
+                LEFT JOIN prenav_submissions ps ON ps.id = fr.prenav_id
+                WHERE fr.fuel_penalty IS NULL
+                """
+            )
+            updates = []
             for row in cursor.fetchall():
                 result = dict(row)
-                result["checkpoint_results"] = json.loads(result["checkpoint_results"])
-                results.append(result)
-            return results
+                penalties = compute_penalties(result)
+                updates.append((
+                    penalties["fuel_penalty"],
+                    penalties["checkpoint_secrets_penalty"],
+                    penalties["enroute_secrets_penalty"],
+                    penalties["total_time_score"],
+                    result["estimated_fuel_burn"],
+                    result["estimated_total_time"],
+                    result["id"],
+                ))
+            cursor.executemany(
+                """
+                UPDATE flight_results
+                SET fuel_penalty = ?, checkpoint_secrets_penalty = ?, enroute_secrets_penalty = ?,
+                    total_time_score = ?, estimated_fuel_burn = ?, estimated_total_time = ?
+                WHERE id = ?
+                """,
+                updates,
+            )
+            return len(updates)
+
+    @writes
+    def update_flight_result_pdf(self, result_id: int, pdf_filename: str) -> bool:
+        """Set the PDF download name of a flight result."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE flight_results SET pdf_filename = ? WHERE id = ?",
+                (pdf_filename, result_id),
+            )
+            return cursor.rowcount > 0
 
+    @writes
     def delete_flight_result(self, result_id: int) -> bool:
         """Delete a flight result."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM flight_results WHERE id = ?", (result_id,))
+            deleted = cursor.rowcount > 0
+            cursor.execute("DELETE FROM flight_checkpoint_results WHERE result_id = ?", (result_id,))
+            return deleted
+
+    # ===== SCORING JOBS =====
+
+    @writes
+    def create_scoring_job(
+        self, prenav_id: int, user_id: int, gpx_filename: str, params: Dict
+    ) -> Tuple[int, bool]:
+        """
+        Queue a scoring job for a GPX upload unless the prenav submission already
+        has one queued or running. Returns (job ID, created); when not created,
+        the ID is the job already in progress.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO scoring_jobs (prenav_id, user_id, gpx_filename, params)
+                SELECT ?, ?, ?, ?
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM scoring_jobs
+                    WHERE prenav_id = ? AND status IN ('queued', 'running')
+                )
+                """,
+                (prenav_id, user_id, gpx_filename, json.dumps(params), prenav_id),
+            )
+            if cursor.rowcount:
+                return cursor.lastrowid, True
+            cursor.execute(
+                """
+                SELECT id FROM scoring_jobs
+                WHERE prenav_id = ? AND status IN ('queued', 'running')
+                ORDER BY id DESC LIMIT 1
+                """,
+                (prenav_id,),
+            )
+            return cursor.fetchone()["id"], False
+
+    def get_scoring_job(self, job_id: int) -> Optional[Dict]:
+        """Get scoring job by ID."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM scoring_jobs WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            job = dict(row)
+            job["params"] = json.loads(job["params"])
+            return job
+
+    def list_unfinished_scoring_jobs(self) -> List[Dict]:
+        """Queued or running jobs, oldest first (used to resume after a restart)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id FROM scoring_jobs WHERE status IN ('queued', 'running') ORDER BY id"
+            )
+            job_ids = [row["id"] for row in cursor.fetchall()]
+        return [self.get_scoring_job(job_id) for job_id in job_ids]
+
+    @writes
+    def start_scoring_job(self, job_id: int) -> bool:
+        """Mark a queued job as running. Returns False if it is no longer queued."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE scoring_jobs
+                SET status = 'running', started_at = CURRENT_TIMESTAMP, attempts = attempts + 1
+                WHERE id = ? AND status = 'queued'
+                """,
+                (job_id,),
+            )
+            return cursor.rowcount > 0
+
+    @writes
+    def finish_scoring_job(
+        self, job_id: int, result_id: Optional[int] = None, error: Optional[str] = None
+    ) -> bool:
+        """Mark a job done (with its result) or failed (with an error message)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE scoring_jobs
+                SET status = ?, result_id = ?, error = ?, finished_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+                """,
+                ("failed" if error else "done", result_id, error, job_id),
+            )
             return cursor.rowcount > 0
 
+    @writes
+    def requeue_running_scoring_jobs(self) -> int:
+        """Return jobs left running by a previous process to the queue. Returns count."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE scoring_jobs SET status = 'queued' WHERE status = 'running'"
+            )
+            return cursor.rowcount
+
     # ===== ACTIVITY LOGGING =====
 
+    @writes
     def log_activity(
         self,
         user_id: int,
@@ -1411,12 +1942,12 @@ class Database:
         Types: 'login', 'logout', 'create_nav', 'edit_nav', 'delete_nav',
                'submit_prenav', 'submit_postnav', 'create_pairing', etc.
         """
+        # Get user info for logging (before borrowing a connection for the insert)
+        user = self.get_user_by_id(user_id)
+        user_email = user.get("email") if user else None
+        user_name = user.get("name") if user else None
+
         with self.get_connection() as conn:
-            # Get user info for logging
-            user = self.get_user_by_id(user_id)
-            user_email = user.get("email") if user else None
-            user_name = user.get("name") if user else None
-            
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -1512,6 +2043,7 @@ class Database:
 
     # ===== NAV ASSIGNMENT METHODS (Item 37) =====
 
+    @writes
     def create_assignment(
         self,
         nav_id: int,
@@ -1586,9 +2118,14 @@ class Database:
     def get_all_assignments(
         self,
         completed: Optional[bool] = None,
-        semester: str = None
-    ) -> List[Dict]:
-        """Get all assignments (admin view). Can filter by completed status and semester."""
+        semester: str = None,
+        page_size: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page:
+        """
+        Get all assignments (admin view), newest first. Can filter by completed
+        status and semester, and paginate like list_flight_results.
+        """
         query = """
             SELECT 
                 a.id,
@@ -1627,12 +2164,41 @@ class Database:
             query += " AND a.semester = ?"
             params.append(semester)
 
-        query += " ORDER BY a.assigned_at DESC"
+        query = paginate(query, params, "a.assigned_at", "a.id", page_size, cursor)
 
+        with self.get_connection() as conn:
+            db_cursor = conn.cursor()
+            db_cursor.execute(query, params)
+            return make_page([dict(row) for row in db_cursor.fetchall()], page_size, "assigned_at")
+
+    def get_assignment_stats(self) -> Dict[str, Any]:
+        """
+        Assignment counts (total, active, completed) and the semesters in use,
+        newest first, over the assignments get_all_assignments lists.
+        """
+        # The joins of get_all_assignments: assignments of deleted NAVs or pairings are not listed
+        listed = """
+            FROM nav_assignments a
+            JOIN navs n ON a.nav_id = n.id
+            JOIN airports ap ON n.airport_id = ap.id
+            JOIN pairings p ON a.pairing_id = p.id
+            JOIN users pilot ON p.pilot_id = pilot.id
+            JOIN users observer ON p.safety_observer_id = observer.id
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            cursor.execute(f"""
+                SELECT COUNT(*) AS total,
+                       COUNT(*) - COUNT(a.completed_at) AS active,
+                       COUNT(a.completed_at) AS completed
+                {listed}
+            """)
+            stats = dict(cursor.fetchone())
+            cursor.execute(
+                f"SELECT DISTINCT a.semester {listed} WHERE a.semester IS NOT NULL ORDER BY a.semester DESC"
+            )
+            stats["semesters"] = [row[0] for row in cursor.fetchall()]
+            return stats
 
     def get_assignment(self, assignment_id: int) -> Optional[Dict]:
         """Get a single assignment by ID."""
@@ -1667,6 +2233,7 @@ class Database:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    @writes
     def mark_assignment_complete(self, assignment_id: int) -> bool:
         """Mark an assignment as completed."""
         try:
@@ -1705,6 +2272,7 @@ class Database:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    @writes
     def delete_assignment(self, assignment_id: int) -> bool:
         """Delete an assignment (admin only)."""
         try:
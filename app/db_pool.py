@@ -0,0 +1,206 @@
+"""
+SQLite connection pool for NAV Scoring System.
+Keeps a bounded set of open, pre-configured connections so each query does
+not pay for connect() and the PRAGMA round trips. Connections are checked
+before reuse when they have been idle for a while and closed once idle past
+the configured limit.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_ACQUIRE_TIMEOUT = 10.0
+# Idle connections are closed after this long (keeping at least min_idle open)
+DEFAULT_MAX_IDLE_SECONDS = 300.0
+# Connections idle this long are pinged with SELECT 1 before being handed out
+DEFAULT_HEALTH_CHECK_AFTER = 30.0
+
+
+def open_connection(db_path: str, query_only: bool = False) -> sqlite3.Connection:
+    """Open and configure a connection; the PRAGMAs are paid once per connection."""
+    conn = sqlite3.connect(str(db_path), timeout=5.0, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    # WAL mode for concurrent readers alongside a writer
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    if query_only:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of sqlite3 connections."""
+
+    def __init__(self, db_path: str, config: Optional[Dict[str, Any]] = None, query_only: bool = False):
+        """
+        Initialize connection pool.
+
+        Args:
+            db_path: SQLite database file
+            query_only: Open connections that refuse writes (for readers)
+            config: Database configuration dict with keys:
+                - pool_size: int, most connections open at once (default 8)
+                - pool_min_idle: int, idle connections kept past the idle limit (default 1)
+                - pool_max_idle_seconds: float, close idle connections after this (default 300)
+                - pool_health_check_seconds: float, ping connections idle longer than this (default 30)
+                - pool_acquire_timeout: float, seconds to wait for a free connection (default 10)
+        """
+        config = config or {}
+        self.db_path = str(db_path)
+        self.query_only = query_only
+        self.size = max(1, int(config.get("pool_size", DEFAULT_POOL_SIZE)))
+        self.min_idle = max(0, int(config.get("pool_min_idle", 1)))
+        self.max_idle_seconds = float(config.get("pool_max_idle_seconds", DEFAULT_MAX_IDLE_SECONDS))
+        self.health_check_after = float(config.get("pool_health_check_seconds", DEFAULT_HEALTH_CHECK_AFTER))
+        self.acquire_timeout = float(config.get("pool_acquire_timeout", DEFAULT_ACQUIRE_TIMEOUT))
+
+        self._lock = threading.Condition()
+        self._idle = deque()  # (connection, returned_at), most recently returned on the right
+        self._open = 0
+        self._closed = False
+        self._stats = {
+            "connections_created": 0,
+            "connections_closed_idle": 0,
+            "connections_discarded": 0,
+            "acquired": 0,
+            "reused": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+        }
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Check out a connection, opening one if the pool has room.
+        Raises sqlite3.OperationalError when none frees up within the acquire timeout.
+        """
+        deadline = None
+        waited_since = None
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise sqlite3.OperationalError("Connection pool is closed")
+                self._close_expired()
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    self._stats["reused"] += 1
+                    break
+                if self._open < self.size:
+                    # Reserve the slot; connect outside the lock
+                    self._open += 1
+                    conn, returned_at = None, None
+                    break
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + self.acquire_timeout
+                    waited_since = now
+                    self._stats["waits"] += 1
+                if now >= deadline:
+                    self._stats["timeouts"] += 1
+                    self._stats["wait_seconds"] += now - waited_since
+                    raise sqlite3.OperationalError(
+                        f"No database connection free after {self.acquire_timeout:.0f}s ({self.size} in use)"
+                    )
+                self._lock.wait(deadline - now)
+            self._stats["acquired"] += 1
+            if waited_since is not None:
+                self._stats["wait_seconds"] += time.monotonic() - waited_since
+
+        if conn is not None and time.monotonic() - returned_at >= self.health_check_after:
+            if not self._healthy(conn):
+                # Replace it in the same slot
+                self._close_quietly(conn)
+                conn = None
+        if conn is None:
+            try:
+                conn = open_connection(self.db_path, self.query_only)
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                    self._lock.notify()
+                raise
+            with self._lock:
+                self._stats["connections_created"] += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection, discard: bool = False):
+        """Return a connection (its transaction already committed or rolled back)."""
+        if not discard and conn.in_transaction:
+            # The caller left a transaction open; never hand that to the next user
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                discard = True
+        with self._lock:
+            if not discard and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                self._lock.notify()
+                return
+        self._discard(conn)
+
+    def _healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding broken database connection: {e}")
+            with self._lock:
+                self._stats["health_check_failures"] += 1
+                self._stats["connections_discarded"] += 1
+            return False
+
+    @staticmethod
+    def _close_quietly(conn: sqlite3.Connection):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _discard(self, conn: sqlite3.Connection):
+        """Close a checked-out connection and free its slot."""
+        self._close_quietly(conn)
+        with self._lock:
+            self._open -= 1
+            self._stats["connections_discarded"] += 1
+            self._lock.notify()
+
+    def _close_expired(self):
+        """Close connections idle past the limit, oldest first (call with the lock held)."""
+        cutoff = time.monotonic() - self.max_idle_seconds
+        while len(self._idle) > self.min_idle and self._idle[0][1] < cutoff:
+            conn, _ = self._idle.popleft()
+            self._close_quietly(conn)
+            self._open -= 1
+            self._stats["connections_closed_idle"] += 1
+
+    def close(self):
+        """Close every idle connection; checked-out ones are closed when released."""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._close_quietly(conn)
+                self._open -= 1
+            self._lock.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool counters for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+            })
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        return stats
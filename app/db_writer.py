@@ -0,0 +1,197 @@
+"""
+Single-writer thread for NAV Scoring System.
+Every mutating Database call runs on one thread that owns the only write
+connection, so writers never contend for SQLite's lock. Calls that queue up
+while a transaction is running are committed together in the next one, each
+inside its own SAVEPOINT so a failing call only undoes its own changes.
+"""
+
+import functools
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from app.db_pool import open_connection
+
+logger = logging.getLogger(__name__)
+
+# Most calls committed in one transaction
+DEFAULT_MAX_BATCH = 32
+
+
+class _WriteCall:
+    __slots__ = ("func", "args", "kwargs", "future")
+
+    def __init__(self, func: Callable, args: tuple, kwargs: dict):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+
+
+class WriteQueue:
+    """Runs write calls one at a time on a dedicated thread holding the write connection."""
+
+    def __init__(self, db_path: str, max_batch: int = DEFAULT_MAX_BATCH):
+        self.db_path = str(db_path)
+        self.max_batch = max(1, int(max_batch))
+        self._queue: "queue.SimpleQueue[Optional[_WriteCall]]" = queue.SimpleQueue()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Held by whichever thread is using the write connection
+        self._lock = threading.RLock()
+        self._owner: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats = {"transactions": 0, "calls": 0, "failed_calls": 0, "largest_batch": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = open_connection(self.db_path)
+            # Transactions are managed explicitly (BEGIN/SAVEPOINT/COMMIT)
+            self._conn.isolation_level = None
+        return self._conn
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Finish queued calls, then stop the thread and close the connection."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+        self._thread = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def owns_connection(self) -> bool:
+        """True on the thread currently using the write connection."""
+        return self._owner == threading.get_ident()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The write connection (only valid while owns_connection() is True)."""
+        return self._connection()
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) on the writer thread and return its result once
+        its transaction has committed. Runs inline when already on the writer.
+        """
+        if self.owns_connection():
+            return func(*args, **kwargs)
+        self.start()
+        write_call = _WriteCall(func, args, kwargs)
+        self._queue.put(write_call)
+        return write_call.future.result()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Borrow the write connection on the calling thread for one transaction
+        (maintenance scripts doing raw SQL). Queued calls wait until it ends.
+        """
+        with self._lock:
+            conn = self._connection()
+            self._owner = threading.get_ident()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield conn
+                    if conn.in_transaction:
+                        conn.execute("COMMIT")
+                except BaseException:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+            finally:
+                self._owner = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            write_call = self._queue.get()
+            if write_call is None:
+                break
+            batch = [write_call]
+            while len(batch) < self.max_batch:
+                try:
+                    write_call = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if write_call is None:
+                    stopping = True
+                    break
+                batch.append(write_call)
+            with self._lock:
+                self._owner = threading.get_ident()
+                try:
+                    self._run_batch(batch)
+                finally:
+                    self._owner = None
+
+    def _run_batch(self, batch):
+        """Run a batch in one transaction, one SAVEPOINT per call."""
+        outcomes = []
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            for write_call in batch:
+                conn.execute("SAVEPOINT write_call")
+                try:
+                    result = write_call.func(*write_call.args, **write_call.kwargs)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write_call")
+                    conn.execute("RELEASE write_call")
+                    outcomes.append((write_call, None, e))
+                else:
+                    conn.execute("RELEASE write_call")
+                    outcomes.append((write_call, result, None))
+            conn.execute("COMMIT")
+        except Exception as e:
+            # The transaction itself failed: nothing in the batch was written
+            logger.error(f"Database write transaction failed ({len(batch)} calls): {e}")
+            if self._conn is not None and self._conn.in_transaction:
+                try:
+                    self._conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    self._conn.close()
+                    self._conn = None
+            for write_call in batch:
+                write_call.future.set_exception(e)
+            self._stats["failed_calls"] += len(batch)
+            return
+
+        self._stats["transactions"] += 1
+        self._stats["calls"] += len(batch)
+        self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+        for write_call, result, error in outcomes:
+            if error is not None:
+                self._stats["failed_calls"] += 1
+                write_call.future.set_exception(error)
+            else:
+                write_call.future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Writer counters for monitoring."""
+        stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+
+def writes(method: Callable) -> Callable:
+    """Mark a Database method as mutating: it runs on the database's writer thread."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._ensure_initialized()
+        return self.writer.call(method, self, *args, **kwargs)
+    return wrapper
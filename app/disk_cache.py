@@ -0,0 +1,130 @@
+"""
+Disk cache base for NAV Scoring System.
+The track, scoring, report and basemap caches each keep their entries in one
+directory with a disk budget. This holds what they share: where the directory
+is, marking entries as recently used, writing entries atomically (temp file
+or directory, then rename) and evicting the least recently used entries once
+the directory is over budget. Each cache supplies its keys and entry layout.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """A cache directory with atomic writes and least-recently-used eviction by total size."""
+
+    # Config key of the cache directory; the budget is "<name>_max_mb"
+    name = "cache"
+    # Config key (and its default) of the directory the cache lives under by default
+    parent_key = "pdf_reports"
+    parent_default = "data/pdf_reports"
+    default_max_mb = 512
+    # Entries (files or directories) counted against the budget
+    pattern = "*"
+    # Cache name in log messages
+    label = "cache"
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Args:
+            config: Storage configuration dict with keys:
+                - <parent_key>: str (cache defaults to <parent_key>/<name>)
+                - <name>: str, optional cache directory
+                - <name>_max_mb: float, disk budget (default default_max_mb)
+        """
+        default_path = Path(config.get(self.parent_key, self.parent_default)) / self.name
+        self.cache_path = Path(config.get(self.name, default_path))
+        self.max_bytes = int(float(config.get(f"{self.name}_max_mb", self.default_max_mb)) * 1024 * 1024)
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def touch(path: Path) -> bool:
+        """Mark an entry as recently used for eviction. Returns False if it does not exist."""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        except OSError:
+            pass
+        return True
+
+    def reserve(self, prefix: str, suffix: str = ".tmp") -> Path:
+        """Temporary file in the cache directory to build an entry into (ignored by evict)."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_path, prefix=f".{prefix}.", suffix=suffix)
+        os.close(fd)
+        return Path(tmp_path)
+
+    def reserve_dir(self, prefix: str) -> Path:
+        """Temporary directory in the cache directory to assemble an entry in."""
+        return Path(tempfile.mkdtemp(dir=self.cache_path, prefix=f".{prefix}."))
+
+    def write_atomic(self, path: Path, write: Callable[[BinaryIO], None]) -> bool:
+        """
+        Write an entry file through write(file) into a temp file, then rename it
+        over path, so readers never see a partial entry. Returns False on failure.
+        """
+        tmp_path = self.reserve(path.stem)
+        try:
+            with open(tmp_path, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logger.error(f"Error writing {self.label} entry {path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+
+    def remove(self, path: Path) -> bool:
+        """Delete an entry file or directory. Returns True if it was there."""
+        try:
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            logger.warning(f"Could not remove {self.label} entry {path.name}: {e}")
+            return False
+
+    @staticmethod
+    def _entry_size(path: Path) -> int:
+        if path.is_dir():
+            return sum(f.stat().st_size for f in path.iterdir())
+        return path.stat().st_size
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits its budget. Returns count removed."""
+        entries = []
+        total = 0
+        for path in self.cache_path.glob(self.pattern):
+            # Entries still being written
+            if path.name.startswith("."):
+                continue
+            try:
+                size = self._entry_size(path)
+                entries.append((path.stat().st_mtime, size, path))
+            except FileNotFoundError:
+                continue
+            total += size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if self.remove(path):
+                removed += 1
+                total -= size
+            elif not path.exists():
+                total -= size
+        if removed:
+            logger.info(f"Evicted {removed} {self.label} entries")
+        return removed
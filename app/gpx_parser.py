@@ -0,0 +1,131 @@
+"""
+Streaming GPX track reader.
+Walks <trkpt> elements straight from the uploaded bytes with ElementTree.iterparse
+and writes them into preallocated NumPy columns, without building a gpxpy
+object tree or decoding the whole file into a string first.
+
+Field handling follows gpxpy so both readers produce the same track:
+- only <trk>/<trkseg>/<trkpt> points are read (routes and waypoints are not)
+- <speed> is read only from GPX 1.0 files (a missing version means 1.0)
+- timestamps without a zone are treated as UTC
+"""
+
+import io
+import logging
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import gpxpy
+from gpxpy.gpxfield import parse_time
+
+from app.track import TrackArray, datetime_to_epoch_us
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_times(values) -> np.ndarray:
+    """Timestamps as int64 epoch microseconds, using NumPy's parser for plain UTC stamps."""
+    if all(len(v) > 19 and v[10] in "T " and v[-1] == "Z" for v in values):
+        try:
+            stamps = np.array([v[:-1] for v in values], dtype="datetime64[us]")
+            return stamps.astype(np.int64)
+        except ValueError:
+            pass
+    return np.array([datetime_to_epoch_us(parse_time(v)) for v in values], dtype=np.int64)
+
+
+def read_gpx_track(gpx_content: bytes) -> TrackArray:
+    """
+    Read every track point of a GPX file into a TrackArray.
+
+    Raises ValueError when a point has no timestamp. Malformed XML raises
+    ET.ParseError; callers may fall back to gpxpy for anything this reader rejects.
+    """
+    # Upper bound on the number of points (opening and closing tags both match)
+    capacity = gpx_content.count(b"trkpt")
+    lat = np.empty(capacity, dtype=np.float64)
+    lon = np.empty(capacity, dtype=np.float64)
+    speed = np.zeros(capacity, dtype=np.float64)
+    elevation = np.zeros(capacity, dtype=np.float64)
+    times = []
+
+    events = ET.iterparse(io.BytesIO(gpx_content), events=("start", "end"))
+    _, root = next(events)
+    namespace = root.tag[: root.tag.index("}") + 1] if root.tag.startswith("{") else ""
+    read_speed = (root.get("version") or "1.0") == "1.0"
+    trkseg_tag, trkpt_tag = namespace + "trkseg", namespace + "trkpt"
+    time_tag, ele_tag, speed_tag = namespace + "time", namespace + "ele", namespace + "speed"
+
+    segment = None
+    n = 0
+    for event, elem in events:
+        if elem.tag != trkpt_tag:
+            if elem.tag == trkseg_tag and event == "start":
+                segment = elem
+            continue
+        if event == "start":
+            continue
+
+        lat[n] = float(elem.get("lat"))
+        lon[n] = float(elem.get("lon"))
+        time_text = (elem.findtext(time_tag) or "").strip()
+        if not time_text:
+            raise ValueError(f"Track point {n} has no timestamp")
+        times.append(time_text)
+        ele_text = (elem.findtext(ele_tag) or "").strip()
+        if ele_text:
+            elevation[n] = float(ele_text)
+        if read_speed:
+            speed_text = (elem.findtext(speed_tag) or "").strip()
+            if speed_text:
+                speed[n] = float(speed_text)
+        n += 1
+
+        # Drop finished points so memory stays flat on long logs
+        elem.clear()
+        if segment is not None:
+            del segment[:]
+
+    return TrackArray(lat[:n], lon[:n], _parse_times(times), speed[:n], elevation[:n])
+
+
+def parse_gpx(gpx_content: bytes) -> TrackArray:
+    """
+    Parse GPX file and extract track points into a columnar TrackArray.
+    Uses the streaming reader, falling back to gpxpy for files it cannot handle.
+    """
+    try:
+        track_points = read_gpx_track(gpx_content)
+        logger.info(f"Parsed GPX: {len(track_points)} track points")
+        return track_points
+    except ValueError as e:
+        logger.error(f"GPX parsing error: {e}")
+        raise ValueError(f"Failed to parse GPX file: {e}")
+    except Exception as e:
+        logger.warning(f"Streaming GPX reader failed ({e}), retrying with gpxpy")
+
+    try:
+        gpx = gpxpy.parse(gpx_content.decode('utf-8'))
+        points = [
+            point
+            for track in gpx.tracks
+            for segment in track.segments
+            for point in segment.points
+        ]
+        for i, point in enumerate(points):
+            if point.time is None:
+                raise ValueError(f"Track point {i} has no timestamp")
+        
+        track_points = TrackArray(
+            lat=[point.latitude for point in points],
+            lon=[point.longitude for point in points],
+            time=[datetime_to_epoch_us(point.time) for point in points],
+            speed=[point.speed or 0.0 for point in points],
+            elevation=[point.elevation or 0.0 for point in points],
+        )
+        
+        logger.info(f"Parsed GPX: {len(track_points)} track points")
+        return track_points
+    except Exception as e:
+        logger.error(f"GPX parsing error: {e}")
+        raise ValueError(f"Failed to parse GPX file: {e}")
@@ -7,21 +7,28 @@ import logging
 import io
 import html
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime
 
 # Matplotlib imports - moved to functions that need them
 # matplotlib is only required for generating maps, not for PDF generation
 
 from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak, KeepTogether
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak, KeepTogether, Flowable
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.lib.units import inch
 
+from app.track import TrackArray, as_track_array
+from app.simplify import pixel_size_nm, simplify_track
+
 logger = logging.getLogger(__name__)
 
+# A rendered map: PNG bytes, an in-memory buffer, a file path or a vector
+# drawing (see app.vector_maps)
+MapImage = Union[bytes, io.BytesIO, Path, str, Flowable, None]
+
 # ===== CONSTANTS =====
 CHECKPOINT_RADIUS_NM = 0.25
 COLOR_PLANNED_ROUTE = '#0066CC'  # Blue
@@ -142,69 +149,89 @@ def get_bounding_box(points: List[Dict], padding_nm: float = 1.0) -> Tuple[float
     return (min_lat, min_lon, max_lat, max_lon)
 
 
-def add_direction_arrows(ax, points: List[Dict], interval: int = 10, 
+def add_direction_arrows(ax, points: Union[TrackArray, List[Dict]], interval: int = 10, 
                         color: str = 'red', alpha: float = 0.7, 
                         arrow_size: float = 0.01):
     """
     Add directional arrows along a track to indicate direction of travel.
+    All arrows are drawn by one quiver call (a single artist).
     
     Args:
         ax: Matplotlib axis to draw on
-        points: List of points with 'lat' and 'lon' keys
+        points: Track (TrackArray or list of points with 'lat' and 'lon' keys)
         interval: Sample every N points (e.g., 10 = every 10th point)
         color: Arrow color
         alpha: Arrow transparency
-        arrow_size: Size of arrow head (in plot units)
+        arrow_size: Length of each arrow (in plot units)
     """
-    from matplotlib.patches import FancyArrowPatch
-    import math
-    
-    if len(points) < 2:
-        return
-    
-    # Sample points at regular intervals
-    sampled_indices = list(range(0, len(points) - 1, max(1, interval)))
+    import numpy as np
     
-    for idx in sampled_indices:
-        if idx + 1 >= len(points):
-            break
-        
-        current = points[idx]
-        next_point = points[idx + 1]
-        
-        lon1, lat1 = current['lon'], current['lat']
-        lon2, lat2 = next_point['lon'], next_point['lat']
-        
-        # Calculate direction vector
-        dlon = lon2 - lon1
-        dlat = lat2 - lat1
-        
-        # Skip if points are too close
-        if abs(dlon) < 1e-6 and abs(dlat) < 1e-6:
-            continue
-        
-        # Normalize direction
-        magnitude = math.sqrt(dlon**2 + dlat**2)
-        dlon_norm = dlon / magnitude
-        dlat_norm = dlat / magnitude
-        
-        # Draw arrow from current point in direction of next point
-        arrow = FancyArrowPatch(
-            (lon1, lat1),
-            (lon1 + dlon_norm * arrow_size, lat1 + dlat_norm * arrow_size),
-            arrowstyle='->', mutation_scale=15, 
-            color=color, alpha=alpha, linewidth=1.5, zorder=4
-        )
-        ax.add_patch(arrow)
+    track = as_track_array(points)
+    if len(track) < 2:
+        return None
+    
+    # Sample points at regular intervals; each arrow points towards the next point
+    idx = np.arange(0, len(track) - 1, max(1, interval))
+    dlon = track.lon[idx + 1] - track.lon[idx]
+    dlat = track.lat[idx + 1] - track.lat[idx]
+    
+    # Skip if points are too close
+    moving = (np.abs(dlon) >= 1e-6) | (np.abs(dlat) >= 1e-6)
+    if not moving.any():
+        return None
+    idx, dlon, dlat = idx[moving], dlon[moving], dlat[moving]
+    
+    # Normalize direction
+    magnitude = np.hypot(dlon, dlat)
+    return ax.quiver(
+        track.lon[idx], track.lat[idx],
+        dlon / magnitude * arrow_size, dlat / magnitude * arrow_size,
+        angles='xy', scale_units='xy', scale=1,
+        color=color, alpha=alpha, zorder=4,
+        width=0.0022, headwidth=4.5, headlength=5, headaxislength=4.5
+    )
+
+
+def _save_figure(plt, fig, output_path: Optional[Path] = None) -> io.BytesIO:
+    """Render a finished figure to an in-memory PNG, optionally also writing it to disk."""
+    buffer = io.BytesIO()
+    plt.savefig(buffer, format='png', dpi=100, bbox_inches='tight', facecolor='white')
+    plt.close(fig)
+    if output_path:
+        Path(output_path).write_bytes(buffer.getvalue())
+        logger.info(f"Map image saved: {output_path}")
+    buffer.seek(0)
+    return buffer
+
+
+def _map_image(map_image: MapImage, width: float, height: float) -> Optional[Image]:
+    """
+    A reportlab flowable for PNG bytes, a buffer or a file path (vector drawings
+    are used as they are); None when there is no image.
+    """
+    if map_image is None:
+        return None
+    if isinstance(map_image, Flowable):
+        return map_image
+    if isinstance(map_image, (bytes, bytearray)):
+        source = io.BytesIO(map_image)
+    elif isinstance(map_image, io.IOBase):
+        map_image.seek(0)
+        source = map_image
+    elif Path(map_image).exists():
+        source = str(map_image)
+    else:
+        return None
+    return Image(source, width=width, height=height)
 
 
 def generate_full_route_map(
-    track_points: List[Dict],
+    track_points: Union[TrackArray, List[Dict]],
     start_gate: Dict,
     checkpoints: List[Dict],
-    output_path: Path,
+    output_path: Optional[Path] = None,
     figure_size: Tuple[float, float] = (10, 8)
-):
+) -> io.BytesIO:
     """
     Generate a comprehensive route map showing:
     - Planned route (start gate → checkpoints as straight lines)
@@ -212,61 +239,92 @@ def generate_full_route_map(
     - All checkpoints marked
     
     Args:
-        track_points: List of actual GPS track points
+        track_points: Actual GPS track (TrackArray or list of point dicts)
         start_gate: Start gate location (lat, lon)
         checkpoints: List of checkpoints in order
-        output_path: Path to save the map image
+        output_path: Optional path to also save the PNG (debugging)
         figure_size: Figure dimensions in inches
+
+    Returns:
+        In-memory PNG, positioned at the start
     """
     # Import matplotlib only when needed
     import matplotlib
     matplotlib.use('Agg')
     import matplotlib.pyplot as plt
-    import matplotlib.patches as patches
-    from matplotlib.patches import Circle, FancyArrowPatch
-    import numpy as np
     
+    track = as_track_array(track_points)
     fig, ax = plt.subplots(figsize=figure_size, dpi=100)
     
-    # Get bounding box for all points
-    all_points = [start_gate] + checkpoints + track_points
-    min_lat, min_lon, max_lat, max_lon = get_bounding_box(all_points, padding_nm=1.5)
+    # Get bounding box for all points (the track only contributes its corners)
+    all_points = [start_gate] + checkpoints + track.bounding_corners()
+    extent = get_bounding_box(all_points, padding_nm=1.5)
+    
+    # Half a pixel is the finest detail the track line can show
+    tolerance_nm = pixel_size_nm(extent, (figure_size[0] * 100, figure_size[1] * 100)) / 2
+    draw_route_track(ax, track, checkpoints, tolerance_nm)
+    draw_route_static(ax, start_gate, checkpoints)
+    format_route_axes(ax, extent)
     
-    # Plot actual track
-    if track_points:
-        track_lats = [p['lat'] for p in track_points]
-        track_lons = [p['lon'] for p in track_points]
-        ax.plot(track_lons, track_lats, color=COLOR_ACTUAL_TRACK, linewidth=1.5, 
+    plt.tight_layout()
+    return _save_figure(plt, fig, output_path)
+
+
+def draw_route_track(ax, track: TrackArray, checkpoints: Optional[List[Dict]] = None,
+                     tolerance_nm: Optional[float] = None):
+    """
+    Route map layer that changes per flight: the actual track and its direction arrows.
+    With tolerance_nm the track line is simplified to it first, keeping the
+    points nearest each of the checkpoints.
+    """
+    if len(track):
+        line = track
+        if tolerance_nm:
+            line = simplify_track(track, tolerance_nm, checkpoints)
+        ax.plot(line.lon, line.lat, color=COLOR_ACTUAL_TRACK, linewidth=1.5, 
                 alpha=0.7, label='Actual Track', zorder=2)
         
         # Add direction-of-travel arrows along the track
         # Sample every ~15 seconds of data (roughly every 15-20 points at 1Hz)
-        arrow_interval = max(1, len(track_points) // 20)  # ~20 arrows across route
-        add_direction_arrows(ax, track_points, interval=arrow_interval, 
+        arrow_interval = max(1, len(track) // 20)  # ~20 arrows across route
+        add_direction_arrows(ax, track, interval=arrow_interval, 
                            color=COLOR_ACTUAL_TRACK, alpha=0.8, arrow_size=0.015)
-    
+
+
+def draw_route_static(ax, start_gate: Dict, checkpoints: List[Dict]) -> Tuple[list, list]:
+    """
+    Route map layers shared by every flight on a NAV.
+    Returns (artists drawn below the track, artists drawn above it).
+    """
     # Plot planned route (straight lines between waypoints)
     route_lats = [start_gate['lat']] + [cp['lat'] for cp in checkpoints]
     route_lons = [start_gate['lon']] + [cp['lon'] for cp in checkpoints]
-    ax.plot(route_lons, route_lats, color=COLOR_PLANNED_ROUTE, linewidth=2, 
-            linestyle='--', alpha=0.8, label='Planned Route', zorder=1)
+    below = ax.plot(route_lons, route_lats, color=COLOR_PLANNED_ROUTE, linewidth=2, 
+                    linestyle='--', alpha=0.8, label='Planned Route', zorder=1)
     
+    above = []
     # Plot start gate
-    ax.scatter(start_gate['lon'], start_gate['lat'], c=COLOR_START_GATE, s=200, 
-              marker='s', label='Start Gate', zorder=5, edgecolors='black', linewidth=1.5)
-    ax.text(start_gate['lon'], start_gate['lat'] - 0.005, 'START', 
-           fontsize=8, ha='center', fontweight='bold')
+    above.append(ax.scatter(start_gate['lon'], start_gate['lat'], c=COLOR_START_GATE, s=200, 
+                            marker='s', label='Start Gate', zorder=5, edgecolors='black', linewidth=1.5))
+    above.append(ax.text(start_gate['lon'], start_gate['lat'] - 0.005, 'START', 
+                         fontsize=8, ha='center', fontweight='bold'))
     
     # Plot checkpoints
     cp_lons = [cp['lon'] for cp in checkpoints]
     cp_lats = [cp['lat'] for cp in checkpoints]
-    ax.scatter(cp_lons, cp_lats, c=COLOR_CHECKPOINT, s=150, marker='o', 
-              label='Checkpoints', zorder=5, edgecolors='black', linewidth=1.5)
+    above.append(ax.scatter(cp_lons, cp_lats, c=COLOR_CHECKPOINT, s=150, marker='o', 
+                            label='Checkpoints', zorder=5, edgecolors='black', linewidth=1.5))
     
     # Label checkpoints
     for i, cp in enumerate(checkpoints, 1):
-        ax.text(cp['lon'], cp['lat'] + 0.005, f"CP {i}", 
-               fontsize=8, ha='center', fontweight='bold')
+        above.append(ax.text(cp['lon'], cp['lat'] + 0.005, f"CP {i}", 
+                             fontsize=8, ha='center', fontweight='bold'))
+    return below, above
+
+
+def format_route_axes(ax, extent: Tuple[float, float, float, float]):
+    """Route map extent (min_lat, min_lon, max_lat, max_lon), labels, grid and legend."""
+    min_lat, min_lon, max_lat, max_lon = extent
     
     # Set map extent
     ax.set_xlim(min_lon, max_lon)
@@ -277,25 +335,21 @@ def generate_full_route_map(
     ax.set_ylabel('Latitude', fontsize=10, fontweight='bold')
     ax.set_title('Complete Flight Route - Planned vs Actual', fontsize=12, fontweight='bold', pad=15)
     ax.grid(True, alpha=0.3, linestyle=':')
-    ax.legend(loc='upper left', fontsize=9, framealpha=0.95)
+    legend = ax.legend(loc='upper left', fontsize=9, framealpha=0.95)
     ax.set_aspect('equal', adjustable='box')
-    
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=100, bbox_inches='tight', facecolor='white')
-    plt.close(fig)
-    logger.info(f"Full route map saved: {output_path}")
+    return legend
 
 
 def generate_checkpoint_detail_map(
-    track_points: List[Dict],
+    track_points: Union[TrackArray, List[Dict]],
     checkpoint: Dict,
     checkpoint_index: int,
-    output_path: Path,
+    output_path: Optional[Path] = None,
     radius_nm: float = CHECKPOINT_RADIUS_NM,
     figure_size: Tuple[float, float] = (8, 8),
     start_gate: Optional[Dict] = None,
     previous_checkpoint: Optional[Dict] = None
-):
+) -> io.BytesIO:
     """
     Generate a detailed map for a single checkpoint showing:
     - Actual GPS track as it approaches and crosses
@@ -305,23 +359,25 @@ def generate_checkpoint_detail_map(
     - Perpendicular line ("the plane") from actual track to intended course
     
     Args:
-        track_points: List of all GPS track points
+        track_points: Full GPS track (TrackArray or list of point dicts)
         checkpoint: Checkpoint data (lat, lon, name)
         checkpoint_index: Checkpoint number (1-indexed)
-        output_path: Path to save the map
+        output_path: Optional path to also save the PNG (debugging)
         radius_nm: Checkpoint radius in nautical miles
         figure_size: Figure dimensions
         start_gate: Start gate location (used if checkpoint_index == 1)
         previous_checkpoint: Previous checkpoint (used if checkpoint_index > 1)
+
+    Returns:
+        In-memory PNG, positioned at the start
     """
     # Import matplotlib only when needed
     import matplotlib
     matplotlib.use('Agg')
     import matplotlib.pyplot as plt
-    import matplotlib.patches as patches
-    from matplotlib.patches import Circle, FancyArrowPatch
-    import numpy as np
+    from matplotlib.patches import Circle
     
+    track = as_track_array(track_points)
     fig, ax = plt.subplots(figsize=figure_size, dpi=100)
     
     # Calculate search area (2x radius for visibility)
@@ -334,15 +390,15 @@ def generate_checkpoint_detail_map(
     max_lon = checkpoint['lon'] + padding_degrees
     
     # Filter track points near checkpoint
-    nearby_points = [
-        p for p in track_points
-        if min_lat <= p['lat'] <= max_lat and min_lon <= p['lon'] <= max_lon
-    ]
+    nearby = (
+        (track.lat >= min_lat) & (track.lat <= max_lat)
+        & (track.lon >= min_lon) & (track.lon <= max_lon)
+    )
     
     # Plot track near checkpoint
-    if nearby_points:
-        track_lats = [p['lat'] for p in nearby_points]
-        track_lons = [p['lon'] for p in nearby_points]
+    if nearby.any():
+        track_lats = track.lat[nearby]
+        track_lons = track.lon[nearby]
         ax.plot(track_lons, track_lats, color=COLOR_ACTUAL_TRACK, linewidth=2,
                alpha=0.8, label='GPS Track', zorder=3)
         # Plot track points as dots
@@ -358,16 +414,9 @@ def generate_checkpoint_detail_map(
     
     # Find closest point of approach
     closest_point = None
-    closest_distance_nm = float('inf')
-    if track_points:
-        for p in track_points:
-            # Calculate distance in NM
-            lat_diff_nm = (p['lat'] - checkpoint['lat']) * 60
-            lon_diff_nm = (p['lon'] - checkpoint['lon']) * 60 * np.cos(np.radians(checkpoint['lat']))
-            distance_nm = np.sqrt(lat_diff_nm**2 + lon_diff_nm**2)
-            if distance_nm < closest_distance_nm:
-                closest_distance_nm = distance_nm
-                closest_point = p
+    closest_index, closest_distance_nm = track.spatial_index().nearest(checkpoint)
+    if closest_index is not None:
+        closest_point = track.point(closest_index)
     
     # Plot checkpoint
     ax.scatter(checkpoint['lon'], checkpoint['lat'], c=COLOR_CHECKPOINT, s=300,
@@ -491,9 +540,7 @@ def generate_checkpoint_detail_map(
            bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
     
     plt.tight_layout()
-    plt.savefig(output_path, dpi=100, bbox_inches='tight', facecolor='white')
-    plt.close(fig)
-    logger.info(f"Checkpoint detail map saved: {output_path}")
+    return _save_figure(plt, fig, output_path)
 
 
 def generate_enhanced_pdf_report(
@@ -502,9 +549,9 @@ def generate_enhanced_pdf_report(
     pairing_data: Dict,
     start_gate: Dict,
     checkpoints: List[Dict],
-    track_points: List[Dict],
-    full_route_map_path: Path,
-    checkpoint_maps_paths: List[Path],
+    track_points: Union[TrackArray, List[Dict]],
+    full_route_map: MapImage,
+    checkpoint_maps: List[MapImage],
     output_path: Path
 ):
     """
@@ -517,8 +564,8 @@ def generate_enhanced_pdf_report(
         start_gate: Start gate location
         checkpoints: List of checkpoints
         track_points: GPS track points
-        full_route_map_path: Path to full route map image
-        checkpoint_maps_paths: List of paths to checkpoint detail maps
+        full_route_map: Full route map (PNG bytes, buffer or path)
+        checkpoint_maps: Checkpoint detail maps in route order (PNG bytes, buffers or paths)
         output_path: Output PDF path
     """
     
@@ -754,26 +801,24 @@ def generate_enhanced_pdf_report(
     story.append(Spacer(1, 0.15*inch))
     
     # Add full route map if it exists
-    if full_route_map_path and Path(full_route_map_path).exists():
-        try:
-            # Set explicit dimensions maintaining 10:8 aspect ratio (6 inches wide x 4.8 inches tall)
-            # This prevents stretching and fits properly on landscape pages
-            img = Image(str(full_route_map_path), width=6.5*inch, height=5.2*inch)
+    try:
+        # Set explicit dimensions maintaining 10:8 aspect ratio (6 inches wide x 4.8 inches tall)
+        # This prevents stretching and fits properly on landscape pages
+        img = _map_image(full_route_map, width=6.5*inch, height=5.2*inch)
+        if img is not None:
             story.append(img)
-        except Exception as e:
-            logger.error(f"Failed to add full route map: {e}")
-            story.append(Paragraph(f"[Map unavailable: {str(e)}]", styles['Normal']))
-    else:
-        story.append(Paragraph("[Route map not available]", styles['Normal']))
+        else:
+            story.append(Paragraph("[Route map not available]", styles['Normal']))
+    except Exception as e:
+        logger.error(f"Failed to add full route map: {e}")
+        story.append(Paragraph(f"[Map unavailable: {str(e)}]", styles['Normal']))
     
     # ===== CHECKPOINT DETAIL MAPS =====
     
     # Add checkpoint detail maps if available
-    checkpoint_maps = [Path(p) for p in checkpoint_maps_paths] if checkpoint_maps_paths else []
-    
     if checkpoint_maps:
-        for i, cp_map_path in enumerate(checkpoint_maps):
-            if cp_map_path.exists():
+        for i, cp_map in enumerate(checkpoint_maps):
+            if cp_map is not None and (not isinstance(cp_map, (str, Path)) or Path(cp_map).exists()):
                 # Add page break before each checkpoint map
                 story.append(PageBreak())
                 
@@ -784,7 +829,7 @@ def generate_enhanced_pdf_report(
                 
                 # Add checkpoint detail map - sized to fit landscape page
                 try:
-                    img = Image(str(cp_map_path), width=6.5*inch, height=6.5*inch)
+                    img = _map_image(cp_map, width=6.5*inch, height=6.5*inch)
                     story.append(img)
                     story.append(Spacer(1, 0.1*inch))
                 except Exception as e:
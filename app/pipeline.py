@@ -0,0 +1,353 @@
+"""
+Flight scoring pipeline stages.
+Each stage is a plain function of its arguments with no database, request or
+email access, so the scoring job handler can run it off the event loop.
+"""
+
+import io
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.basemap import BasemapCache, composite_route_map
+from app.gpx_parser import parse_gpx
+from app.pdf_generator import (
+    generate_full_route_map,
+    generate_checkpoint_detail_map,
+    generate_enhanced_pdf_report,
+)
+from app.scoring_engine import NavScoringEngine
+from app.scoring_jobs import ScoringJobError
+from app.track import TrackArray
+from app.track_cache import TrackCache
+from app.vector_maps import map_drawings
+
+logger = logging.getLogger(__name__)
+
+# pyplot keeps global figure state, so renders in one process run one at a time
+_render_lock = threading.Lock()
+_basemap_cache: Optional[BasemapCache] = None
+_track_cache: Optional[TrackCache] = None
+
+
+def load_track(storage_config: Dict, gpx_content: bytes) -> TrackArray:
+    """Parse an uploaded GPX file (through the parsed-track cache)."""
+    try:
+        track_points = _get_track_cache(storage_config).load(gpx_content, parse_gpx)
+    except ValueError as e:
+        # parse_gpx already says what failed
+        raise ScoringJobError(str(e))
+    except Exception as e:
+        raise ScoringJobError(f"Failed to parse GPX file: {str(e)}")
+    if not len(track_points):
+        raise ScoringJobError("No track points found in GPX file")
+    return track_points
+
+
+def _get_track_cache(storage_config: Dict) -> TrackCache:
+    """This process's parsed-track cache."""
+    global _track_cache
+    if _track_cache is None:
+        _track_cache = TrackCache(storage_config)
+    return _track_cache
+
+
+def score_checkpoints(
+    config: Dict,
+    track_points: TrackArray,
+    start_gate: Dict,
+    checkpoints: List[Dict],
+    leg_times: List[float],
+) -> List[Dict]:
+    """Detect the start gate crossing and score every checkpoint leg."""
+    scoring_engine = NavScoringEngine(config)
+
+    try:
+        start_crossing, start_distance = scoring_engine.detect_start_gate_crossing(
+            track_points, start_gate
+        )
+    except Exception as e:
+        raise ScoringJobError(f"Error detecting start gate: {str(e)}")
+    if not start_crossing:
+        raise ScoringJobError("Could not detect start gate crossing. Please check your GPX file and try again.")
+
+    checkpoint_results = []
+    try:
+        previous_time = start_crossing["time"]
+        checkpoint_sweep = scoring_engine.score_checkpoints(
+            track_points, start_crossing, checkpoints
+        )
+
+        for i, (checkpoint, crossing) in enumerate(zip(checkpoints, checkpoint_sweep)):
+            timing_point, distance_nm, method, within_025 = crossing
+
+            if not timing_point:
+                logger.error(f"Could not find crossing for checkpoint {checkpoint['name']}")
+                continue
+
+            # Calculate leg score
+            estimated_time = leg_times[i]
+            logger.debug(f"Checkpoint {i} ({checkpoint['name']}): estimated_time={estimated_time}s, distance={distance_nm}nm, method={method}")
+            actual_time = (timing_point["time"] - previous_time).total_seconds()
+
+            leg_score, off_course_penalty = scoring_engine.calculate_leg_score(
+                actual_time, estimated_time, distance_nm, within_025
+            )
+
+            checkpoint_results.append({
+                "name": checkpoint["name"],
+                # Legs without a crossing are skipped, so position does not identify the checkpoint
+                "sequence": checkpoint["sequence"],
+                "distance_nm": distance_nm,
+                "within_0_25_nm": within_025,
+                "method": method,
+                "estimated_time": estimated_time,
+                "actual_time": actual_time,
+                "deviation": actual_time - estimated_time,
+                "leg_score": leg_score,
+                "off_course_penalty": off_course_penalty
+            })
+
+            previous_time = timing_point["time"]
+    except Exception as e:
+        raise ScoringJobError(f"Error scoring checkpoints: {str(e)}")
+    return checkpoint_results
+
+
+def compute_totals(
+    config: Dict,
+    prenav: Dict,
+    checkpoint_results: List[Dict],
+    actual_fuel: float,
+    secrets_checkpoint: int,
+    secrets_enroute: int,
+) -> Dict:
+    """Combine leg results, total time, fuel and secrets into the result totals."""
+    scoring_engine = NavScoringEngine(config)
+
+    # Sum of individual leg penalties
+    leg_penalties = sum(cp["leg_score"] for cp in checkpoint_results)
+
+    # Calculate actual total time from checkpoint crossings
+    actual_total_time = sum(cp["actual_time"] for cp in checkpoint_results)
+
+    # Get estimated total time from prenav (user input, may have math errors)
+    estimated_total_time = prenav["total_time"]
+
+    # Calculate total time penalty (separate component)
+    # Sign convention: negative = faster than estimated (actual < estimated)
+    total_time_deviation = actual_total_time - estimated_total_time
+    total_time_penalty = abs(total_time_deviation) * config["scoring"].get("timing_penalty_per_second", 1.0)
+
+    # Total timing score = leg penalties + total time penalty (both are timing components)
+    total_time_score = leg_penalties + total_time_penalty
+
+    # Calculate total off-course penalty
+    total_off_course = sum(cp["off_course_penalty"] for cp in checkpoint_results)
+
+    logger.info(f"Timing breakdown: leg_penalties={leg_penalties:.1f}, total_time_penalty={total_time_penalty:.1f}, total={total_time_score:.1f}")
+
+    fuel_penalty = scoring_engine.calculate_fuel_penalty(
+        prenav["fuel_estimate"], actual_fuel
+    )
+
+    # Calculate fuel error percentage
+    fuel_error_pct = 0
+    if prenav["fuel_estimate"] > 0:
+        fuel_error_pct = ((actual_fuel - prenav["fuel_estimate"]) / prenav["fuel_estimate"]) * 100
+
+    checkpoint_secrets_penalty, enroute_secrets_penalty = scoring_engine.calculate_secrets_penalty(
+        secrets_checkpoint, secrets_enroute
+    )
+
+    checkpoint_scores = [(cp["leg_score"], cp["off_course_penalty"]) for cp in checkpoint_results]
+
+    # Pass ONLY the total_time_penalty (not leg_penalties + total_time_penalty)
+    # checkpoint_scores already contains the leg_score from each checkpoint
+    overall_score = scoring_engine.calculate_overall_score(
+        checkpoint_scores,
+        total_time_penalty,
+        fuel_penalty,
+        checkpoint_secrets_penalty,
+        enroute_secrets_penalty
+    )
+
+    return {
+        "overall_score": overall_score,
+        "total_time_score": total_time_score,
+        "leg_penalties": leg_penalties,
+        "total_time_penalty": total_time_penalty,
+        "total_time_deviation": total_time_deviation,
+        "estimated_total_time": estimated_total_time,
+        "actual_total_time": actual_total_time,
+        "total_off_course": total_off_course,
+        "fuel_penalty": fuel_penalty,
+        "fuel_error_pct": fuel_error_pct,
+        "estimated_fuel_burn": prenav["fuel_estimate"],
+        "actual_fuel_burn": actual_fuel,
+        "checkpoint_secrets_penalty": checkpoint_secrets_penalty,
+        "enroute_secrets_penalty": enroute_secrets_penalty,
+        "secrets_missed_checkpoint": secrets_checkpoint,
+        "secrets_missed_enroute": secrets_enroute,
+        "checkpoint_results": checkpoint_results,
+    }
+
+
+def result_penalties(config: Dict, result: Dict) -> Dict:
+    """
+    Penalty components of a stored flight result, computed from its columns as
+    compute_totals did (for results scored before the components were stored).
+    """
+    scoring_engine = NavScoringEngine(config)
+    checkpoint_secrets_penalty, enroute_secrets_penalty = scoring_engine.calculate_secrets_penalty(
+        result["secrets_missed_checkpoint"], result["secrets_missed_enroute"]
+    )
+    total_time_score = result.get("total_time_score")
+    if total_time_score is None:
+        total_time_score = (result.get("leg_penalties") or 0) + (result.get("total_time_penalty") or 0)
+    return {
+        "fuel_penalty": scoring_engine.calculate_fuel_penalty(
+            result.get("estimated_fuel_burn") or 0, result["actual_fuel"]
+        ),
+        "checkpoint_secrets_penalty": checkpoint_secrets_penalty,
+        "enroute_secrets_penalty": enroute_secrets_penalty,
+        "total_time_score": total_time_score,
+    }
+
+
+def stored_penalties(config: Dict, result: Dict) -> Dict:
+    """Penalty components of a flight result: its stored columns, computed if not yet backfilled."""
+    if result.get("fuel_penalty") is None:
+        return result_penalties(config, result)
+    return {
+        "fuel_penalty": result["fuel_penalty"],
+        "checkpoint_secrets_penalty": result["checkpoint_secrets_penalty"],
+        "enroute_secrets_penalty": result["enroute_secrets_penalty"],
+        "total_time_score": result["total_time_score"],
+    }
+
+
+def report_data(config: Dict, result: Dict, prenav: Dict) -> Dict:
+    """
+    Rebuild the report totals for a stored flight result (the same keys that
+    compute_totals returned when the flight was scored).
+    """
+    estimated_fuel = result.get("estimated_fuel_burn") or prenav.get("fuel_estimate", 0)
+    penalties = stored_penalties(config, {**result, "estimated_fuel_burn": estimated_fuel})
+    leg_penalties = result.get("leg_penalties") or 0
+    total_time_penalty = result.get("total_time_penalty") or 0
+
+    return {
+        "overall_score": result["overall_score"],
+        "total_time_score": penalties["total_time_score"],
+        "leg_penalties": leg_penalties,
+        "total_time_penalty": total_time_penalty,
+        "total_time_deviation": result.get("total_time_deviation") or 0,
+        "estimated_total_time": result.get("estimated_total_time") or prenav.get("total_time", 0),
+        "actual_total_time": result.get("actual_total_time") or 0,
+        "total_off_course": result.get("total_off_course") or 0,
+        "fuel_penalty": penalties["fuel_penalty"],
+        "fuel_error_pct": result.get("fuel_error_pct") or 0,
+        "estimated_fuel_burn": estimated_fuel,
+        "actual_fuel_burn": result["actual_fuel"],
+        "checkpoint_secrets_penalty": penalties["checkpoint_secrets_penalty"],
+        "enroute_secrets_penalty": penalties["enroute_secrets_penalty"],
+        "secrets_missed_checkpoint": result["secrets_missed_checkpoint"],
+        "secrets_missed_enroute": result["secrets_missed_enroute"],
+        "checkpoint_results": result["checkpoint_results"],
+        "scored_at": result["scored_at"],
+        "flight_started_at": prenav.get("submitted_at") or result["scored_at"],
+    }
+
+
+def render_route_map(
+    track_points: TrackArray,
+    start_gate: Dict,
+    checkpoints: List[Dict],
+    debug_path: Optional[Path] = None,
+    nav_id: Optional[int] = None,
+    storage_config: Optional[Dict] = None,
+) -> Tuple[bytes, float]:
+    """
+    Render the full route map. Returns the PNG bytes and the render time in seconds.
+    The PNG is also written to debug_path when one is given.
+
+    With a nav_id and storage_config, the NAV's cached basemap supplies the
+    static layers and only the track is drawn, unless the track leaves the
+    basemap's extent.
+    """
+    started = time.perf_counter()
+    with _render_lock:
+        basemap = None
+        if nav_id is not None and storage_config is not None:
+            basemap = _get_basemap_cache(storage_config).get(nav_id, start_gate, checkpoints)
+        if basemap is not None and basemap.contains(track_points):
+            import matplotlib.image as matplotlib_image
+            buffer = io.BytesIO()
+            matplotlib_image.imsave(buffer, composite_route_map(basemap, track_points, checkpoints), format='png')
+            png = buffer.getvalue()
+            if debug_path:
+                Path(debug_path).write_bytes(png)
+        else:
+            png = generate_full_route_map(track_points, start_gate, checkpoints, debug_path).getvalue()
+    return png, time.perf_counter() - started
+
+
+def _get_basemap_cache(storage_config: Dict) -> BasemapCache:
+    """This process's basemap cache (keeps recently used basemaps in memory between jobs)."""
+    global _basemap_cache
+    if _basemap_cache is None:
+        _basemap_cache = BasemapCache(storage_config)
+    return _basemap_cache
+
+
+def render_checkpoint_map(
+    track_points: TrackArray,
+    start_gate: Dict,
+    checkpoints: List[Dict],
+    index: int,
+    debug_path: Optional[Path] = None,
+) -> Tuple[bytes, float]:
+    """
+    Render the detail map of checkpoints[index]. Returns the PNG bytes and the
+    render time in seconds. The PNG is also written to debug_path when one is given.
+    """
+    started = time.perf_counter()
+    # Determine previous checkpoint or start gate
+    prev_checkpoint = checkpoints[index-1] if index > 0 else None
+    with _render_lock:
+        png = generate_checkpoint_detail_map(
+            track_points, checkpoints[index], index+1, debug_path,
+            start_gate=start_gate,
+            previous_checkpoint=prev_checkpoint
+        )
+    return png.getvalue(), time.perf_counter() - started
+
+
+def build_pdf(
+    result_data: Dict,
+    nav: Dict,
+    pairing_display: Dict,
+    start_gate: Dict,
+    checkpoints: List[Dict],
+    track_points: TrackArray,
+    route_map: Optional[bytes],
+    checkpoint_maps: Optional[List[bytes]],
+    pdf_path: Path,
+    map_backend: str = "raster",
+) -> Path:
+    """
+    Build the enhanced PDF report. With the "raster" map backend the maps are
+    the rendered PNGs; with "vector" they are drawn into the PDF here instead.
+    """
+    if map_backend == "vector":
+        route_map, checkpoint_maps = map_drawings(track_points, start_gate, checkpoints)
+    generate_enhanced_pdf_report(
+        result_data, nav, pairing_display,
+        start_gate, checkpoints, track_points,
+        route_map, checkpoint_maps,
+        pdf_path
+    )
+    return pdf_path
@@ -0,0 +1,99 @@
+"""
+PDF report cache for NAV Scoring System.
+Result PDFs are built on first download rather than at submission. Each built
+report is stored under a key covering the result row, the route it was flown
+on and the report generator code, so a changed result or a new report layout
+produces a fresh PDF automatically.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.disk_cache import DiskCache
+from app.scoring_cache import code_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump when the report key material changes
+REPORT_CACHE_FORMAT = 1
+
+# Modules whose code shapes the PDF report
+REPORT_MODULES = (
+    "pdf_generator.py", "basemap.py", "vector_maps.py", "simplify.py", "pipeline.py",
+    "scoring_engine.py", "geodesy.py", "spatial.py", "track.py",
+)
+
+
+class ReportCache(DiskCache):
+    """Disk cache of result PDFs with least-recently-used eviction by total size."""
+
+    name = "report_cache"
+    pattern = "result_*.pdf"
+    label = "report cache"
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize report cache.
+
+        Args:
+            config: Storage configuration dict (pdf_reports, report_cache,
+                report_cache_max_mb with a 512 MB default; see DiskCache)
+        """
+        super().__init__(config)
+        self.fingerprint = code_fingerprint(REPORT_MODULES)
+        logger.info(f"ReportCache initialized: {self.cache_path}")
+
+    def make_key(self, result: Dict, report_inputs: Dict) -> str:
+        """
+        Cache key for a result's report.
+
+        Args:
+            result: The flight_results row
+            report_inputs: Everything else printed in the report (route, start
+                gate, pairing names, map backend, ...)
+        """
+        material = {
+            "format": REPORT_CACHE_FORMAT,
+            "code": self.fingerprint,
+            "result": result,
+            "inputs": report_inputs,
+        }
+        encoded = json.dumps(material, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def path_for(self, result_id: int, key: str) -> Path:
+        return self.cache_path / f"result_{result_id}_{key[:32]}.pdf"
+
+    def get(self, result_id: int, key: str) -> Optional[Path]:
+        """Path of the cached report, or None on a miss."""
+        path = self.path_for(result_id, key)
+        return path if self.touch(path) else None
+
+    def reserve_report(self, result_id: int) -> Path:
+        """Temporary path to build a report into before handing it to put()."""
+        return self.reserve(f"result_{result_id}", ".pdf")
+
+    def put(self, result_id: int, key: str, built_path: Path) -> Path:
+        """
+        Move a freshly built report into the cache, replacing older reports of
+        the same result. Returns its cached path.
+        """
+        path = self.path_for(result_id, key)
+        os.replace(built_path, path)
+        self.discard(result_id, keep=path)
+        self.evict()
+        return path
+
+    def discard(self, result_id: int, keep: Optional[Path] = None) -> int:
+        """Remove cached reports of a result (except keep). Returns count removed."""
+        removed = 0
+        for path in self.cache_path.glob(f"result_{result_id}_*.pdf"):
+            if keep is not None and path == keep:
+                continue
+            if self.remove(path):
+                removed += 1
+        return removed
@@ -0,0 +1,159 @@
+"""
+Scoring result cache for NAV Scoring System.
+Remembers the checkpoint results and rendered maps of a scoring run so an
+identical resubmission (same GPX, route, start gate, scoring rules and leg
+times) reuses them instead of rerunning the pipeline.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from app.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached entry layout changes
+SCORING_CACHE_FORMAT = 1
+RESULTS_FILENAME = "checkpoint_results.json"
+
+# Modules whose code decides checkpoint results and map rendering; an entry
+# written by different code is never reused
+FINGERPRINT_MODULES = ("scoring_engine.py", "geodesy.py", "spatial.py", "track.py", "gpx_parser.py", "pipeline.py", "pdf_generator.py", "basemap.py", "simplify.py")
+
+
+def code_fingerprint(modules=FINGERPRINT_MODULES) -> str:
+    """Hash of the source of the modules that produce cached results."""
+    digest = hashlib.sha256()
+    package_dir = Path(__file__).parent
+    for name in modules:
+        digest.update(name.encode())
+        try:
+            digest.update((package_dir / name).read_bytes())
+        except OSError:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+
+def checkpoint_fingerprint(checkpoints: List[Dict]) -> List:
+    """The parts of a NAV's checkpoints that affect scoring and maps, in route order."""
+    return [
+        [cp.get("id"), cp.get("sequence"), cp.get("name"), cp["lat"], cp["lon"]]
+        for cp in checkpoints
+    ]
+
+
+class ScoringCacheEntry:
+    """A cached scoring run: checkpoint results plus rendered artifact files."""
+
+    def __init__(self, path: Path, checkpoint_results: List[Dict]):
+        self.path = path
+        self.checkpoint_results = checkpoint_results
+
+    def artifact_path(self, name: str) -> Optional[Path]:
+        """Path of a cached artifact, or None if it was not stored."""
+        path = self.path / name
+        return path if path.exists() else None
+
+    def artifact_bytes(self, name: str) -> Optional[bytes]:
+        """Contents of a cached artifact, or None if it was not stored."""
+        try:
+            return (self.path / name).read_bytes()
+        except OSError:
+            return None
+
+
+class ScoringCache(DiskCache):
+    """Disk cache of scoring runs (one directory each) with least-recently-used eviction by total size."""
+
+    name = "scoring_cache"
+    label = "scoring cache"
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize scoring cache.
+
+        Args:
+            config: Storage configuration dict (pdf_reports, scoring_cache,
+                scoring_cache_max_mb with a 512 MB default; see DiskCache)
+        """
+        super().__init__(config)
+        self.fingerprint = code_fingerprint()
+        logger.info(f"ScoringCache initialized: {self.cache_path}")
+
+    def make_key(
+        self,
+        gpx_hash: str,
+        checkpoints: List[Dict],
+        start_gate: Dict,
+        scoring_config: Dict,
+        leg_times: List[float],
+    ) -> str:
+        """Cache key for one scoring run."""
+        material = {
+            "format": SCORING_CACHE_FORMAT,
+            "code": self.fingerprint,
+            "gpx": gpx_hash,
+            "checkpoints": checkpoint_fingerprint(checkpoints),
+            "start_gate": [start_gate.get("id"), start_gate["lat"], start_gate["lon"]],
+            "scoring": scoring_config,
+            "leg_times": list(leg_times),
+        }
+        encoded = json.dumps(material, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[ScoringCacheEntry]:
+        """Cached run for a key, or None on a miss."""
+        path = self.cache_path / key
+        try:
+            checkpoint_results = json.loads((path / RESULTS_FILENAME).read_text())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable scoring cache entry {key[:12]}: {e}")
+            self.discard(key)
+            return None
+
+        self.touch(path)
+        return ScoringCacheEntry(path, checkpoint_results)
+
+    def put(
+        self,
+        key: str,
+        checkpoint_results: List[Dict],
+        artifacts: Optional[Dict[str, Union[bytes, Path]]] = None,
+    ):
+        """
+        Store a scoring run. artifacts maps file names to bytes or to files to copy.
+        The entry is assembled in a temp directory and renamed into place.
+        """
+        tmp_dir = None
+        try:
+            tmp_dir = self.reserve_dir(key)
+            for name, artifact in (artifacts or {}).items():
+                if isinstance(artifact, (bytes, bytearray)):
+                    (tmp_dir / name).write_bytes(artifact)
+                else:
+                    shutil.copyfile(artifact, tmp_dir / name)
+            # Results are written last: an entry without them is never read
+            (tmp_dir / RESULTS_FILENAME).write_text(json.dumps(checkpoint_results))
+
+            target = self.cache_path / key
+            self.remove(target)
+            os.replace(tmp_dir, target)
+            tmp_dir = None
+        except Exception as e:
+            logger.error(f"Error writing scoring cache entry {key[:12]}: {e}")
+            return
+        finally:
+            if tmp_dir is not None:
+                self.remove(tmp_dir)
+        self.evict()
+
+    def discard(self, key: str):
+        """Remove a cached run if present."""
+        self.remove(self.cache_path / key)
@@ -6,12 +6,19 @@ Extracted from nav.py; pure functions for scoring flight results.
 import math
 import logging
 from datetime import timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional, Union
+import numpy as np
 from geopy.distance import geodesic
 from geopy.point import Point
 
+from app.geodesy import ELLIPSOIDAL, DISTANCE_MODES, distances_nm
+from app.track import TrackArray, as_track_array, datetime_to_epoch_us
+
 logger = logging.getLogger(__name__)
 
+# First batch size when sweeping forward along a track; later batches double
+SWEEP_BATCH_POINTS = 256
+
 
 class NavScoringEngine:
     """Encapsulates all scoring logic."""
@@ -23,8 +30,12 @@ class NavScoringEngine:
           - off_course: {max_no_penalty_nm, max_penalty_distance_nm, max_penalty_points}
           - fuel_burn: {over_estimate_multiplier, under_estimate_threshold, under_estimate_multiplier}
           - secrets: {checkpoint_penalty, enroute_penalty, max_distance_miles}
+          - distance_mode: "ellipsoidal" (default, WGS-84) or "spherical" (faster haversine)
         """
         self.config = config
+        self.distance_mode = config.get("scoring", {}).get("distance_mode", ELLIPSOIDAL)
+        if self.distance_mode not in DISTANCE_MODES:
+            raise ValueError(f"Invalid scoring.distance_mode: {self.distance_mode!r}")
 
     def haversine_distance(self, coord1: Dict, coord2: Dict) -> float:
         """Distance in nautical miles."""
@@ -33,6 +44,15 @@ class NavScoringEngine:
             (coord2["lat"], coord2["lon"])
         ).nautical
 
+    def distances_from(self, reference: Dict, track: TrackArray, indices=None) -> np.ndarray:
+        """
+        Distances in NM from reference to every track point in a single pass
+        (or only to track[indices] when given). See app.geodesy for modes and error bounds.
+        """
+        if indices is None:
+            return distances_nm(reference, track.lat, track.lon, self.distance_mode)
+        return distances_nm(reference, track.lat[indices], track.lon[indices], self.distance_mode)
+
     def calculate_bearing(self, coord1: Dict, coord2: Dict) -> float:
         """Bearing from coord1 to coord2 in degrees (0-360)."""
         point1 = Point(coord1["lat"], coord1["lon"])
@@ -64,74 +84,73 @@ class NavScoringEngine:
         return {"lat": lat, "lon": lon, "time": interpolated_time}
 
     def detect_start_gate_crossing(
-        self, track_points: List[Dict], start_gate: Dict
+        self, track_points: Union[TrackArray, List[Dict]], start_gate: Dict
     ) -> Tuple[Optional[Dict], Optional[float]]:
         """
         Detect when aircraft crosses start gate.
+        Accepts a TrackArray or a legacy list of point dicts.
         Returns (crossing_point, distance_nm) or (None, None).
+
+        The search widens from 0.02 to 0.10 NM in 0.01 NM steps. At each step,
+        the closest point at takeoff speed wins, falling back to the closest
+        point at any speed. Distances are computed once; the first step that
+        can hold any point is found by binary search over the step ladder.
         """
         TAKEOFF_SPEED_THRESHOLD = 5.0  # m/s (~9.7 knots)
         INITIAL_DISTANCE_THRESHOLD = 0.02
         MAX_DISTANCE_THRESHOLD = 0.10
         DISTANCE_INCREMENT = 0.01
 
+        # Build the ladder by repeated addition so step values match the
+        # accumulated floats the search has always used (0.060000000000000005, ...)
+        thresholds = []
         distance_threshold = INITIAL_DISTANCE_THRESHOLD
-        time_span = (track_points[-1]["time"] - track_points[0]["time"]).total_seconds()
-        time_limit = track_points[0]["time"] + timedelta(seconds=time_span * 0.5)
-
         while distance_threshold <= MAX_DISTANCE_THRESHOLD:
-            candidate_points = []
-            for point in track_points:
-                if point["time"] > time_limit:
-                    continue
-                distance = self.haversine_distance(
-                    {"lat": point["lat"], "lon": point["lon"]}, start_gate
-                )
-                is_takeoff = point["speed"] >= TAKEOFF_SPEED_THRESHOLD
-                if distance <= distance_threshold and is_takeoff:
-                    candidate_points.append((point, distance))
+            thresholds.append(distance_threshold)
+            distance_threshold += DISTANCE_INCREMENT
 
-            if candidate_points:
-                start_gate_closest, start_distance = min(
-                    candidate_points, key=lambda x: x[1]
-                )
-                logger.info(
-                    f"Start gate crossing detected at threshold {distance_threshold:.3f} NM"
-                )
-                return start_gate_closest, start_distance
-
-            # No candidates; try without speed threshold
-            candidate_points = [
-                (point, self.haversine_distance(
-                    {"lat": point["lat"], "lon": point["lon"]}, start_gate))
-                for point in track_points
-                if self.haversine_distance(
-                    {"lat": point["lat"], "lon": point["lon"]}, start_gate
-                ) <= distance_threshold and point["time"] <= time_limit
-            ]
-            if candidate_points:
-                start_gate_closest, start_distance = min(
-                    candidate_points, key=lambda x: x[1]
-                )
+        track = as_track_array(track_points)
+        time_span = (track.datetime_at(-1) - track.datetime_at(0)).total_seconds()
+        time_limit = datetime_to_epoch_us(
+            track.datetime_at(0) + timedelta(seconds=time_span * 0.5)
+        )
+        window = np.flatnonzero(track.time <= time_limit)
+        window_distances = self.distances_from(start_gate, track, window)
+
+        if window.size:
+            closest_any = int(np.argmin(window_distances))
+            step = int(np.searchsorted(thresholds, window_distances[closest_any], side="left"))
+            if step < len(thresholds):
+                distance_threshold = thresholds[step]
+
+                takeoff = np.flatnonzero(track.speed[window] >= TAKEOFF_SPEED_THRESHOLD)
+                if takeoff.size:
+                    closest_takeoff = takeoff[np.argmin(window_distances[takeoff])]
+                    if window_distances[closest_takeoff] <= distance_threshold:
+                        logger.info(
+                            f"Start gate crossing detected at threshold {distance_threshold:.3f} NM"
+                        )
+                        return track.point(window[closest_takeoff]), float(window_distances[closest_takeoff])
+
+                # No candidates at takeoff speed; use closest point regardless of speed
                 logger.info(
                     f"Start gate crossing detected (closest point) at {distance_threshold:.3f} NM"
                 )
-                return start_gate_closest, start_distance
-
-            distance_threshold += DISTANCE_INCREMENT
+                return track.point(window[closest_any]), float(window_distances[closest_any])
 
         logger.error(f"No start gate crossing found within {MAX_DISTANCE_THRESHOLD} NM")
         return None, None
 
     def find_checkpoint_crossing(
         self,
-        track_points: List[Dict],
+        track_points: Union[TrackArray, List[Dict]],
         checkpoint: Dict,
         previous_point: Dict,
         previous_time,
     ) -> Tuple[Optional[Dict], float, str, bool]:
         """
         Find how aircraft approached checkpoint.
+        Accepts a TrackArray or a legacy list of point dicts.
         Returns (timing_point, distance_nm, method, within_025_nm)
         
         Logic:
@@ -143,60 +162,31 @@ class NavScoringEngine:
         off_course_cfg = self.config["scoring"].get("off_course", {})
         CHECKPOINT_RADIUS_NM = off_course_cfg.get("max_no_penalty_nm", 0.25)
 
+        track = as_track_array(track_points)
+
         flight_path_bearing = self.calculate_bearing(previous_point, checkpoint)
-        plane_bearing = (flight_path_bearing + 90) % 360
 
-        # Step 1: Find first time radius is entered (after previous_time)
+        # Step 1: Find first time radius is entered (after previous_time).
+        # The track's grid index measures only points near the checkpoint.
         radius_entry_time = None
         radius_entry_point = None
-        for p in track_points:
-            if p["time"] > previous_time:
-                distance = self.haversine_distance(
-                    {"lat": p["lat"], "lon": p["lon"]}, checkpoint
-                )
-                if distance <= CHECKPOINT_RADIUS_NM:
-                    radius_entry_time = p["time"]
-                    radius_entry_point = p
-                    radius_entry_distance = distance
-                    break
+        index = track.spatial_index()
+        after_us = datetime_to_epoch_us(previous_time)
+        inside, inside_distances = index.within(
+            checkpoint, CHECKPOINT_RADIUS_NM, self.distance_mode, after_us
+        )
+        if inside.size:
+            radius_entry_point = track.point(inside[0])
+            radius_entry_time = radius_entry_point["time"]
+            radius_entry_distance = float(inside_distances[0])
 
         # Step 2: Find first time plane is crossed (after previous_time)
         plane_crossing_time = None
         plane_crossing_point = None
-        for j in range(len(track_points) - 1):
-            p1 = track_points[j]
-            p2 = track_points[j + 1]
-            
-            if p1["time"] <= previous_time:
-                continue
-            
-            side1 = self.side_of_plane(p1, checkpoint, plane_bearing)
-            side2 = self.side_of_plane(p2, checkpoint, plane_bearing)
-
-            if side1 != side2:
-                # Plane crossed - calculate exact crossing point and time
-                bearing1 = self.calculate_bearing(checkpoint, p1)
-                bearing2 = self.calculate_bearing(checkpoint, p2)
-                angle_diff1 = (bearing1 - plane_bearing + 360) % 360
-                angle_diff2 = (bearing2 - plane_bearing + 360) % 360
-
-                if angle_diff1 > 180:
-                    angle_diff1 -= 360
-                if angle_diff2 > 180:
-                    angle_diff2 -= 360
-
-                if abs(angle_diff1 - angle_diff2) < 1e-10:
-                    fraction = 0.5
-                else:
-                    fraction = abs(angle_diff1) / abs(angle_diff1 - angle_diff2)
-
-                temp_crossing_point = self.interpolate_point(p1, p2, fraction)
-                plane_crossing_time = temp_crossing_point["time"]
-                plane_crossing_point = temp_crossing_point
-                plane_crossing_distance = self.haversine_distance(
-                    temp_crossing_point, checkpoint
-                )
-                break
+        crossing = self.find_plane_crossing(track, checkpoint, flight_path_bearing, previous_time)
+        if crossing:
+            plane_crossing_point, plane_crossing_distance = crossing
+            plane_crossing_time = plane_crossing_point["time"]
 
         # Step 3: Determine method based on which event happened and in what order
         timing_point = None
@@ -226,50 +216,126 @@ class NavScoringEngine:
             crossing_distance = radius_entry_distance
             method = "Radius Entry"
             within_025_nm = True
-        elif plane_crossing_time:
-            # Only plane crossing happened = PCA
-            # Use PCA to find closest point
-            valid_points = [p for p in track_points if p["time"] > previous_time]
-            if valid_points:
-                closest_point = min(
-                    valid_points,
-                    key=lambda p: self.haversine_distance(
-                        {"lat": p["lat"], "lon": p["lon"]}, checkpoint
-                    ),
-                )
-                crossing_distance = self.haversine_distance(
-                    {"lat": closest_point["lat"], "lon": closest_point["lon"]},
-                    checkpoint,
-                )
-                timing_point = closest_point
-                method = "PCA"
-                within_025_nm = crossing_distance <= CHECKPOINT_RADIUS_NM
-            else:
-                logger.error(f"No track points after previous checkpoint time")
-                return None, float("inf"), "PCA", False
         else:
-            # Neither event happened = PCA (fallback)
-            valid_points = [p for p in track_points if p["time"] > previous_time]
-            if not valid_points:
+            # Only plane crossing happened, or neither = PCA
+            # Use PCA to find closest point
+            closest, closest_distance = index.nearest(checkpoint, self.distance_mode, after_us)
+            if closest is None:
                 logger.error(f"No track points after previous checkpoint time")
                 return None, float("inf"), "PCA", False
-            
-            closest_point = min(
-                valid_points,
-                key=lambda p: self.haversine_distance(
-                    {"lat": p["lat"], "lon": p["lon"]}, checkpoint
-                ),
-            )
-            crossing_distance = self.haversine_distance(
-                {"lat": closest_point["lat"], "lon": closest_point["lon"]},
-                checkpoint,
-            )
-            timing_point = closest_point
+
+            timing_point = track.point(closest)
+            crossing_distance = closest_distance
             method = "PCA"
             within_025_nm = crossing_distance <= CHECKPOINT_RADIUS_NM
 
         return timing_point, crossing_distance, method, within_025_nm
 
+    def sweep_indices(self, track: TrackArray, after_time) -> Iterator[np.ndarray]:
+        """
+        Yield indices of points later than after_time, in track order, in batches
+        that double in size so a caller can stop as soon as it has what it needs.
+
+        On a time-sorted track the start is found by binary search; otherwise the
+        later points are selected with a mask.
+        """
+        after_us = datetime_to_epoch_us(after_time)
+        if track.time_sorted:
+            later = None
+            lo, end = int(np.searchsorted(track.time, after_us, side="right")), len(track)
+        else:
+            later = np.flatnonzero(track.time > after_us)
+            lo, end = 0, len(later)
+
+        size = SWEEP_BATCH_POINTS
+        while lo < end:
+            hi = min(end, lo + size)
+            yield np.arange(lo, hi) if later is None else later[lo:hi]
+            lo = hi
+            size *= 2
+
+    def along_track_projection(
+        self, checkpoint: Dict, flight_path_bearing: float
+    ) -> Tuple[float, float, float, float]:
+        """
+        Local east-north frame centred on checkpoint, collapsed onto the flight path.
+        Returns (lat0, lon0, k_lon, k_lat) such that
+            along = wrap(lon - lon0) * k_lon + (lat - lat0) * k_lat
+        is the signed distance in NM past the checkpoint along the flight path
+        (negative before the perpendicular plane, positive after it).
+        """
+        lat0, lon0 = float(checkpoint["lat"]), float(checkpoint["lon"])
+        bearing = math.radians(flight_path_bearing)
+        nm_per_degree = 60.0
+        k_lon = nm_per_degree * math.cos(math.radians(lat0)) * math.sin(bearing)
+        k_lat = nm_per_degree * math.cos(bearing)
+        return lat0, lon0, k_lon, k_lat
+
+    def find_plane_crossing(
+        self,
+        track: TrackArray,
+        checkpoint: Dict,
+        flight_path_bearing: float,
+        after_time,
+    ) -> Optional[Tuple[Dict, float]]:
+        """
+        First crossing of the plane through checkpoint (perpendicular to the
+        flight path) after after_time.
+        Returns (interpolated crossing point, distance_nm) or None.
+
+        Each batch of consecutive point pairs is projected onto the checkpoint's
+        local frame; a crossing is a sign change of the along-track distance and
+        the crossing fraction is the linear solve a1 / (a1 - a2).
+        """
+        lat0, lon0, k_lon, k_lat = self.along_track_projection(checkpoint, flight_path_bearing)
+        last = len(track) - 1
+        for indices in self.sweep_indices(track, after_time):
+            first = indices[indices < last]
+            if not first.size:
+                return None
+            pair = np.concatenate((first, first + 1))
+            dlon = (track.lon[pair] - lon0 + 180.0) % 360.0 - 180.0
+            along = dlon * k_lon + (track.lat[pair] - lat0) * k_lat
+            a1, a2 = along[: first.size], along[first.size:]
+
+            crossed = np.flatnonzero((a1 > 0) != (a2 > 0))
+            if crossed.size:
+                k = crossed[0]
+                j = int(first[k])
+                denominator = a1[k] - a2[k]
+                fraction = float(a1[k] / denominator) if denominator else 0.5
+                crossing_point = self.interpolate_point(track.point(j), track.point(j + 1), fraction)
+                return crossing_point, self.haversine_distance(crossing_point, checkpoint)
+            if first.size < indices.size:
+                return None
+        return None
+
+    def score_checkpoints(
+        self,
+        track_points: Union[TrackArray, List[Dict]],
+        start_crossing: Dict,
+        checkpoints: List[Dict],
+    ) -> Iterator[Tuple[Optional[Dict], float, str, bool]]:
+        """
+        Sweep the track across all checkpoints in order, yielding one
+        (timing_point, distance_nm, method, within_025_nm) per checkpoint.
+
+        Each leg resumes from the previous timing point (binary search on the
+        sorted track) and scans forward only as far as it needs to, so a whole
+        route costs roughly one pass over the track instead of one per checkpoint.
+        A checkpoint with no timing point leaves the leg start unchanged.
+        """
+        track = as_track_array(track_points)
+        previous_point = start_crossing
+        previous_time = start_crossing["time"]
+        for checkpoint in checkpoints:
+            result = self.find_checkpoint_crossing(track, checkpoint, previous_point, previous_time)
+            yield result
+            timing_point = result[0]
+            if timing_point:
+                previous_point = timing_point
+                previous_time = timing_point["time"]
+
     def calculate_leg_score(
         self,
         actual_time: float,
@@ -0,0 +1,115 @@
+"""
+Scoring Job Queue for NAV Scoring System
+Runs post-flight scoring in background workers so POST /flight returns immediately.
+Jobs are stored in the scoring_jobs table and survive restarts.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ScoringJobError(Exception):
+    """A scoring failure with a message that can be shown to the submitter."""
+
+
+class ScoringJobQueue:
+    """Feeds queued scoring jobs to a fixed number of asyncio workers."""
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        db,
+        handler: Callable[[Dict], Awaitable[int]],
+    ):
+        """
+        Initialize scoring job queue.
+
+        Args:
+            config: Scoring jobs configuration dict with keys:
+                - workers: int, jobs processed concurrently (default 2)
+            db: Database instance holding the scoring_jobs table
+            handler: Coroutine function that scores one job and returns the
+                flight result ID, raising ScoringJobError for user-facing failures
+        """
+        self.config = config
+        self.db = db
+        self.handler = handler
+        self.workers = max(1, int(config.get("workers", 2)))
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks: List[asyncio.Task] = []
+
+    def start(self) -> int:
+        """
+        Start the workers on the running event loop and queue any jobs left
+        unfinished by a previous run. Returns the number of jobs resumed.
+        """
+        self.queue = asyncio.Queue()
+        requeued = self.db.requeue_running_scoring_jobs()
+        if requeued:
+            logger.warning(f"Requeued {requeued} scoring jobs interrupted by a restart")
+        pending = self.db.list_unfinished_scoring_jobs()
+        for job in pending:
+            self.queue.put_nowait(job["id"])
+
+        self.tasks = [
+            asyncio.create_task(self._worker(n)) for n in range(self.workers)
+        ]
+        logger.info(f"Scoring job queue started: {self.workers} workers, {len(pending)} pending jobs")
+        return len(pending)
+
+    def enqueue(self, job_id: int):
+        """Hand a newly created job to the workers."""
+        if self.queue is None:
+            # Not started (e.g. during tests); the job runs after the next startup
+            logger.warning(f"Scoring job queue not running, job {job_id} left queued")
+            return
+        self.queue.put_nowait(job_id)
+
+    def pending(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self.queue.qsize() if self.queue else 0
+
+    async def stop(self):
+        """Cancel the workers. Jobs they were running stay 'running' and are requeued at next start."""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        logger.info("Scoring job queue stopped")
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job_id = await self.queue.get()
+            try:
+                await self.run_job(job_id)
+            except Exception as e:
+                logger.error(f"Scoring worker {worker_id} failed on job {job_id}: {e}", exc_info=True)
+            finally:
+                self.queue.task_done()
+
+    async def run_job(self, job_id: int):
+        """Claim and process one job, recording its outcome."""
+        if not self.db.start_scoring_job(job_id):
+            logger.debug(f"Scoring job {job_id} already claimed or finished")
+            return
+        job = self.db.get_scoring_job(job_id)
+        logger.info(f"Scoring job {job_id} started (prenav {job['prenav_id']}, attempt {job['attempts']})")
+
+        try:
+            result_id = await self.handler(job)
+        except asyncio.CancelledError:
+            raise
+        except ScoringJobError as e:
+            logger.warning(f"Scoring job {job_id} failed: {e}")
+            self.db.finish_scoring_job(job_id, error=str(e))
+            return
+        except Exception as e:
+            logger.error(f"Scoring job {job_id} crashed: {e}", exc_info=True)
+            self.db.finish_scoring_job(job_id, error=f"Error processing flight: {e}")
+            return
+
+        self.db.finish_scoring_job(job_id, result_id=result_id)
+        logger.info(f"Scoring job {job_id} finished: result {result_id}")
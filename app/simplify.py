@@ -0,0 +1,139 @@
+"""
+Track simplification for NAV Scoring System.
+Reduces a GPS track to the vertices needed to draw it within a tolerance
+(Douglas-Peucker), for map rendering and track transfer. The points nearest
+each checkpoint are always kept so the closest approach stays where scoring
+found it. Scoring itself always uses the full-resolution track.
+"""
+
+import logging
+import math
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.geodesy import MEAN_EARTH_RADIUS_M, METERS_PER_NM
+from app.track import TrackArray, as_track_array
+
+logger = logging.getLogger(__name__)
+
+NM_PER_DEGREE = MEAN_EARTH_RADIUS_M * math.pi / 180 / METERS_PER_NM
+
+
+def local_xy_nm(track: TrackArray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Track positions in NM on a local flat projection (equirectangular about
+    the track's middle latitude). Accurate enough for drawing tolerances over
+    the few tens of NM a NAV covers.
+    """
+    if not len(track):
+        return np.empty(0), np.empty(0)
+    mid_lat = (float(track.lat.min()) + float(track.lat.max())) / 2
+    x = track.lon * (NM_PER_DEGREE * math.cos(math.radians(mid_lat)))
+    y = track.lat * NM_PER_DEGREE
+    return x, y
+
+
+def pixel_size_nm(extent: Tuple[float, float, float, float], size_px: Tuple[float, float]) -> float:
+    """
+    Upper bound of the NM one pixel covers when extent (min_lat, min_lon,
+    max_lat, max_lon) is drawn with equal aspect into size_px (width, height).
+    """
+    min_lat, min_lon, max_lat, max_lon = extent
+    mid_lat = (min_lat + max_lat) / 2
+    width_nm = (max_lon - min_lon) * NM_PER_DEGREE * math.cos(math.radians(mid_lat))
+    height_nm = (max_lat - min_lat) * NM_PER_DEGREE
+    return max(width_nm / size_px[0], height_nm / size_px[1])
+
+
+def douglas_peucker(
+    x: np.ndarray,
+    y: np.ndarray,
+    tolerance: float,
+    keep: Optional[Iterable[int]] = None,
+) -> np.ndarray:
+    """
+    Indices (ascending) of the vertices of polyline (x, y) that Douglas-Peucker
+    keeps at tolerance, in the units of x and y. The end points and every index
+    in keep are always kept; the line is simplified separately between them.
+    """
+    n = len(x)
+    if n <= 2 or tolerance <= 0:
+        return np.arange(n)
+
+    kept = np.zeros(n, dtype=bool)
+    kept[0] = kept[-1] = True
+    if keep is not None:
+        anchors = np.fromiter(keep, dtype=np.int64)
+        kept[anchors[(anchors >= 0) & (anchors < n)]] = True
+
+    anchors = np.flatnonzero(kept)
+    stack = [(int(a), int(b)) for a, b in zip(anchors[:-1], anchors[1:]) if b - a > 1]
+    while stack:
+        start, end = stack.pop()
+        px = x[start + 1:end] - x[start]
+        py = y[start + 1:end] - y[start]
+        dx = x[end] - x[start]
+        dy = y[end] - y[start]
+        length_sq = dx * dx + dy * dy
+        # Distance to the segment (not the infinite line), so loops that return
+        # to their start are not collapsed
+        if length_sq > 0:
+            t = np.clip((px * dx + py * dy) / length_sq, 0.0, 1.0)
+            dist_sq = (px - t * dx) ** 2 + (py - t * dy) ** 2
+        else:
+            dist_sq = px * px + py * py
+        worst = int(np.argmax(dist_sq))
+        if dist_sq[worst] > tolerance * tolerance:
+            split = start + 1 + worst
+            kept[split] = True
+            if split - start > 1:
+                stack.append((start, split))
+            if end - split > 1:
+                stack.append((split, end))
+    return np.flatnonzero(kept)
+
+
+def checkpoint_anchor_indices(track: TrackArray, checkpoints: List[Dict]) -> List[int]:
+    """Index of the track point nearest each checkpoint (the closest approach on the map)."""
+    if not len(track):
+        return []
+    index = track.spatial_index()
+    anchors = []
+    for cp in checkpoints:
+        nearest, _ = index.nearest(cp)
+        if nearest is not None:
+            anchors.append(nearest)
+    return anchors
+
+
+def simplify_indices(
+    track: Union[TrackArray, List[Dict]],
+    tolerance_nm: float,
+    checkpoints: Optional[List[Dict]] = None,
+) -> np.ndarray:
+    """Indices of the track points kept at tolerance_nm, preserving the points nearest each checkpoint."""
+    track = as_track_array(track)
+    x, y = local_xy_nm(track)
+    anchors = checkpoint_anchor_indices(track, checkpoints) if checkpoints else None
+    return douglas_peucker(x, y, tolerance_nm, anchors)
+
+
+def simplify_track(
+    track: Union[TrackArray, List[Dict]],
+    tolerance_nm: float,
+    checkpoints: Optional[List[Dict]] = None,
+) -> TrackArray:
+    """
+    The track reduced to tolerance_nm (see simplify_indices), as a new TrackArray
+    carrying every column of the kept points.
+    """
+    track = as_track_array(track)
+    keep = simplify_indices(track, tolerance_nm, checkpoints)
+    if len(keep) == len(track):
+        return track
+    logger.debug(f"Simplified track from {len(track)} to {len(keep)} points at {tolerance_nm:.4f} NM")
+    return TrackArray(
+        track.lat[keep], track.lon[keep], track.time[keep],
+        track.speed[keep], track.elevation[keep],
+    )
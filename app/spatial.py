@@ -0,0 +1,144 @@
+"""
+Uniform lat/lon grid index over track points.
+Answers "points within r NM of X" and "nearest point to X" by measuring only
+the points in nearby grid cells instead of the whole track.
+"""
+
+import logging
+import math
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.geodesy import ELLIPSOIDAL, distances_nm
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CELL_NM = 0.25
+# Cells are enlarged on long tracks so the grid stays this size or smaller
+MAX_CELLS = 1 << 16
+# Nautical miles per degree of latitude is 59.7-60.3 on WGS-84; search boxes
+# are sized with the low end so they always contain the full radius.
+MIN_NM_PER_DEGREE = 59.6
+
+
+class TrackGridIndex:
+    """
+    Bucket track points into square-ish cells of about cell_nm on a side.
+
+    Point indices are stored grouped by cell (CSR layout): the points of cell c
+    are order[cell_start[c]:cell_start[c + 1]]. Query results are exact; the
+    grid only decides which points get measured.
+    """
+
+    def __init__(self, track, cell_nm: float = DEFAULT_CELL_NM):
+        self.track = track
+        self.cell_nm = cell_nm
+        if not len(track):
+            self.rows = self.cols = 0
+            self.order = np.empty(0, dtype=np.int64)
+            self.cell_start = np.zeros(1, dtype=np.int64)
+            return
+
+        self.min_lat = float(track.lat.min())
+        self.min_lon = float(track.lon.min())
+        max_abs_lat = min(float(np.abs(track.lat).max()), 89.0)
+        lon_scale = math.cos(math.radians(max_abs_lat))
+        height_nm = (track.lat.max() - self.min_lat) * MIN_NM_PER_DEGREE
+        width_nm = (track.lon.max() - self.min_lon) * MIN_NM_PER_DEGREE * lon_scale
+        if track.lon.max() - self.min_lon > 180:
+            # Track crosses the antimeridian: one cell, every query measures every point
+            cell_nm = max(height_nm, width_nm) + 1.0
+        cell_nm = max(cell_nm, math.sqrt(height_nm * width_nm / MAX_CELLS))
+        self.cell_nm = cell_nm
+        self.cell_lat = cell_nm / MIN_NM_PER_DEGREE
+        self.cell_lon = cell_nm / (MIN_NM_PER_DEGREE * lon_scale)
+        self.rows = int((track.lat.max() - self.min_lat) // self.cell_lat) + 1
+        self.cols = int((track.lon.max() - self.min_lon) // self.cell_lon) + 1
+
+        cells = self._row(track.lat) * self.cols + self._col(track.lon)
+        self.order = np.argsort(cells, kind="stable")
+        self.cell_start = np.searchsorted(
+            cells[self.order], np.arange(self.rows * self.cols + 1)
+        )
+
+    def _row(self, lat):
+        return ((np.asarray(lat) - self.min_lat) // self.cell_lat).astype(np.int64)
+
+    def _col(self, lon):
+        return ((np.asarray(lon) - self.min_lon) // self.cell_lon).astype(np.int64)
+
+    def _candidates(self, reference: Dict, radius_nm: float) -> Tuple[np.ndarray, bool]:
+        """
+        Indices of points in the cells overlapping the search box around reference,
+        in track order, and whether the box covered the whole grid.
+        """
+        lat, lon = float(reference["lat"]), float(reference["lon"])
+        dlat = radius_nm / MIN_NM_PER_DEGREE
+        cos_lat = math.cos(math.radians(min(abs(lat) + dlat, 89.0)))
+        dlon = radius_nm / (MIN_NM_PER_DEGREE * cos_lat)
+
+        row_lo = max(0, int(self._row(lat - dlat)))
+        row_hi = min(self.rows - 1, int(self._row(lat + dlat)))
+        col_lo = max(0, int(self._col(lon - dlon)))
+        col_hi = min(self.cols - 1, int(self._col(lon + dlon)))
+        covers_all = row_lo == 0 and col_lo == 0 and row_hi == self.rows - 1 and col_hi == self.cols - 1
+        if row_lo > row_hi or col_lo > col_hi:
+            return np.empty(0, dtype=np.int64), covers_all
+
+        # Each row of the box is one contiguous run of cells
+        starts = self.cell_start[np.arange(row_lo, row_hi + 1) * self.cols + col_lo]
+        ends = self.cell_start[np.arange(row_lo, row_hi + 1) * self.cols + col_hi + 1]
+        runs = [self.order[s:e] for s, e in zip(starts, ends) if e > s]
+        if not runs:
+            return np.empty(0, dtype=np.int64), covers_all
+        return np.sort(np.concatenate(runs)), covers_all
+
+    def within(
+        self,
+        reference: Dict,
+        radius_nm: float,
+        mode: str = ELLIPSOIDAL,
+        after_us: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Points within radius_nm of reference, in track order.
+        Only points with time > after_us are considered when given.
+        Returns (indices, distances_nm).
+        """
+        if not len(self.order):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        candidates, _ = self._candidates(reference, radius_nm)
+        if after_us is not None:
+            candidates = candidates[self.track.time[candidates] > after_us]
+        distances = distances_nm(reference, self.track.lat[candidates], self.track.lon[candidates], mode)
+        keep = distances <= radius_nm
+        return candidates[keep], distances[keep]
+
+    def nearest(
+        self,
+        reference: Dict,
+        mode: str = ELLIPSOIDAL,
+        after_us: Optional[int] = None,
+    ) -> Tuple[Optional[int], float]:
+        """
+        Closest point to reference (earliest on ties).
+        Only points with time > after_us are considered when given.
+        Returns (index, distance_nm) or (None, inf).
+        """
+        radius_nm = self.cell_nm
+        while len(self.order):
+            candidates, covers_all = self._candidates(reference, radius_nm)
+            if after_us is not None:
+                candidates = candidates[self.track.time[candidates] > after_us]
+            if candidates.size:
+                distances = distances_nm(reference, self.track.lat[candidates], self.track.lon[candidates], mode)
+                best = int(np.argmin(distances))
+                # The box may reach corners beyond radius_nm, so only trust a
+                # hit inside the radius (or any hit once the whole grid was searched)
+                if distances[best] <= radius_nm or covers_all:
+                    return int(candidates[best]), float(distances[best])
+            elif covers_all:
+                break
+            radius_nm *= 2
+        return None, float("inf")
@@ -0,0 +1,147 @@
+"""
+Columnar GPS track representation.
+Stores track points as contiguous NumPy arrays instead of one dict per point.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def datetime_to_epoch_us(value: datetime) -> int:
+    """Convert a datetime to integer microseconds since the Unix epoch (naive = UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // ONE_MICROSECOND
+
+
+def epoch_us_to_datetime(value: int) -> datetime:
+    """Convert integer microseconds since the Unix epoch to an aware UTC datetime."""
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+class TrackArray:
+    """
+    GPS track stored column-wise.
+
+    Attributes:
+        lat, lon: float64 degrees
+        speed: float64 m/s (0.0 when the logger did not record it)
+        elevation: float64 meters (0.0 when missing)
+        time: int64 microseconds since the Unix epoch (UTC)
+        time_sorted: True when time is non-decreasing, which allows binary search
+    """
+
+    __slots__ = ("lat", "lon", "speed", "elevation", "time", "time_sorted", "_spatial_index")
+
+    def __init__(
+        self,
+        lat: Sequence[float],
+        lon: Sequence[float],
+        time: Sequence[int],
+        speed: Optional[Sequence[float]] = None,
+        elevation: Optional[Sequence[float]] = None,
+    ):
+        self.lat = np.ascontiguousarray(lat, dtype=np.float64)
+        self.lon = np.ascontiguousarray(lon, dtype=np.float64)
+        self.time = np.ascontiguousarray(time, dtype=np.int64)
+        n = len(self.lat)
+        self.speed = (
+            np.zeros(n, dtype=np.float64) if speed is None
+            else np.ascontiguousarray(speed, dtype=np.float64)
+        )
+        self.elevation = (
+            np.zeros(n, dtype=np.float64) if elevation is None
+            else np.ascontiguousarray(elevation, dtype=np.float64)
+        )
+        for name in ("lon", "time", "speed", "elevation"):
+            if len(getattr(self, name)) != n:
+                raise ValueError(f"Track column '{name}' has {len(getattr(self, name))} values, expected {n}")
+        self.time_sorted = bool(n < 2 or np.all(self.time[1:] >= self.time[:-1]))
+        self._spatial_index = None
+
+    @classmethod
+    def from_points(cls, points: List[Dict]) -> "TrackArray":
+        """Build a track from the legacy list-of-dicts format (lat, lon, time, speed, elevation)."""
+        n = len(points)
+        lat = np.empty(n, dtype=np.float64)
+        lon = np.empty(n, dtype=np.float64)
+        speed = np.empty(n, dtype=np.float64)
+        elevation = np.empty(n, dtype=np.float64)
+        times = np.empty(n, dtype=np.int64)
+        for i, p in enumerate(points):
+            if p.get("time") is None:
+                raise ValueError(f"Track point {i} has no timestamp")
+            lat[i] = p["lat"]
+            lon[i] = p["lon"]
+            speed[i] = p.get("speed") or 0.0
+            elevation[i] = p.get("elevation") or 0.0
+            times[i] = datetime_to_epoch_us(p["time"])
+        return cls(lat, lon, times, speed, elevation)
+
+    def __reduce__(self):
+        # Sent to worker processes as bare columns; the spatial index is rebuilt there on demand
+        return (TrackArray, (self.lat, self.lon, self.time, self.speed, self.elevation))
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def __getitem__(self, index: int) -> Dict:
+        return self.point(index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self.point(i)
+
+    def point(self, index: int) -> Dict:
+        """Return a single track point in the legacy dict format."""
+        return {
+            "lat": float(self.lat[index]),
+            "lon": float(self.lon[index]),
+            "time": epoch_us_to_datetime(self.time[index]),
+            "speed": float(self.speed[index]),
+            "elevation": float(self.elevation[index]),
+        }
+
+    def to_points(self) -> List[Dict]:
+        """Expand into the legacy list-of-dicts format."""
+        return [self.point(i) for i in range(len(self))]
+
+    def datetime_at(self, index: int) -> datetime:
+        """Timestamp of a point as an aware UTC datetime."""
+        return epoch_us_to_datetime(self.time[index])
+
+    def bounding_corners(self) -> List[Dict]:
+        """South-west and north-east corners of the track as lat/lon dicts."""
+        if not len(self):
+            return []
+        return [
+            {"lat": float(self.lat.min()), "lon": float(self.lon.min())},
+            {"lat": float(self.lat.max()), "lon": float(self.lon.max())},
+        ]
+
+    def spatial_index(self):
+        """Grid index over the points (app.spatial.TrackGridIndex), built on first use."""
+        if self._spatial_index is None:
+            from app.spatial import TrackGridIndex
+            self._spatial_index = TrackGridIndex(self)
+        return self._spatial_index
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays."""
+        return sum(getattr(self, name).nbytes for name in ("lat", "lon", "speed", "elevation", "time"))
+
+
+def as_track_array(track: Union[TrackArray, List[Dict]]) -> TrackArray:
+    """Accept either a TrackArray or a legacy list of point dicts."""
+    if isinstance(track, TrackArray):
+        return track
+    return TrackArray.from_points(track)
@@ -0,0 +1,98 @@
+"""
+Parsed-track cache for NAV Scoring System.
+Stores each parsed GPX track as a compressed .npz file keyed by the SHA-256 of
+the GPX bytes, so later reprocessing skips XML parsing entirely.
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from app.disk_cache import DiskCache
+from app.track import TrackArray
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout or the parser's output changes
+TRACK_CACHE_FORMAT = 1
+TRACK_COLUMNS = ("lat", "lon", "time", "speed", "elevation")
+
+
+class TrackCache(DiskCache):
+    """Disk cache of TrackArrays with least-recently-used eviction by total size."""
+
+    name = "track_cache"
+    parent_key = "gpx_uploads"
+    parent_default = "data/gpx_uploads"
+    default_max_mb = 256
+    pattern = "*.npz"
+    label = "track cache"
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize track cache.
+
+        Args:
+            config: Storage configuration dict (gpx_uploads, track_cache,
+                track_cache_max_mb with a 256 MB default; see DiskCache)
+        """
+        super().__init__(config)
+        logger.debug(f"TrackCache initialized: {self.cache_path}")
+
+    @staticmethod
+    def content_hash(gpx_content: bytes) -> str:
+        """SHA-256 hex digest of the raw GPX bytes."""
+        return hashlib.sha256(gpx_content).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_path / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[TrackArray]:
+        """Cached track for a content hash, or None on a miss."""
+        path = self.path_for(key)
+        try:
+            with np.load(path) as data:
+                if int(data["format"]) != TRACK_CACHE_FORMAT:
+                    raise ValueError(f"format {int(data['format'])}")
+                track = TrackArray(*(data[name] for name in TRACK_COLUMNS))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable track cache entry {path.name}: {e}")
+            self.discard(key)
+            return None
+
+        self.touch(path)
+        return track
+
+    def put(self, key: str, track: TrackArray):
+        """Store a track under its content hash and enforce the disk budget."""
+        columns = {name: getattr(track, name) for name in TRACK_COLUMNS}
+        stored = self.write_atomic(
+            self.path_for(key),
+            lambda f: np.savez_compressed(f, format=np.int64(TRACK_CACHE_FORMAT), **columns),
+        )
+        if stored:
+            self.evict()
+
+    def discard(self, key: str):
+        """Remove a cached track if present."""
+        self.remove(self.path_for(key))
+
+    def load(self, gpx_content: bytes, parser: Callable[[bytes], TrackArray]) -> TrackArray:
+        """Return the track for GPX bytes, parsing and caching it on a miss."""
+        key = self.content_hash(gpx_content)
+        track = self.get(key)
+        if track is not None:
+            logger.debug(f"Track cache hit: {key[:12]} ({len(track)} points)")
+            return track
+        track = parser(gpx_content)
+        self.put(key, track)
+        return track
+
+    def load_file(self, gpx_path: Path, parser: Callable[[bytes], TrackArray]) -> TrackArray:
+        """Return the track for a stored GPX upload."""
+        return self.load(Path(gpx_path).read_bytes(), parser)
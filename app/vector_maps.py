@@ -0,0 +1,424 @@
+"""
+Vector Map Rendering for NAV Scoring PDF Reports.
+Draws the route and checkpoint maps as reportlab graphics that are embedded in
+the PDF as native vector paths, as an alternative to the rasterized matplotlib
+maps in pdf_generator. Track polylines are simplified to the page resolution.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from reportlab.graphics.shapes import Circle, Drawing, Group, Line, PolyLine, Polygon, Rect, String
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+from app.pdf_generator import (
+    CHECKPOINT_RADIUS_NM,
+    COLOR_ACTUAL_TRACK,
+    COLOR_CHECKPOINT,
+    COLOR_PLANNED_ROUTE,
+    COLOR_START_GATE,
+    calculate_perpendicular_distance,
+    get_bounding_box,
+    nm_to_decimal_degrees,
+)
+from app.simplify import checkpoint_anchor_indices, douglas_peucker
+from app.track import TrackArray, as_track_array
+
+# Track vertices closer together than this on the page are merged (points; 1/144 inch)
+DEFAULT_TOLERANCE_PT = 0.5
+# Direction arrows drawn along the full route
+ROUTE_ARROW_COUNT = 20
+
+TITLE_HEIGHT = 22
+MARGIN = 6
+
+RED = colors.HexColor(COLOR_ACTUAL_TRACK)
+BLUE = colors.HexColor(COLOR_PLANNED_ROUTE)
+GREEN = colors.HexColor(COLOR_START_GATE)
+ORANGE = colors.HexColor(COLOR_CHECKPOINT)
+PLANE = colors.HexColor('#FF1493')
+DEVIATION = colors.HexColor('#00FF00')
+GRID = colors.HexColor('#CCCCCC')
+
+
+class MapFrame:
+    """
+    Maps lon/lat degrees into a rectangle of the drawing with equal degree
+    scaling on both axes (the same aspect as the matplotlib maps).
+    """
+
+    def __init__(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                 x: float, y: float, width: float, height: float):
+        span_lon = max(max_lon - min_lon, 1e-9)
+        span_lat = max(max_lat - min_lat, 1e-9)
+        self.scale = min(width / span_lon, height / span_lat)
+        # Center the map in the rectangle
+        self.x0 = x + (width - span_lon * self.scale) / 2 - min_lon * self.scale
+        self.y0 = y + (height - span_lat * self.scale) / 2 - min_lat * self.scale
+        self.bounds = (min_lat, min_lon, max_lat, max_lon)
+        self.box = (
+            self.x0 + min_lon * self.scale, self.y0 + min_lat * self.scale,
+            span_lon * self.scale, span_lat * self.scale,
+        )
+
+    def xy(self, lon, lat):
+        """Page coordinates of a point (or arrays of points)."""
+        return self.x0 + np.asarray(lon) * self.scale, self.y0 + np.asarray(lat) * self.scale
+
+    def point(self, p: Dict) -> Tuple[float, float]:
+        x, y = self.xy(p['lon'], p['lat'])
+        return float(x), float(y)
+
+
+def decimate(x: np.ndarray, y: np.ndarray, tolerance: float = DEFAULT_TOLERANCE_PT) -> np.ndarray:
+    """
+    Indices of the vertices to keep when drawing a polyline at page resolution:
+    the first vertex in each tolerance-sized cell of a run, plus the last vertex.
+    """
+    n = len(x)
+    if n <= 2:
+        return np.arange(n)
+    cx = np.floor(x / tolerance).astype(np.int64)
+    cy = np.floor(y / tolerance).astype(np.int64)
+    keep = np.empty(n, dtype=bool)
+    keep[0] = True
+    keep[1:] = (cx[1:] != cx[:-1]) | (cy[1:] != cy[:-1])
+    keep[-1] = True
+    return np.flatnonzero(keep)
+
+
+def _clip_segment(frame: MapFrame, x1: float, y1: float, x2: float, y2: float) -> Optional[Tuple[float, float, float, float]]:
+    """Clip a segment to the map box (Liang-Barsky); None when it lies entirely outside."""
+    bx, by, bw, bh = frame.box
+    dx, dy = x2 - x1, y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - bx), (dx, bx + bw - x1), (-dy, y1 - by), (dy, by + bh - y1)):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return None
+    return x1 + t0 * dx, y1 + t0 * dy, x1 + t1 * dx, y1 + t1 * dy
+
+
+def _polyline(x: np.ndarray, y: np.ndarray, color, width: float, dash=None, opacity: float = 1.0) -> PolyLine:
+    points = np.empty(2 * len(x))
+    points[0::2] = x
+    points[1::2] = y
+    return PolyLine(points.tolist(), strokeColor=color, strokeWidth=width,
+                    strokeDashArray=dash, strokeOpacity=opacity, strokeLineJoin=1)
+
+
+def _marker(kind: str, x: float, y: float, size: float, fill, stroke=colors.black, stroke_width: float = 1):
+    """Scatter-style marker centered on (x, y): square, circle, star or cross."""
+    r = size / 2
+    if kind == 'square':
+        return Rect(x - r, y - r, size, size, fillColor=fill, strokeColor=stroke, strokeWidth=stroke_width)
+    if kind == 'circle':
+        return Circle(x, y, r, fillColor=fill, strokeColor=stroke, strokeWidth=stroke_width)
+    if kind == 'star':
+        points = []
+        for k in range(10):
+            radius = r if k % 2 == 0 else r * 0.45
+            angle = math.pi / 2 + k * math.pi / 5
+            points += [x + radius * math.cos(angle), y + radius * math.sin(angle)]
+        return Polygon(points, fillColor=fill, strokeColor=stroke, strokeWidth=stroke_width)
+    if kind == 'cross':
+        w = r * 0.35
+        points = []
+        for k in range(4):
+            # One arm of the X per quarter turn
+            a = math.pi / 4 + k * math.pi / 2
+            ca, sa = math.cos(a), math.sin(a)
+            for dx, dy in ((w, -w), (r, -w), (r, w), (w, w)):
+                points += [x + dx * ca - dy * sa, y + dx * sa + dy * ca]
+        return Polygon(points, fillColor=fill, strokeColor=stroke, strokeWidth=stroke_width)
+    raise ValueError(f"Unknown marker: {kind}")
+
+
+def _arrow_heads(x: np.ndarray, y: np.ndarray, count: int, color, size: float = 7) -> Group:
+    """Open arrow heads along a polyline pointing in the direction of travel."""
+    group = Group()
+    n = len(x)
+    if n < 2:
+        return group
+    interval = max(1, n // count)
+    for i in range(0, n - 1, interval):
+        dx, dy = x[i + 1] - x[i], y[i + 1] - y[i]
+        length = math.hypot(dx, dy)
+        if length < 1e-6:
+            continue
+        ux, uy = dx / length, dy / length
+        tip_x, tip_y = x[i] + ux * size, y[i] + uy * size
+        for side in (1, -1):
+            # Two barbs 30 degrees either side of the travel direction
+            bx = tip_x - size * 0.6 * (ux * 0.866 - side * uy * 0.5)
+            by = tip_y - size * 0.6 * (uy * 0.866 + side * ux * 0.5)
+            group.add(Line(tip_x, tip_y, bx, by, strokeColor=color, strokeWidth=1.5, strokeOpacity=0.8))
+    return group
+
+
+def _nice_step(span: float, target: int = 6) -> float:
+    raw = span / target
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if raw <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def _grid(frame: MapFrame) -> Group:
+    """Dotted lat/lon grid with degree labels along the left and bottom edges."""
+    group = Group()
+    min_lat, min_lon, max_lat, max_lon = frame.bounds
+    bx, by, bw, bh = frame.box
+    for lo, hi, vertical in ((min_lon, max_lon, True), (min_lat, max_lat, False)):
+        step = _nice_step(hi - lo)
+        decimals = max(0, -int(math.floor(math.log10(step))))
+        value = math.ceil(lo / step) * step
+        while value <= hi:
+            if vertical:
+                x, _ = frame.xy(value, min_lat)
+                x = float(x)
+                group.add(Line(x, by, x, by + bh, strokeColor=GRID, strokeWidth=0.5, strokeDashArray=[1, 2]))
+                group.add(String(x, by - 9, f"{value:.{decimals}f}", fontSize=6, textAnchor='middle'))
+            else:
+                _, y = frame.xy(min_lon, value)
+                y = float(y)
+                group.add(Line(bx, y, bx + bw, y, strokeColor=GRID, strokeWidth=0.5, strokeDashArray=[1, 2]))
+                group.add(String(bx - 2, y - 2, f"{value:.{decimals}f}", fontSize=6, textAnchor='end'))
+            value += step
+    group.add(Rect(bx, by, bw, bh, fillColor=None, strokeColor=colors.black, strokeWidth=0.75))
+    return group
+
+
+def _legend(frame: MapFrame, entries: List[Tuple[str, object]]) -> Group:
+    """Legend box in the top-left corner. entries: (label, sample shape factory)."""
+    group = Group()
+    bx, by, bw, bh = frame.box
+    row = 11
+    width = 24 + max(len(label) for label, _ in entries) * 4.2
+    height = row * len(entries) + 6
+    top = by + bh - 4
+    group.add(Rect(bx + 4, top - height, width, height, fillColor=colors.white,
+                   strokeColor=GRID, strokeWidth=0.5, fillOpacity=0.95))
+    for k, (label, sample) in enumerate(entries):
+        y = top - 8 - k * row
+        group.add(sample(bx + 14, y))
+        group.add(String(bx + 26, y - 2.5, label, fontSize=7))
+    return group
+
+
+def _title(drawing: Drawing, text: str):
+    drawing.add(String(drawing.width / 2, drawing.height - TITLE_HEIGHT + 8, text,
+                       fontName='Helvetica-Bold', fontSize=11, textAnchor='middle'))
+
+
+def _line_sample(color, width: float, dash=None):
+    return lambda x, y: Line(x - 8, y, x + 8, y, strokeColor=color, strokeWidth=width, strokeDashArray=dash)
+
+
+def _marker_sample(kind: str, fill, size: float = 7):
+    return lambda x, y: _marker(kind, x, y, size, fill, stroke_width=0.75)
+
+
+def route_map_drawing(
+    track_points: Union[TrackArray, List[Dict]],
+    start_gate: Dict,
+    checkpoints: List[Dict],
+    width: float = 6.5 * inch,
+    height: float = 5.2 * inch,
+    tolerance: float = DEFAULT_TOLERANCE_PT,
+) -> Drawing:
+    """Full route map (planned route, actual track, start gate, checkpoints) as a vector Drawing."""
+    track = as_track_array(track_points)
+    drawing = Drawing(width, height)
+    _title(drawing, 'Complete Flight Route - Planned vs Actual')
+
+    all_points = [start_gate] + checkpoints + track.bounding_corners()
+    frame = MapFrame(*get_bounding_box(all_points, padding_nm=1.5),
+                     x=MARGIN + 30, y=MARGIN + 12,
+                     width=width - 2 * MARGIN - 30, height=height - TITLE_HEIGHT - MARGIN - 12)
+    drawing.add(_grid(frame))
+
+    # Planned route (straight lines between waypoints)
+    route = [start_gate] + checkpoints
+    rx, ry = frame.xy([p['lon'] for p in route], [p['lat'] for p in route])
+    drawing.add(_polyline(rx, ry, BLUE, 2, dash=[6, 3], opacity=0.8))
+
+    # Actual track, thinned to what the page can show
+    if len(track):
+        tx, ty = frame.xy(track.lon, track.lat)
+        keep = douglas_peucker(tx, ty, tolerance, checkpoint_anchor_indices(track, checkpoints))
+        drawing.add(_polyline(tx[keep], ty[keep], RED, 1.5, opacity=0.7))
+        drawing.add(_arrow_heads(tx, ty, ROUTE_ARROW_COUNT, RED))
+
+    # Start gate and checkpoints
+    gx, gy = frame.point(start_gate)
+    drawing.add(_marker('square', gx, gy, 11, GREEN, stroke_width=1.5))
+    drawing.add(String(gx, gy - 14, 'START', fontName='Helvetica-Bold', fontSize=7, textAnchor='middle'))
+    for i, cp in enumerate(checkpoints, 1):
+        cx, cy = frame.point(cp)
+        drawing.add(_marker('circle', cx, cy, 9, ORANGE, stroke_width=1.5))
+        drawing.add(String(cx, cy + 8, f"CP {i}", fontName='Helvetica-Bold', fontSize=7, textAnchor='middle'))
+
+    drawing.add(_legend(frame, [
+        ('Actual Track', _line_sample(RED, 1.5)),
+        ('Planned Route', _line_sample(BLUE, 2, dash=[4, 2])),
+        ('Start Gate', _marker_sample('square', GREEN)),
+        ('Checkpoints', _marker_sample('circle', ORANGE)),
+    ]))
+    return drawing
+
+
+def checkpoint_map_drawing(
+    track_points: Union[TrackArray, List[Dict]],
+    checkpoint: Dict,
+    checkpoint_index: int,
+    radius_nm: float = CHECKPOINT_RADIUS_NM,
+    start_gate: Optional[Dict] = None,
+    previous_checkpoint: Optional[Dict] = None,
+    size: float = 6.5 * inch,
+    tolerance: float = DEFAULT_TOLERANCE_PT,
+) -> Drawing:
+    """
+    Checkpoint detail map (nearby track, radius circle, closest approach and
+    "the plane" perpendicular to the intended course) as a vector Drawing.
+    """
+    track = as_track_array(track_points)
+    drawing = Drawing(size, size)
+
+    # Same extent as the raster map: 2.5x the radius around the checkpoint
+    padding_degrees = nm_to_decimal_degrees(radius_nm * 2.5, checkpoint['lat'])
+    min_lat = checkpoint['lat'] - padding_degrees
+    max_lat = checkpoint['lat'] + padding_degrees
+    min_lon = checkpoint['lon'] - padding_degrees
+    max_lon = checkpoint['lon'] + padding_degrees
+    frame = MapFrame(min_lat, min_lon, max_lat, max_lon,
+                     x=MARGIN + 36, y=MARGIN + 12,
+                     width=size - 2 * MARGIN - 36, height=size - TITLE_HEIGHT - MARGIN - 12)
+    drawing.add(_grid(frame))
+    legend = []
+    closest_index, closest_distance_nm = track.spatial_index().nearest(checkpoint)
+
+    nearby = (
+        (track.lat >= min_lat) & (track.lat <= max_lat)
+        & (track.lon >= min_lon) & (track.lon <= max_lon)
+    )
+    if nearby.any():
+        nearby_indices = np.flatnonzero(nearby)
+        tx, ty = frame.xy(track.lon[nearby_indices], track.lat[nearby_indices])
+        # Keep the closest approach on the simplified line
+        anchors = np.flatnonzero(nearby_indices == closest_index)
+        keep = douglas_peucker(tx, ty, tolerance, anchors)
+        drawing.add(_polyline(tx[keep], ty[keep], RED, 2, opacity=0.8))
+        # Sample dots, thinned so overlapping dots are not drawn twice
+        dots = Group()
+        for k in decimate(tx, ty, 3.0):
+            dots.add(Circle(float(tx[k]), float(ty[k]), 1.6, fillColor=RED, strokeColor=None, fillOpacity=0.6))
+        drawing.add(dots)
+        legend.append(('GPS Track', _line_sample(RED, 2)))
+
+    # Checkpoint radius circle
+    cx, cy = frame.point(checkpoint)
+    radius_degrees = nm_to_decimal_degrees(radius_nm, checkpoint['lat'])
+    drawing.add(Circle(cx, cy, radius_degrees * frame.scale, fillColor=None, strokeColor=ORANGE,
+                       strokeWidth=2, strokeDashArray=[6, 3], strokeOpacity=0.7))
+    legend.append((f'Radius ({radius_nm:.2f} NM)', _line_sample(ORANGE, 2, dash=[4, 2])))
+
+    closest_point = None
+    if closest_index is not None:
+        closest_point = track.point(closest_index)
+
+    drawing.add(_marker('star', cx, cy, 20, ORANGE, stroke_width=1.5))
+    legend.append(('Checkpoint', _marker_sample('star', ORANGE, 9)))
+
+    if closest_point:
+        px, py = frame.point(closest_point)
+        drawing.add(_marker('cross', px, py, 13, colors.yellow))
+        legend.append((f'Closest Approach ({closest_distance_nm:.3f} NM)', _marker_sample('cross', colors.yellow, 9)))
+
+        intended_start = None
+        if checkpoint_index == 1 and start_gate:
+            intended_start = start_gate
+        elif checkpoint_index > 1 and previous_checkpoint:
+            intended_start = previous_checkpoint
+
+        if intended_start:
+            course_lat = checkpoint['lat'] - intended_start['lat']
+            course_lon = checkpoint['lon'] - intended_start['lon']
+            course_magnitude = math.hypot(course_lat, course_lon)
+            if course_magnitude > 0:
+                # "The plane": perpendicular to the course through the checkpoint, 0.015 degrees each way
+                perp_lat = -course_lon / course_magnitude * 0.015
+                perp_lon = course_lat / course_magnitude * 0.015
+                (x1, x2), (y1, y2) = frame.xy(
+                    [checkpoint['lon'] + perp_lon, checkpoint['lon'] - perp_lon],
+                    [checkpoint['lat'] + perp_lat, checkpoint['lat'] - perp_lat],
+                )
+                plane = _clip_segment(frame, float(x1), float(y1), float(x2), float(y2))
+                if plane:
+                    drawing.add(Line(*plane, strokeColor=PLANE, strokeWidth=2.5,
+                                     strokeDashArray=[6, 3], strokeOpacity=0.8))
+                legend.append(('"The Plane" (Perpendicular to Course)', _line_sample(PLANE, 2.5, dash=[4, 2])))
+
+                # Off-course deviation from the closest point to the intended course line
+                deviation_nm, foot = calculate_perpendicular_distance(closest_point, intended_start, checkpoint)
+                fx, fy = frame.point(foot)
+                drawing.add(Line(px, py, fx, fy, strokeColor=DEVIATION, strokeWidth=1.5,
+                                 strokeDashArray=[1, 2], strokeOpacity=0.7))
+                drawing.add(Circle(fx, fy, 4.5, fillColor=DEVIATION, strokeColor=None, fillOpacity=0.8))
+                label_x, label_y = (px + fx) / 2, (py + fy) / 2
+                drawing.add(Rect(label_x - 30, label_y - 10, 60, 20, rx=3, ry=3, fillColor=DEVIATION,
+                                 fillOpacity=0.7, strokeColor=colors.black, strokeWidth=0.5))
+                drawing.add(String(label_x, label_y + 1.5, 'Off-Course:', fontName='Helvetica-Bold',
+                                   fontSize=7, textAnchor='middle'))
+                drawing.add(String(label_x, label_y - 6.5, f'{deviation_nm:.3f} NM', fontName='Helvetica-Bold',
+                                   fontSize=7, textAnchor='middle'))
+
+    within_radius = closest_distance_nm <= radius_nm if closest_point else False
+    status = "INSIDE" if within_radius else "OUTSIDE"
+    _title(drawing, f"CP {checkpoint_index}: {checkpoint['name']} - {status}")
+    drawing.add(_legend(frame, legend))
+
+    # Info box in the top-right corner
+    bx, by, bw, bh = frame.box
+    info = [f"Coords: {checkpoint['lat']:.4f}, {checkpoint['lon']:.4f}"]
+    if closest_point:
+        info.append(f"Closest: {closest_distance_nm:.3f} NM")
+    box_height = 10 * len(info) + 4
+    drawing.add(Rect(bx + bw - 124, by + bh - 4 - box_height, 120, box_height, rx=3, ry=3,
+                     fillColor=colors.wheat, fillOpacity=0.8, strokeColor=colors.black, strokeWidth=0.5))
+    for k, text in enumerate(info):
+        drawing.add(String(bx + bw - 120, by + bh - 12 - 10 * k, text, fontSize=7))
+    return drawing
+
+
+def map_drawings(
+    track_points: Union[TrackArray, List[Dict]],
+    start_gate: Dict,
+    checkpoints: Sequence[Dict],
+    tolerance: float = DEFAULT_TOLERANCE_PT,
+) -> Tuple[Drawing, List[Drawing]]:
+    """Route map and per-checkpoint detail maps for a report, sized like the raster maps."""
+    track = as_track_array(track_points)
+    checkpoints = list(checkpoints)
+    route = route_map_drawing(track, start_gate, checkpoints, tolerance=tolerance)
+    details = [
+        checkpoint_map_drawing(
+            track, checkpoint, i + 1,
+            start_gate=start_gate,
+            previous_checkpoint=checkpoints[i - 1] if i > 0 else None,
+            tolerance=tolerance,
+        )
+        for i, checkpoint in enumerate(checkpoints)
+    ]
+    return route, details
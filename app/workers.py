@@ -0,0 +1,146 @@
+"""
+Process Pool for NAV Scoring System
+Runs the CPU-bound scoring pipeline stages (GPX parsing, checkpoint scoring,
+map rendering, PDF building) in worker processes so they use every core and
+never hold the event loop's GIL.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from app.scoring_jobs import ScoringJobError
+
+logger = logging.getLogger(__name__)
+
+# Seconds a stage may run before its job is failed
+DEFAULT_STAGE_TIMEOUTS = {
+    "load_track": 60,
+    "score_checkpoints": 120,
+    "render_maps": 300,
+    "build_pdf": 120,
+}
+DEFAULT_STAGE_TIMEOUT = 300
+
+
+def _warm_worker():
+    """Process initializer: pay the heavy imports once per worker, not once per job."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    import matplotlib.patches  # noqa: F401
+    import reportlab.platypus  # noqa: F401
+    import reportlab.pdfgen.canvas  # noqa: F401
+    import app.pipeline  # noqa: F401
+
+
+class StageExecutor:
+    """Runs pipeline stages in a pool of warm worker processes with back-pressure and timeouts."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize stage executor.
+
+        Args:
+            config: Process pool configuration dict with keys:
+                - workers: int, worker processes (default: CPU count; 0 runs
+                  stages in the event loop's thread pool instead)
+                - max_pending: int, stages submitted at once (default: workers)
+                - timeouts: dict of stage name -> seconds (see DEFAULT_STAGE_TIMEOUTS)
+        """
+        self.config = config
+        self.workers = int(config.get("workers", os.cpu_count() or 1))
+        self.max_pending = max(1, int(config.get("max_pending", self.workers or 1)))
+        self.timeouts = dict(DEFAULT_STAGE_TIMEOUTS, **(config.get("timeouts") or {}))
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.slots: Optional[asyncio.Semaphore] = None
+
+    def start(self):
+        """Start the worker processes (call from the running event loop)."""
+        self.slots = asyncio.Semaphore(self.max_pending)
+        if self.workers > 0:
+            self.pool = self._new_pool()
+            logger.info(f"Stage executor started: {self.workers} worker processes, {self.max_pending} pending stages")
+        else:
+            logger.info("Stage executor started: stages run in the event loop's thread pool")
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # Fresh interpreters: forking would copy the event loop, open sockets and DB connections
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+
+    def _restart_pool(self, old_pool: Optional[ProcessPoolExecutor]):
+        """
+        Replace old_pool, killing its workers (a timed-out stage cannot be cancelled
+        otherwise). Other stages still running in it fail with it; when they report
+        that, old_pool has already been replaced and this does nothing.
+        """
+        if old_pool is None or old_pool is not self.pool:
+            return
+        self.pool = self._new_pool()
+        processes = list((getattr(old_pool, "_processes", None) or {}).values())
+        old_pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        logger.warning(f"Stage executor pool restarted ({len(processes)} workers terminated)")
+
+    async def run(self, stage: str, func: Callable, *args) -> Any:
+        """
+        Run func(*args) in a worker process and return its result.
+        Waits for a free slot first, so a burst of jobs queues here instead of
+        piling work into the pool. Raises ScoringJobError on timeout or worker crash.
+        """
+        if self.slots is None:
+            self.start()
+        timeout = self.timeouts.get(stage, DEFAULT_STAGE_TIMEOUT)
+        loop = asyncio.get_running_loop()
+
+        async with self.slots:
+            started = time.perf_counter()
+            # The pool this stage runs in, which may be replaced while it runs
+            pool = self.pool
+            future = loop.run_in_executor(pool, func, *args)
+            try:
+                result = await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"Stage {stage} timed out after {timeout}s")
+                self._restart_pool(pool)
+                raise ScoringJobError(f"Scoring timed out while running {stage.replace('_', ' ')}. Please try again.")
+            except BrokenProcessPool as e:
+                logger.error(f"Stage {stage} lost its worker process: {e}")
+                self._restart_pool(pool)
+                raise ScoringJobError(f"Scoring worker crashed while running {stage.replace('_', ' ')}. Please try again.")
+            logger.debug(f"Stage {stage} finished in {time.perf_counter() - started:.2f}s")
+            return result
+
+    async def map(self, stage: str, func: Callable, calls: Sequence[Sequence]) -> List[Any]:
+        """
+        Run func(*args) for every args in calls across the workers.
+        Results come back in the order of calls; the first failure is raised
+        and the calls still queued or running are cancelled.
+        """
+        tasks = [asyncio.ensure_future(self.run(stage, func, *args)) for args in calls]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def stop(self):
+        """Shut down the worker processes."""
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        self.slots = None
+        logger.info("Stage executor stopped")
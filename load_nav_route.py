@@ -8,7 +8,7 @@ from app.database import Database
 db = Database('/app/data/navs.db')
 
 # Get or create KMDH airport
-with db.get_connection() as conn:
+with db.write_connection() as conn:
     cursor = conn.execute('SELECT id FROM airports WHERE code = ?', ('KMDH',))
     airport_row = cursor.fetchone()
     if airport_row:
@@ -63,7 +63,6 @@ with db.get_connection() as conn:
         )
         print(f'  {seq}. {name} ({lat}, {lon})')
     
-    conn.commit()
     print('\n✅ MDH 20 NAV route loaded successfully with all 5 checkpoints!')
 
 # Verify
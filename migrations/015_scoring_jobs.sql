@@ -0,0 +1,23 @@
+-- Migration: Background scoring jobs
+-- POST /flight saves the GPX and queues a job; workers score it in the background
+
+CREATE TABLE IF NOT EXISTS scoring_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    prenav_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    params TEXT NOT NULL,
+    gpx_filename TEXT NOT NULL,
+    result_id INTEGER,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    FOREIGN KEY (prenav_id) REFERENCES prenav_submissions(id) ON DELETE CASCADE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (result_id) REFERENCES flight_results(id) ON DELETE SET NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_scoring_jobs_status ON scoring_jobs(status);
+CREATE INDEX IF NOT EXISTS idx_scoring_jobs_prenav ON scoring_jobs(prenav_id);
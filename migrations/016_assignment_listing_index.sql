@@ -0,0 +1,4 @@
+-- Migration: Index for paging through NAV assignments newest first
+-- Keyset pagination on (assigned_at, id); flight_results is already covered by idx_flight_date
+
+CREATE INDEX IF NOT EXISTS idx_nav_assignments_assigned ON nav_assignments(assigned_at);
@@ -0,0 +1,53 @@
+-- Migration: Per-checkpoint flight results as rows
+-- flight_results.checkpoint_results keeps the JSON for the result pages; this table
+-- holds the same legs one row each, so leg statistics are plain SQL aggregates.
+-- sequence is the NAV checkpoint's sequence, which the scoring pipeline records in
+-- each leg. Legs of older results lack it; the backfill matches those by checkpoint
+-- name, else by position.
+
+CREATE TABLE IF NOT EXISTS flight_checkpoint_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    result_id INTEGER NOT NULL,
+    nav_id INTEGER NOT NULL,
+    sequence INTEGER NOT NULL,
+    checkpoint_name TEXT,
+    method TEXT,
+    distance_nm REAL,
+    within_0_25_nm INTEGER,
+    estimated_time REAL,
+    actual_time REAL,
+    deviation REAL,
+    leg_score REAL,
+    off_course_penalty REAL,
+    FOREIGN KEY (result_id) REFERENCES flight_results(id) ON DELETE CASCADE,
+    FOREIGN KEY (nav_id) REFERENCES navs(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_flight_checkpoint_nav_sequence ON flight_checkpoint_results(nav_id, sequence);
+CREATE INDEX IF NOT EXISTS idx_flight_checkpoint_result ON flight_checkpoint_results(result_id);
+
+-- Backfill results that have no rows yet (migrations re-run at startup, so this stays a no-op once done)
+INSERT INTO flight_checkpoint_results
+    (result_id, nav_id, sequence, checkpoint_name, method, distance_nm, within_0_25_nm,
+     estimated_time, actual_time, deviation, leg_score, off_course_penalty)
+SELECT fr.id,
+       fr.nav_id,
+       COALESCE(
+           json_extract(je.value, '$.sequence'),
+           (SELECT c.sequence FROM checkpoints c
+            WHERE c.nav_id = fr.nav_id AND c.name = json_extract(je.value, '$.name')
+            ORDER BY c.sequence LIMIT 1),
+           je.key + 1
+       ),
+       json_extract(je.value, '$.name'),
+       json_extract(je.value, '$.method'),
+       json_extract(je.value, '$.distance_nm'),
+       json_extract(je.value, '$.within_0_25_nm'),
+       json_extract(je.value, '$.estimated_time'),
+       json_extract(je.value, '$.actual_time'),
+       json_extract(je.value, '$.deviation'),
+       json_extract(je.value, '$.leg_score'),
+       json_extract(je.value, '$.off_course_penalty')
+FROM flight_results fr,
+     json_each(CASE WHEN json_valid(fr.checkpoint_results) THEN fr.checkpoint_results ELSE '[]' END) je
+WHERE NOT EXISTS (SELECT 1 FROM flight_checkpoint_results x WHERE x.result_id = fr.id);
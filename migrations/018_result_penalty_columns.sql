@@ -0,0 +1,15 @@
+-- Migration: Store the penalty components of each flight result
+-- Written when a flight is scored so result pages read them instead of recomputing.
+-- NULL marks results scored before these columns existed. total_time_score is
+-- backfilled here. The fuel and secrets penalties depend on the scoring config,
+-- so those are filled in at startup (Database.backfill_result_penalties).
+
+-- NUMERIC so whole-point penalties read back as integers, as they are calculated
+ALTER TABLE flight_results ADD COLUMN fuel_penalty NUMERIC;
+ALTER TABLE flight_results ADD COLUMN checkpoint_secrets_penalty NUMERIC;
+ALTER TABLE flight_results ADD COLUMN enroute_secrets_penalty NUMERIC;
+ALTER TABLE flight_results ADD COLUMN total_time_score REAL;
+
+UPDATE flight_results
+SET total_time_score = COALESCE(leg_penalties, 0) + COALESCE(total_time_penalty, 0)
+WHERE total_time_score IS NULL;
@@ -0,0 +1,8 @@
+-- Migration: Keep the route and rules each flight result was scored with
+-- JSON of the NAV name, checkpoints, start gate and scoring config at scoring
+-- time. Result PDFs are built on first download from these, so editing the NAV
+-- or the scoring config later does not change the report of an earlier flight.
+-- NULL for results scored before reports were built on download (those kept the
+-- PDF written when they were scored).
+
+ALTER TABLE flight_results ADD COLUMN scoring_inputs TEXT;
@@ -20,7 +20,7 @@ def seed_database(db_path: str = "data/navs.db"):
     db = Database(db_path)
     auth = Auth(db)
     
-    with db.get_connection() as conn:
+    with db.write_connection() as conn:
         # ===== ADMIN ACCOUNT =====
         print("👤 Creating admin account...")
         try:
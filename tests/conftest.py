@@ -0,0 +1,6 @@
+"""Make the app package importable when running pytest from anywhere."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,237 @@
+"""
+Checkpoint scoring sweep against the original per-checkpoint search.
+
+The original search measured every point with geodesic distances and found the
+plane crossing from bearings. The sweep measures only the points it needs and
+finds the crossing in a local flat frame, so methods and sample points must
+match exactly while interpolated CTP times may drift by a fraction of a second.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.scoring_engine import NavScoringEngine
+from app.track import TrackArray
+
+CONFIG = {"scoring": {"distance_mode": "ellipsoidal", "off_course": {"max_no_penalty_nm": 0.25}}}
+START_US = 1_772_373_600_000_000
+# Ground speed of the synthetic flights, NM per one-second sample (about 110 kt)
+NM_PER_SAMPLE = 0.03
+# Largest CTP time difference from the bearing-based crossing (measured at most
+# 1.3 s, median 0.3 s, on tracks logged every few seconds)
+CTP_TIME_TOLERANCE_S = 1.5
+
+
+def baseline_crossing(engine, track_points, checkpoint, previous_point, previous_time):
+    """The checkpoint search as it was written before the sweep."""
+    CHECKPOINT_RADIUS_NM = engine.config["scoring"].get("off_course", {}).get("max_no_penalty_nm", 0.25)
+    distance = lambda p: engine.haversine_distance({"lat": p["lat"], "lon": p["lon"]}, checkpoint)
+
+    flight_path_bearing = engine.calculate_bearing(previous_point, checkpoint)
+    plane_bearing = (flight_path_bearing + 90) % 360
+
+    radius_entry_point = None
+    for p in track_points:
+        if p["time"] > previous_time and distance(p) <= CHECKPOINT_RADIUS_NM:
+            radius_entry_point, radius_entry_distance = p, distance(p)
+            break
+
+    plane_crossing_point = None
+    for j in range(len(track_points) - 1):
+        p1, p2 = track_points[j], track_points[j + 1]
+        if p1["time"] <= previous_time:
+            continue
+        if engine.side_of_plane(p1, checkpoint, plane_bearing) != engine.side_of_plane(p2, checkpoint, plane_bearing):
+            angle_diff1 = (engine.calculate_bearing(checkpoint, p1) - plane_bearing + 360) % 360
+            angle_diff2 = (engine.calculate_bearing(checkpoint, p2) - plane_bearing + 360) % 360
+            if angle_diff1 > 180:
+                angle_diff1 -= 360
+            if angle_diff2 > 180:
+                angle_diff2 -= 360
+            if abs(angle_diff1 - angle_diff2) < 1e-10:
+                fraction = 0.5
+            else:
+                fraction = abs(angle_diff1) / abs(angle_diff1 - angle_diff2)
+            plane_crossing_point = engine.interpolate_point(p1, p2, fraction)
+            plane_crossing_distance = engine.haversine_distance(plane_crossing_point, checkpoint)
+            break
+
+    if radius_entry_point and plane_crossing_point:
+        if radius_entry_point["time"] < plane_crossing_point["time"]:
+            return plane_crossing_point, plane_crossing_distance, "CTP", True
+        return radius_entry_point, radius_entry_distance, "Radius Entry", True
+    if radius_entry_point:
+        return radius_entry_point, radius_entry_distance, "Radius Entry", True
+    valid_points = [p for p in track_points if p["time"] > previous_time]
+    if not valid_points:
+        return None, float("inf"), "PCA", False
+    closest_point = min(valid_points, key=distance)
+    crossing_distance = distance(closest_point)
+    return closest_point, crossing_distance, "PCA", crossing_distance <= CHECKPOINT_RADIUS_NM
+
+
+def baseline_sweep(engine, track, start_crossing, checkpoints):
+    points = track.to_points()
+    previous_point, previous_time = start_crossing, start_crossing["time"]
+    results = []
+    for checkpoint in checkpoints:
+        result = baseline_crossing(engine, points, checkpoint, previous_point, previous_time)
+        results.append(result)
+        if result[0]:
+            previous_point, previous_time = result[0], result[0]["time"]
+    return results
+
+
+def offset(point, east_nm, north_nm):
+    """point moved east_nm and north_nm on a local flat frame."""
+    lat = point["lat"] + north_nm / 60.0
+    return {"lat": lat, "lon": point["lon"] + east_nm / (60.0 * math.cos(math.radians(point["lat"])))}
+
+
+def fly(waypoints, rng, seconds_per_sample=1, noise_deg=2e-6):
+    """A track through waypoints at constant ground speed."""
+    lat, lon = [], []
+    for a, b in zip(waypoints, waypoints[1:]):
+        north = (b["lat"] - a["lat"]) * 60.0
+        east = (b["lon"] - a["lon"]) * 60.0 * math.cos(math.radians(a["lat"]))
+        steps = max(1, int(math.hypot(north, east) / (NM_PER_SAMPLE * seconds_per_sample)))
+        f = np.arange(steps) / steps
+        lat.extend(a["lat"] + f * (b["lat"] - a["lat"]))
+        lon.extend(a["lon"] + f * (b["lon"] - a["lon"]))
+    lat.append(waypoints[-1]["lat"])
+    lon.append(waypoints[-1]["lon"])
+    lat = np.array(lat) + rng.normal(scale=noise_deg, size=len(lat))
+    lon = np.array(lon) + rng.normal(scale=noise_deg, size=len(lon))
+    times = START_US + np.arange(len(lat), dtype=np.int64) * seconds_per_sample * 1_000_000
+    return TrackArray(lat, lon, times, np.full(len(lat), 56.0))
+
+
+def route_flight(seed, seconds_per_sample=1, cp1_pass_nm=0.1):
+    """
+    A route whose checkpoints are timed by each method in turn:
+    CP1 flown through (CTP), CP2 passed outside the radius then approached
+    from beyond the plane (Radius Entry), CP3 passed wide abeam (PCA after a
+    plane crossing), CP4 never reached (PCA, no crossing at all) and CP5 after
+    the track has ended (no timing point).
+    """
+    rng = np.random.default_rng(seed)
+    jitter = lambda: rng.uniform(-0.05, 0.05)
+    gate = {"lat": 37.778 + rng.uniform(-0.5, 0.5), "lon": -89.252 + rng.uniform(-0.5, 0.5)}
+    cp1 = offset(gate, 2.0 + jitter(), 3.0 + jitter())
+    cp2 = offset(cp1, 3.0 + jitter(), 0.5 + jitter())
+    cp3 = offset(cp2, 0.5 + jitter(), -3.0 + jitter())
+    cp4 = offset(cp3, -3.0 + jitter(), -1.0 + jitter())
+    cp5 = offset(cp4, -2.0, 2.0)
+    checkpoints = [
+        dict(cp, name=f"CP{i}", sequence=i) for i, cp in enumerate([cp1, cp2, cp3, cp4, cp5], 1)
+    ]
+    waypoints = [
+        gate,
+        offset(cp1, cp1_pass_nm + jitter(), 0.0),
+        # Cross CP2's plane 0.5 NM wide, then turn back onto it
+        offset(cp2, 0.6, 0.8 + jitter()),
+        offset(cp2, 0.05, -0.1),
+        # Pass CP3 0.6 NM abeam
+        offset(cp3, 0.6 + jitter(), -0.3),
+        # Stop 1.5 NM short of CP4
+        offset(cp4, 1.5, 0.0),
+    ]
+    track = fly(waypoints, rng, seconds_per_sample)
+    start_crossing = track.point(0)
+    return track, start_crossing, checkpoints
+
+
+def assert_matches_baseline(results, expected):
+    assert len(results) == len(expected)
+    for (point, distance, method, within), (b_point, b_distance, b_method, b_within) in zip(results, expected):
+        assert (method, within) == (b_method, b_within)
+        if b_point is None:
+            assert point is None and distance == float("inf")
+            continue
+        if method == "CTP":
+            # Interpolated crossing: the local frame puts it within a second of the bearing solve
+            drift = abs((point["time"] - b_point["time"]).total_seconds())
+            assert drift <= CTP_TIME_TOLERANCE_S
+            assert distance == pytest.approx(b_distance, abs=CTP_TIME_TOLERANCE_S * NM_PER_SAMPLE)
+        else:
+            # Radius entry and closest approach are track samples
+            assert point == b_point
+            assert distance == pytest.approx(b_distance, rel=1e-7)
+
+
+@pytest.mark.parametrize("seconds_per_sample", [1, 5])
+@pytest.mark.parametrize("seed", range(6))
+def test_methods_and_timing_match_baseline(seed, seconds_per_sample):
+    engine = NavScoringEngine(CONFIG)
+    track, start_crossing, checkpoints = route_flight(seed, seconds_per_sample)
+    results = list(engine.score_checkpoints(track, start_crossing, checkpoints))
+
+    assert [r[2] for r in results] == ["CTP", "Radius Entry", "PCA", "PCA", "PCA"]
+    assert [r[3] for r in results] == [True, True, False, False, False]
+    assert_matches_baseline(results, baseline_sweep(engine, track, start_crossing, checkpoints))
+
+
+def test_ctp_time_drift_is_small_and_lands_on_the_plane():
+    engine = NavScoringEngine(CONFIG)
+    drifts = []
+    for seed in range(20):
+        track, start_crossing, checkpoints = route_flight(seed, seconds_per_sample=5)
+        point, _, method, _ = next(engine.score_checkpoints(track, start_crossing, checkpoints[:1]))
+        baseline_point = baseline_crossing(engine, track.to_points(), checkpoints[0], start_crossing, start_crossing["time"])[0]
+        assert method == "CTP"
+        drifts.append(abs((point["time"] - baseline_point["time"]).total_seconds()))
+
+        # The interpolated point is on the plane through the checkpoint
+        bearing = engine.calculate_bearing(start_crossing, checkpoints[0])
+        lat0, lon0, k_lon, k_lat = engine.along_track_projection(checkpoints[0], bearing)
+        assert abs((point["lon"] - lon0) * k_lon + (point["lat"] - lat0) * k_lat) < 1e-9
+
+    assert max(drifts) <= CTP_TIME_TOLERANCE_S
+    assert np.median(drifts) <= 0.5
+
+
+def test_leg_after_the_track_ends_has_no_timing_point():
+    engine = NavScoringEngine(CONFIG)
+    track, start_crossing, checkpoints = route_flight(0)
+    results = list(engine.score_checkpoints(track, start_crossing, checkpoints))
+
+    # CP4 is never reached, so its closest approach is the last sample...
+    assert results[3][0] == track.point(len(track) - 1)
+    # ...which leaves no points at all for CP5
+    assert results[4] == (None, float("inf"), "PCA", False)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_unsorted_track_matches_baseline(seed):
+    engine = NavScoringEngine(CONFIG)
+    track, start_crossing, checkpoints = route_flight(seed)
+    # A logger glitch: every 50th pair of samples is recorded out of order
+    time = track.time.copy()
+    for i in range(10, len(time) - 1, 50):
+        time[i], time[i + 1] = time[i + 1], time[i]
+    glitched = TrackArray(track.lat, track.lon, time, track.speed)
+    assert not glitched.time_sorted
+
+    results = list(engine.score_checkpoints(glitched, start_crossing, checkpoints))
+    assert_matches_baseline(results, baseline_sweep(engine, glitched, start_crossing, checkpoints))
+
+
+def test_crossing_exactly_on_a_sample():
+    engine = NavScoringEngine(CONFIG)
+    checkpoint = {"lat": 40.0, "lon": -105.0, "name": "CP1", "sequence": 1}
+    # Due north along the checkpoint's meridian with a sample on the checkpoint's latitude
+    lat = checkpoint["lat"] + np.arange(-40, 41) * (NM_PER_SAMPLE / 60.0)
+    lat[40] = checkpoint["lat"]
+    lon = np.full(lat.size, checkpoint["lon"] + 0.001)
+    track = TrackArray(lat, lon, START_US + np.arange(lat.size, dtype=np.int64) * 1_000_000)
+    # Leg starts on the checkpoint's meridian, so the plane runs exactly east-west
+    start = dict(track.point(0), lon=checkpoint["lon"])
+
+    (point, distance, method, within), = engine.score_checkpoints(track, start, [checkpoint])
+    assert method == "CTP" and within
+    # Crossed once, at the sample on the plane
+    assert point["time"] == track.datetime_at(40)
+    assert point["lat"] == checkpoint["lat"]
+    assert distance == pytest.approx(engine.haversine_distance(track.point(40), checkpoint))
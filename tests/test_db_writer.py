@@ -0,0 +1,119 @@
+"""WriteQueue: batched writes with one SAVEPOINT per call."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from app.db_writer import WriteQueue, _WriteCall
+
+
+@pytest.fixture
+def writer(tmp_path):
+    db_path = tmp_path / "test.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE items (name TEXT UNIQUE NOT NULL)")
+    conn.commit()
+    conn.close()
+    writer = WriteQueue(str(db_path))
+    yield writer
+    writer.stop()
+
+
+def insert(writer, name):
+    writer.connection.execute("INSERT INTO items (name) VALUES (?)", (name,))
+    return name
+
+
+def insert_then_fail(writer, name):
+    insert(writer, name)
+    raise RuntimeError(f"failed after inserting {name}")
+
+
+def stored_names(writer):
+    conn = sqlite3.connect(writer.db_path)
+    try:
+        return sorted(row[0] for row in conn.execute("SELECT name FROM items"))
+    finally:
+        conn.close()
+
+
+def test_failing_call_only_undoes_its_own_changes(writer):
+    batch = [
+        _WriteCall(insert, (writer, "a"), {}),
+        _WriteCall(insert_then_fail, (writer, "b"), {}),
+        _WriteCall(insert, (writer, "c"), {}),
+        # Constraint violation inside the same transaction
+        _WriteCall(insert, (writer, "a"), {}),
+        _WriteCall(insert, (writer, "d"), {}),
+    ]
+    writer._run_batch(batch)
+
+    assert stored_names(writer) == ["a", "c", "d"]
+    assert [c.future.exception() is None for c in batch] == [True, False, True, False, True]
+    assert isinstance(batch[1].future.exception(), RuntimeError)
+    assert isinstance(batch[3].future.exception(), sqlite3.IntegrityError)
+    assert batch[4].future.result() == "d"
+
+    stats = writer.stats()
+    assert stats["transactions"] == 1
+    assert stats["calls"] == 5
+    assert stats["failed_calls"] == 2
+    assert stats["largest_batch"] == 5
+
+
+def test_failed_transaction_fails_every_call(writer):
+    writer.connection.execute("BEGIN")
+    try:
+        batch = [_WriteCall(insert, (writer, "a"), {}), _WriteCall(insert, (writer, "b"), {})]
+        # BEGIN IMMEDIATE inside an open transaction fails before any call runs
+        writer._run_batch(batch)
+    finally:
+        if writer.connection.in_transaction:
+            writer.connection.execute("ROLLBACK")
+
+    assert all(isinstance(c.future.exception(), sqlite3.OperationalError) for c in batch)
+    assert stored_names(writer) == []
+    assert writer.stats()["failed_calls"] == 2
+
+
+def test_concurrent_calls_commit_independently(writer):
+    errors = []
+
+    def worker(i):
+        func = insert_then_fail if i % 3 == 0 else insert
+        try:
+            writer.call(func, writer, f"item{i:02d}")
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(30)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 10
+    assert stored_names(writer) == [f"item{i:02d}" for i in range(30) if i % 3]
+    assert writer.stats()["calls"] == 30
+
+
+def test_call_from_writer_thread_runs_inline(writer):
+    def outer(writer):
+        # A write method calling another one must not wait on its own queue
+        insert(writer, "outer")
+        return writer.call(insert, writer, "inner")
+
+    assert writer.call(outer, writer) == "inner"
+    assert stored_names(writer) == ["inner", "outer"]
+
+
+def test_transaction_rolls_back_on_error(writer):
+    with pytest.raises(RuntimeError):
+        with writer.transaction() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('x')")
+            raise RuntimeError("abort")
+    with writer.transaction() as conn:
+        conn.execute("INSERT INTO items (name) VALUES ('y')")
+
+    assert stored_names(writer) == ["y"]
@@ -0,0 +1,96 @@
+"""DiskCache: atomic writes and least-recently-used eviction by size."""
+
+import os
+
+from app.disk_cache import DiskCache
+
+
+class SmallCache(DiskCache):
+    name = "small_cache"
+    pattern = "*.bin"
+    label = "small cache"
+
+
+def make_cache(tmp_path, max_mb):
+    return SmallCache({"pdf_reports": str(tmp_path), "small_cache_max_mb": max_mb})
+
+
+def write_entry(cache, name, size, mtime):
+    path = cache.cache_path / name
+    assert cache.write_atomic(path, lambda f: f.write(b"x" * size))
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_directory_and_budget_from_config(tmp_path):
+    cache = make_cache(tmp_path, 2)
+    assert cache.cache_path == tmp_path / "small_cache"
+    assert cache.cache_path.is_dir()
+    assert cache.max_bytes == 2 * 1024 * 1024
+
+
+def test_evict_removes_least_recently_used_until_under_budget(tmp_path):
+    cache = make_cache(tmp_path, 2500 / (1024 * 1024))
+    oldest = write_entry(cache, "a.bin", 1000, 100)
+    middle = write_entry(cache, "b.bin", 1000, 200)
+    newest = write_entry(cache, "c.bin", 1000, 300)
+    # A touch makes the oldest entry the most recently used
+    assert cache.touch(oldest)
+
+    assert cache.evict() == 1
+    assert not middle.exists()
+    assert oldest.exists() and newest.exists()
+    assert cache.evict() == 0
+
+
+def test_evict_ignores_entries_being_written_and_other_files(tmp_path):
+    cache = make_cache(tmp_path, 0)
+    in_progress = cache.reserve("d")
+    in_progress.write_bytes(b"x" * 100)
+    other = cache.cache_path / "notes.txt"
+    other.write_bytes(b"x" * 100)
+    entry = write_entry(cache, "e.bin", 100, 100)
+
+    assert cache.evict() == 1
+    assert not entry.exists()
+    assert in_progress.exists() and other.exists()
+
+
+def test_evict_counts_directory_entries_by_contents(tmp_path):
+    cache = make_cache(tmp_path, 1500 / (1024 * 1024))
+    cache.pattern = "*"
+    for name, mtime in (("old", 100), ("new", 200)):
+        entry = cache.cache_path / name
+        entry.mkdir()
+        (entry / "data").write_bytes(b"x" * 1000)
+        os.utime(entry, (mtime, mtime))
+
+    assert cache.evict() == 1
+    assert not (cache.cache_path / "old").exists()
+    assert (cache.cache_path / "new").exists()
+
+
+def test_failed_write_leaves_nothing_behind(tmp_path):
+    cache = make_cache(tmp_path, 1)
+    path = cache.cache_path / "f.bin"
+
+    def fail(f):
+        f.write(b"partial")
+        raise ValueError("boom")
+
+    assert not cache.write_atomic(path, fail)
+    assert list(cache.cache_path.iterdir()) == []
+
+
+def test_touch_and_remove_missing_entry(tmp_path):
+    cache = make_cache(tmp_path, 1)
+    missing = cache.cache_path / "missing.bin"
+    assert not cache.touch(missing)
+    assert not cache.remove(missing)
+
+
+def test_zero_budget_empties_cache(tmp_path):
+    cache = make_cache(tmp_path, 0)
+    for i in range(3):
+        write_entry(cache, f"{i}.bin", 10, 100 + i)
+    assert cache.evict() == 3
@@ -0,0 +1,73 @@
+"""Per-checkpoint result rows are grouped under the NAV checkpoint each leg was scored against."""
+
+import json
+
+import pytest
+
+from app.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "navs.db"))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def flight(db):
+    pilot = db.create_user("pilot@example.com", "x", "pilot@example.com", "Pilot", is_approved=True, email_verified=True)
+    observer = db.create_user("obs@example.com", "x", "obs@example.com", "Observer", is_approved=True, email_verified=True)
+    pairing = db.create_pairing(pilot, observer)
+    airport = db.create_airport("KAAA")
+    gate = db.create_start_gate(airport, "Gate", 37.7, -89.2)
+    nav = db.create_nav("Repeats", airport)
+    # The route passes the same named turn point twice
+    for sequence, name in enumerate(["TURN", "TOWER", "TURN"], 1):
+        db.create_checkpoint(nav, sequence, name, 37.7 + sequence / 100, -89.2)
+    return {"pilot": pilot, "pairing": pairing, "nav": nav, "gate": gate}
+
+
+def leg(name, sequence, deviation):
+    return {
+        "name": name, "sequence": sequence, "method": "CTP", "distance_nm": 0.1,
+        "within_0_25_nm": True, "estimated_time": 300, "actual_time": 300 + deviation,
+        "deviation": deviation, "leg_score": abs(deviation), "off_course_penalty": 0,
+    }
+
+
+def add_result(db, flight, legs):
+    prenav = db.create_prenav(flight["pairing"], flight["pilot"], flight["nav"], [300.0] * 3, 900.0, 10.0)
+    return db.create_flight_result(
+        prenav, flight["pairing"], flight["nav"], "x.gpx", 10, 0, 0, flight["gate"], 100, legs
+    )
+
+
+def test_repeated_names_and_skipped_legs_keep_their_checkpoint(db, flight):
+    add_result(db, flight, [leg("TURN", 1, 10), leg("TOWER", 2, 20), leg("TURN", 3, 30)])
+    # No crossing found for the first checkpoint
+    add_result(db, flight, [leg("TOWER", 2, 40), leg("TURN", 3, 50)])
+
+    stats = {row["sequence"]: row for row in db.get_leg_stats(flight["nav"])}
+    assert sorted(stats) == [1, 2, 3]
+    assert stats[1]["flights"] == 1 and stats[1]["avg_deviation"] == 10
+    assert stats[2]["flights"] == 2 and stats[2]["avg_deviation"] == 30
+    assert stats[3]["flights"] == 2 and stats[3]["avg_deviation"] == 40
+    assert stats[3]["checkpoint_name"] == "TURN"
+
+
+def test_backfill_prefers_recorded_sequence(db, flight):
+    result_id = add_result(db, flight, [leg("TOWER", 2, 40), leg("TURN", 3, 50)])
+    old_style = [leg("TOWER", 2, 5), leg("TURN", 3, 6)]
+    del old_style[0]["sequence"]
+    with db.write_connection() as conn:
+        conn.execute("DELETE FROM flight_checkpoint_results")
+        conn.execute(
+            "UPDATE flight_results SET checkpoint_results = ? WHERE id = ?",
+            (json.dumps(old_style), result_id),
+        )
+    # Migrations re-run at startup and fill in results without rows
+    db._run_migrations()
+
+    stats = {row["sequence"]: row["avg_deviation"] for row in db.get_leg_stats(flight["nav"])}
+    assert stats == {2: 5, 3: 6}
@@ -0,0 +1,129 @@
+"""Keyset pagination: cursors, page boundaries and ties on the sort column."""
+
+import base64
+import json
+import sqlite3
+
+import pytest
+
+from app.database import Page, decode_cursor, encode_cursor, make_page, paginate
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE results (id INTEGER PRIMARY KEY, pilot TEXT, scored_at TEXT)")
+    yield conn
+    conn.close()
+
+
+def add_results(conn, scored_at_values, pilot="alice"):
+    conn.executemany(
+        "INSERT INTO results (pilot, scored_at) VALUES (?, ?)",
+        [(pilot, value) for value in scored_at_values],
+    )
+
+
+def fetch_page(conn, page_size, cursor=None, pilot="alice"):
+    params = [pilot]
+    query = paginate("SELECT * FROM results WHERE pilot = ?", params, "scored_at", "id", page_size, cursor)
+    rows = [dict(row) for row in conn.execute(query, params)]
+    return make_page(rows, page_size, "scored_at")
+
+
+def all_pages(conn, page_size):
+    pages = [fetch_page(conn, page_size)]
+    while pages[-1].next_cursor:
+        pages.append(fetch_page(conn, page_size, pages[-1].next_cursor))
+    return pages
+
+
+def newest_first(conn, pilot="alice"):
+    return [dict(row) for row in conn.execute(
+        "SELECT * FROM results WHERE pilot = ? ORDER BY scored_at DESC, id DESC", (pilot,))]
+
+
+@pytest.mark.parametrize("count,page_size,expected_sizes", [
+    (0, 5, [0]),
+    (3, 5, [3]),
+    (5, 5, [5]),
+    (10, 5, [5, 5]),
+    (11, 5, [5, 5, 1]),
+    (4, 1, [1, 1, 1, 1]),
+])
+def test_page_boundaries(conn, count, page_size, expected_sizes):
+    add_results(conn, [f"2024-01-{day:02d}" for day in range(1, count + 1)])
+    pages = all_pages(conn, page_size)
+
+    assert [len(page) for page in pages] == expected_sizes
+    # The last page never offers a next page, even when it is exactly full
+    assert pages[-1].next_cursor is None
+    assert [row for page in pages for row in page] == newest_first(conn)
+
+
+def test_ties_on_sort_column_are_split_by_id(conn):
+    add_results(conn, ["2024-01-02"] * 7 + ["2024-01-01"] * 3 + ["2024-01-03"] * 2)
+    pages = all_pages(conn, 3)
+
+    rows = [row for page in pages for row in page]
+    assert rows == newest_first(conn)
+    assert len({row["id"] for row in rows}) == 12
+
+
+def test_rows_added_after_first_page_do_not_shift_later_pages(conn):
+    add_results(conn, ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"])
+    first = fetch_page(conn, 2)
+    add_results(conn, ["2024-02-01"])
+    second = fetch_page(conn, 2, first.next_cursor)
+
+    assert [row["scored_at"] for row in first] == ["2024-01-04", "2024-01-03"]
+    assert [row["scored_at"] for row in second] == ["2024-01-02", "2024-01-01"]
+    assert second.next_cursor is None
+
+
+def test_cursor_respects_other_filters(conn):
+    add_results(conn, ["2024-01-01", "2024-01-02", "2024-01-03"])
+    add_results(conn, ["2024-01-01", "2024-01-02"], pilot="bob")
+
+    rows = [row for page in all_pages(conn, 1) for row in page]
+    assert {row["pilot"] for row in rows} == {"alice"}
+    assert len(rows) == 3
+
+
+def test_no_page_size_returns_everything(conn):
+    add_results(conn, ["2024-01-01", "2024-01-02", "2024-01-03"])
+    page = fetch_page(conn, None)
+
+    assert isinstance(page, Page)
+    assert len(page) == 3
+    assert page.next_cursor is None
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("2024-01-01 10:00:00", 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == ["2024-01-01 10:00:00", 42]
+
+
+def raw_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    "%%%",
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    raw_cursor({"scored_at": "x", "id": 1}),
+    raw_cursor(["2024-01-01"]),
+    raw_cursor(["2024-01-01", 1, 2]),
+    raw_cursor([{"x": 1}, 1]),
+    raw_cursor(["2024-01-01", [1]]),
+    raw_cursor(["2024-01-01", None]),
+    raw_cursor([True, 1]),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+    with pytest.raises(ValueError):
+        paginate("SELECT * FROM results WHERE 1", [], "scored_at", "id", 5, cursor)
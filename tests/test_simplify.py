@@ -0,0 +1,93 @@
+"""Douglas-Peucker simplification: anchors are kept and dropped points stay within tolerance."""
+
+import numpy as np
+import pytest
+
+from app.simplify import douglas_peucker, simplify_indices, simplify_track
+from app.track import TrackArray
+
+
+def segment_distance(px, py, ax, ay, bx, by):
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    t = 0.0 if length_sq == 0 else min(1.0, max(0.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+    return float(np.hypot(px - (ax + t * dx), py - (ay + t * dy)))
+
+
+def assert_within_tolerance(x, y, kept, tolerance):
+    for a, b in zip(kept[:-1], kept[1:]):
+        for i in range(a + 1, b):
+            assert segment_distance(x[i], y[i], x[a], y[a], x[b], y[b]) <= tolerance + 1e-12
+
+
+def random_walk(seed, n):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(size=(n, 2)).cumsum(axis=0)
+    return steps[:, 0], steps[:, 1]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("tolerance", [0.1, 1.0, 5.0])
+def test_dropped_points_stay_within_tolerance(seed, tolerance):
+    x, y = random_walk(seed, 500)
+    kept = douglas_peucker(x, y, tolerance)
+
+    assert kept[0] == 0 and kept[-1] == len(x) - 1
+    assert np.all(np.diff(kept) > 0)
+    assert len(kept) < len(x)
+    assert_within_tolerance(x, y, kept, tolerance)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_anchors_are_always_kept(seed):
+    x, y = random_walk(seed, 400)
+    rng = np.random.default_rng(seed + 100)
+    anchors = rng.choice(np.arange(1, 399), size=12, replace=False)
+    # Out-of-range anchors are ignored
+    kept = douglas_peucker(x, y, 50.0, list(anchors) + [-1, 400, 10_000])
+
+    assert set(anchors) <= set(kept.tolist())
+    assert kept[0] == 0 and kept[-1] == 399
+    assert_within_tolerance(x, y, kept, 50.0)
+    # Without anchors a tolerance this large leaves only a few vertices
+    assert set(anchors) - set(douglas_peucker(x, y, 50.0).tolist())
+
+
+def test_straight_line_reduces_to_end_points():
+    x = np.linspace(0, 10, 50)
+    assert douglas_peucker(x, 2 * x, 0.001).tolist() == [0, 49]
+
+
+def test_loop_back_to_start_is_not_collapsed():
+    # Out and back along a line: the turn point is far from the (zero-length) chord
+    x = np.array([0.0, 1.0, 2.0, 3.0, 2.0, 1.0, 0.0])
+    y = np.zeros(7)
+    assert douglas_peucker(x, y, 0.5).tolist() == [0, 3, 6]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2])
+def test_short_lines_are_unchanged(n):
+    assert douglas_peucker(np.zeros(n), np.zeros(n), 1.0).tolist() == list(range(n))
+
+
+def test_zero_tolerance_keeps_everything():
+    x, y = random_walk(0, 20)
+    assert douglas_peucker(x, y, 0).tolist() == list(range(20))
+
+
+def test_simplify_track_keeps_points_nearest_checkpoints():
+    rng = np.random.default_rng(7)
+    n = 600
+    lat = 40.0 + rng.normal(scale=0.0005, size=n).cumsum()
+    lon = -105.0 + rng.normal(scale=0.0005, size=n).cumsum()
+    track = TrackArray(lat, lon, np.arange(n) * 1_000_000)
+    checkpoints = [{"lat": float(lat[i]) + 0.0001, "lon": float(lon[i])} for i in (37, 250, 511)]
+    nearest = [track.spatial_index().nearest(cp)[0] for cp in checkpoints]
+
+    kept = simplify_indices(track, 0.5, checkpoints)
+    assert set(nearest) <= set(kept.tolist())
+
+    simplified = simplify_track(track, 0.5, checkpoints)
+    assert len(simplified) == len(kept)
+    np.testing.assert_array_equal(simplified.time, track.time[kept])
+    np.testing.assert_array_equal(simplified.lat, track.lat[kept])
@@ -0,0 +1,117 @@
+"""TrackGridIndex answers match a brute-force scan of every point."""
+
+import numpy as np
+import pytest
+
+from app.geodesy import ELLIPSOIDAL, SPHERICAL, distances_nm
+from app.spatial import TrackGridIndex
+from app.track import TrackArray
+
+
+def random_track(rng, center_lat, center_lon, span_deg, n):
+    # A wandering path plus some scattered points, one second apart
+    steps = rng.normal(scale=span_deg / 50, size=(n, 2)).cumsum(axis=0)
+    steps[::17] = rng.uniform(-span_deg, span_deg, size=steps[::17].shape)
+    lat = np.clip(center_lat + steps[:, 0], -89.5, 89.5)
+    lon = (center_lon + steps[:, 1] + 180) % 360 - 180
+    return TrackArray(lat, lon, np.arange(n, dtype=np.int64) * 1_000_000)
+
+
+def random_references(rng, track, count):
+    lats = rng.uniform(track.lat.min() - 0.2, track.lat.max() + 0.2, count)
+    lons = rng.uniform(track.lon.min() - 0.2, track.lon.max() + 0.2, count)
+    return [{"lat": float(lat), "lon": float(lon)} for lat, lon in zip(lats, lons)]
+
+
+def brute_within(track, reference, radius_nm, mode, after_us=None):
+    distances = distances_nm(reference, track.lat, track.lon, mode)
+    keep = distances <= radius_nm
+    if after_us is not None:
+        keep &= track.time > after_us
+    return np.flatnonzero(keep), distances[keep]
+
+
+def brute_nearest(track, reference, mode, after_us=None):
+    distances = distances_nm(reference, track.lat, track.lon, mode)
+    if after_us is not None:
+        distances = np.where(track.time > after_us, distances, np.inf)
+    if not np.isfinite(distances).any():
+        return None, float("inf")
+    best = int(np.argmin(distances))
+    return best, float(distances[best])
+
+
+TRACKS = {
+    "mid_latitude": (40.0, -105.0, 0.5),
+    "high_latitude": (78.0, 15.0, 0.5),
+    "southern": (-33.9, 151.2, 0.3),
+    "antimeridian": (0.0, 179.9, 0.4),
+    "wide": (45.0, 10.0, 5.0),
+}
+
+
+@pytest.fixture(params=sorted(TRACKS))
+def track(request):
+    rng = np.random.default_rng(sorted(TRACKS).index(request.param))
+    return random_track(rng, *TRACKS[request.param], n=1500)
+
+
+@pytest.mark.parametrize("mode", [ELLIPSOIDAL, SPHERICAL])
+@pytest.mark.parametrize("radius_nm", [0.05, 0.25, 1.0, 7.5])
+def test_within_matches_brute_force(track, mode, radius_nm):
+    rng = np.random.default_rng(1)
+    index = track.spatial_index()
+    for reference in random_references(rng, track, 20) + [track.point(0), track.point(len(track) - 1)]:
+        indices, distances = index.within(reference, radius_nm, mode)
+        expected_indices, expected_distances = brute_within(track, reference, radius_nm, mode)
+        np.testing.assert_array_equal(indices, expected_indices)
+        np.testing.assert_allclose(distances, expected_distances)
+
+
+@pytest.mark.parametrize("mode", [ELLIPSOIDAL, SPHERICAL])
+def test_nearest_matches_brute_force(track, mode):
+    rng = np.random.default_rng(2)
+    index = track.spatial_index()
+    references = random_references(rng, track, 30)
+    # Far outside the track, so the search has to widen several times
+    references.append({"lat": float(track.lat.mean()) + 3.0, "lon": float(track.lon.mean())})
+    for reference in references:
+        assert index.nearest(reference, mode) == pytest.approx(brute_nearest(track, reference, mode))
+
+
+def test_after_us_skips_earlier_points(track):
+    rng = np.random.default_rng(3)
+    index = track.spatial_index()
+    after_us = int(track.time[len(track) // 2])
+    for reference in random_references(rng, track, 20):
+        indices, _ = index.within(reference, 1.0, after_us=after_us)
+        expected, _ = brute_within(track, reference, 1.0, ELLIPSOIDAL, after_us)
+        np.testing.assert_array_equal(indices, expected)
+        assert index.nearest(reference, after_us=after_us) == pytest.approx(
+            brute_nearest(track, reference, ELLIPSOIDAL, after_us))
+
+    assert index.nearest(track.point(0), after_us=int(track.time[-1])) == (None, float("inf"))
+
+
+def test_nearest_prefers_earliest_of_repeated_points():
+    lat = [50.0, 50.01, 50.0, 50.02]
+    lon = [8.0, 8.0, 8.0, 8.0]
+    track = TrackArray(lat, lon, [0, 1, 2, 3])
+    assert track.spatial_index().nearest({"lat": 50.0, "lon": 8.0})[0] == 0
+    assert track.spatial_index().nearest({"lat": 50.0, "lon": 8.0}, after_us=0)[0] == 2
+
+
+def test_empty_track():
+    index = TrackGridIndex(TrackArray([], [], []))
+    indices, distances = index.within({"lat": 0.0, "lon": 0.0}, 10.0)
+    assert indices.size == 0 and distances.size == 0
+    assert index.nearest({"lat": 0.0, "lon": 0.0}) == (None, float("inf"))
+
+
+def test_long_track_caps_grid_size():
+    rng = np.random.default_rng(4)
+    track = random_track(rng, 0.0, 0.0, 40.0, 2000)
+    index = TrackGridIndex(track, cell_nm=0.01)
+    assert index.rows * index.cols <= 2 * (1 << 16)
+    reference = {"lat": 1.0, "lon": 1.0}
+    assert index.nearest(reference) == pytest.approx(brute_nearest(track, reference, ELLIPSOIDAL))
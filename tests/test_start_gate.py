@@ -0,0 +1,110 @@
+"""Start gate detection picks the same crossing point as the original threshold ladder loop."""
+
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from app.scoring_engine import NavScoringEngine
+from app.track import TrackArray
+
+CONFIG = {"scoring": {"distance_mode": "ellipsoidal"}}
+GATE = {"lat": 37.778, "lon": -89.252}
+
+
+def ladder_crossing(engine, track_points, start_gate):
+    """The start gate search as it was written before it was vectorized."""
+    TAKEOFF_SPEED_THRESHOLD = 5.0
+    INITIAL_DISTANCE_THRESHOLD = 0.02
+    MAX_DISTANCE_THRESHOLD = 0.10
+    DISTANCE_INCREMENT = 0.01
+
+    distance_threshold = INITIAL_DISTANCE_THRESHOLD
+    time_span = (track_points[-1]["time"] - track_points[0]["time"]).total_seconds()
+    time_limit = track_points[0]["time"] + timedelta(seconds=time_span * 0.5)
+
+    while distance_threshold <= MAX_DISTANCE_THRESHOLD:
+        candidate_points = []
+        for point in track_points:
+            if point["time"] > time_limit:
+                continue
+            distance = engine.haversine_distance({"lat": point["lat"], "lon": point["lon"]}, start_gate)
+            is_takeoff = point["speed"] >= TAKEOFF_SPEED_THRESHOLD
+            if distance <= distance_threshold and is_takeoff:
+                candidate_points.append((point, distance))
+        if candidate_points:
+            return min(candidate_points, key=lambda x: x[1])
+
+        candidate_points = [
+            (point, engine.haversine_distance({"lat": point["lat"], "lon": point["lon"]}, start_gate))
+            for point in track_points
+            if engine.haversine_distance({"lat": point["lat"], "lon": point["lon"]}, start_gate) <= distance_threshold
+            and point["time"] <= time_limit
+        ]
+        if candidate_points:
+            return min(candidate_points, key=lambda x: x[1])
+
+        distance_threshold += DISTANCE_INCREMENT
+    return None, None
+
+
+def departure_track(seed, pass_offset_nm, with_speed=True, taxi_lon=None):
+    """
+    Taxi north, then fly north past the gate about pass_offset_nm to its east,
+    and on for as long again (so the pass is in the first half of the track).
+    """
+    rng = np.random.default_rng(seed)
+    taxi_lon = GATE["lon"] - 0.004 if taxi_lon is None else taxi_lon
+    taxi_lat = GATE["lat"] - 0.0015 + np.arange(60) * 0.00005
+    flight_lat = GATE["lat"] - 0.003 + np.cumsum(rng.uniform(0.00018, 0.00022, 160))
+    lat = np.concatenate((taxi_lat, flight_lat)) + rng.normal(scale=2e-6, size=220)
+    lon = np.concatenate((np.full(60, taxi_lon), np.full(160, GATE["lon"] + pass_offset_nm / 48.0)))
+    lon += rng.normal(scale=2e-6, size=220)
+    speed = np.concatenate((np.full(60, 2.0), np.full(160, 56.0)))
+    times = 1_772_373_600_000_000 + np.arange(220, dtype=np.int64) * 1_000_000
+    return TrackArray(lat, lon, times, speed if with_speed else None)
+
+
+def assert_same_crossing(track):
+    engine = NavScoringEngine(CONFIG)
+    expected_point, expected_distance = ladder_crossing(engine, track.to_points(), GATE)
+    point, distance = engine.detect_start_gate_crossing(track, GATE)
+    if expected_point is None:
+        assert (point, distance) == (None, None)
+        return
+    assert point == expected_point
+    assert distance == pytest.approx(expected_distance, abs=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("pass_offset_nm", [0.0, 0.015, 0.035, 0.065, 0.095, 0.2])
+def test_matches_ladder_at_takeoff_speed(seed, pass_offset_nm):
+    assert_same_crossing(departure_track(seed, pass_offset_nm))
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("pass_offset_nm", [0.0, 0.03, 0.08, 0.2])
+def test_matches_ladder_without_speed(seed, pass_offset_nm):
+    # Loggers that record no speed read as 0 m/s: only the closest-point fallback applies
+    assert_same_crossing(departure_track(seed, pass_offset_nm, with_speed=False))
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("pass_offset_nm", [0.015, 0.05])
+def test_matches_ladder_when_taxi_passes_closer(seed, pass_offset_nm):
+    # The slow taxi runs right over the gate. A takeoff-speed point wins when it
+    # is within the same step; otherwise the closest point at any speed does.
+    assert_same_crossing(departure_track(seed, pass_offset_nm, taxi_lon=GATE["lon"]))
+
+
+def test_gate_beyond_ladder_is_not_found():
+    track = departure_track(0, 0.5)
+    engine = NavScoringEngine(CONFIG)
+    assert engine.detect_start_gate_crossing(track, GATE) == (None, None)
+    assert ladder_crossing(engine, track.to_points(), GATE) == (None, None)
+
+
+def test_accepts_point_dicts():
+    track = departure_track(1, 0.03)
+    engine = NavScoringEngine(CONFIG)
+    assert engine.detect_start_gate_crossing(track.to_points(), GATE) == engine.detect_start_gate_crossing(track, GATE)